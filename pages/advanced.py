@@ -3,6 +3,27 @@ import random
 from datetime import datetime
 from openai import OpenAI
 
+from writing_helper.answer_bank import get_answer_bank
+from writing_helper.cache import get_response_cache, make_cache_key
+from writing_helper.context import find_edited_paragraph, pack_for_level
+from writing_helper.creativity import score_creativity, task_vocabulary
+from writing_helper.drafts import get_draft_store
+from writing_helper.duplicates import get_duplicate_index
+from writing_helper.grammar import check_grammar, summarize
+from writing_helper.learner import get_learner
+from writing_helper.memory import build_history_messages, new_memory_state
+from writing_helper.prefetch import get_prefetcher
+from writing_helper.prefilter import local_reply
+from writing_helper.prompts import build_messages
+from writing_helper.readability import draft_metrics
+from writing_helper.rhetoric import get_rhetoric_detector
+from writing_helper.router import get_router
+from writing_helper.scheduler import PRIORITY_FREE_FORM, PRIORITY_QUICK
+from writing_helper.tasks import ADVANCED_TASKS, ADVANCED_TOOLS, QUICK_QUESTIONS
+from writing_helper.textstats import text_stats
+from writing_helper.tutor import generate_reply
+from writing_helper.vocab_index import get_vocabulary_index
+
 # 페이지 설정
 st.set_page_config(
     page_title="고급 영어 쓰기",
@@ -16,203 +37,65 @@ def init_openai_client():
     return OpenAI(api_key=st.secrets["openai"]["api_key"])
 
 client = init_openai_client()
+class_id, student_id = get_learner()
 
 # 세션 상태 초기화
 if 'writing_content_adv' not in st.session_state:
     st.session_state.writing_content_adv = ""
+if 'draft_task_adv' not in st.session_state:
+    st.session_state.draft_task_adv = None
+if 'edited_paragraph_adv' not in st.session_state:
+    st.session_state.edited_paragraph_adv = None
 if 'chat_history_adv' not in st.session_state:
     st.session_state.chat_history_adv = []
+if 'memory_state_adv' not in st.session_state:
+    st.session_state.memory_state_adv = new_memory_state()
 if 'selected_task_adv' not in st.session_state:
     st.session_state.selected_task_adv = None
+if 'prefetched_task_adv' not in st.session_state:
+    st.session_state.prefetched_task_adv = None
 if 'writing_goals' not in st.session_state:
     st.session_state.writing_goals = []
 if 'peer_feedback' not in st.session_state:
     st.session_state.peer_feedback = []
 
-# 고급 수준 과제 데이터
-ADVANCED_TASKS = {
-    "사회 이슈 분석": {
-        "type": "analytical_essay",
-        "description": "현재 사회의 중요한 이슈를 선택하여 다각도로 분석하고 본인의 견해를 논리적으로 제시하세요. (400-500단어)",
-        "minimal_guidance": [
-            "Choose a current social issue that interests you",
-            "Analyze the issue from multiple perspectives",
-            "Present your own well-reasoned opinion",
-            "Support your arguments with evidence and examples"
-        ],
-        "advanced_vocabulary": [
-            "contemporary", "prevalent", "paradigm", "multifaceted", "implications", 
-            "predominantly", "substantial", "deteriorate", "advocate", "controversial",
-            "underlying", "comprehensive", "sustainable", "innovative", "profound"
-        ],
-        "complex_structures": [
-            "Despite the fact that..., it is evident that...",
-            "While some argue that..., others contend that...",
-            "Not only does this issue affect..., but it also...",
-            "What is particularly concerning is that...",
-            "It is worth noting that..."
-        ]
-    },
-    "창의적 내러티브": {
-        "type": "creative_writing",
-        "description": "상상력을 발휘하여 독창적인 이야기를 창작하세요. 캐릭터, 배경, 갈등을 중심으로 한 완성도 높은 작품을 만들어보세요.",
-        "minimal_guidance": [
-            "Create original characters with depth and complexity",
-            "Develop an engaging plot with conflict and resolution",
-            "Use vivid descriptions and dialogue",
-            "Experiment with narrative techniques and literary devices"
-        ],
-        "advanced_vocabulary": [
-            "enigmatic", "resilient", "melancholy", "serene", "tumultuous",
-            "profound", "intricate", "captivating", "haunting", "whimsical",
-            "compelling", "poignant", "evocative", "subtle", "sophisticated"
-        ],
-        "complex_structures": [
-            "Had it not been for..., the outcome would have been...",
-            "Little did [character] know that...",
-            "In the midst of..., there emerged...",
-            "What struck [character] most was...",
-            "As if by some twist of fate..."
-        ]
-    },
-    "철학적 에세이": {
-        "type": "philosophical_essay",
-        "description": "추상적이고 복합적인 주제에 대해 깊이 있게 사고하고, 논리적 추론과 성찰을 통해 본인의 철학적 관점을 펼쳐보세요.",
-        "minimal_guidance": [
-            "Explore abstract concepts and ideas",
-            "Engage in deep philosophical reasoning",
-            "Question assumptions and explore implications",
-            "Develop your own unique perspective on complex issues"
-        ],
-        "advanced_vocabulary": [
-            "existential", "empirical", "metaphysical", "intrinsic", "paradox",
-            "paradigm", "fundamental", "subjective", "objective", "inherent",
-            "contemplation", "consciousness", "perception", "rationality", "morality"
-        ],
-        "complex_structures": [
-            "One might argue that..., however, upon closer examination...",
-            "The question remains as to whether...",
-            "This raises the fundamental question of...",
-            "From a philosophical standpoint...",
-            "It is precisely this ambiguity that..."
-        ]
-    },
-    "비판적 리뷰": {
-        "type": "critical_review",
-        "description": "책, 영화, 예술 작품, 또는 현상에 대한 비판적 분석을 수행하세요. 객관적 분석과 주관적 평가를 균형있게 제시하세요.",
-        "minimal_guidance": [
-            "Provide both objective analysis and subjective evaluation",
-            "Support your judgments with specific evidence",
-            "Consider multiple criteria for assessment",
-            "Engage with the work's broader significance and impact"
-        ],
-        "advanced_vocabulary": [
-            "sophisticated", "nuanced", "compelling", "innovative", "conventional",
-            "provocative", "mediocre", "exceptional", "superficial", "profound",
-            "aesthetic", "thematic", "symbolic", "interpretation", "critique"
-        ],
-        "complex_structures": [
-            "What distinguishes this work from others is...",
-            "While the work succeeds in..., it falls short of...",
-            "The most striking aspect of... is...",
-            "This raises important questions about...",
-            "In terms of artistic merit..."
-        ]
-    },
-    "연구 보고서": {
-        "type": "research_report",
-        "description": "관심 있는 주제에 대해 심도 있는 조사를 실시하고, 발견한 정보를 체계적으로 정리하여 전문적인 보고서를 작성하세요.",
-        "minimal_guidance": [
-            "Conduct thorough research on your chosen topic",
-            "Organize information systematically and logically",
-            "Present findings objectively with proper analysis",
-            "Draw meaningful conclusions from your research"
-        ],
-        "advanced_vocabulary": [
-            "methodology", "comprehensive", "empirical", "statistical", "correlation",
-            "hypothesis", "variables", "findings", "implications", "significant",
-            "preliminary", "substantial", "systematic", "objective", "conclusive"
-        ],
-        "complex_structures": [
-            "The research reveals that...",
-            "According to recent studies...",
-            "Data indicates a strong correlation between...",
-            "These findings suggest that...",
-            "Further investigation is needed to..."
-        ]
-    }
-}
-
-# 고급 쓰기 전략 및 도구
-ADVANCED_TOOLS = {
-    "Rhetorical Devices": [
-        "Metaphor and Simile", "Alliteration and Assonance", "Rhetorical Questions",
-        "Parallelism", "Irony and Satire", "Hyperbole", "Personification"
-    ],
-    "Essay Structures": [
-        "Classical Five-Paragraph", "Compare and Contrast", "Cause and Effect",
-        "Problem-Solution", "Chronological", "Process Analysis", "Classification"
-    ],
-    "Critical Thinking": [
-        "Analysis vs. Evaluation", "Identifying Assumptions", "Logical Fallacies",
-        "Evidence Assessment", "Multiple Perspectives", "Counterarguments"
-    ],
-    "Style Techniques": [
-        "Tone and Voice", "Sentence Variety", "Transitions", "Cohesion and Coherence",
-        "Precise Word Choice", "Active vs. Passive Voice", "Formal vs. Informal Register"
-    ]
-}
+# API 오류 시 기본 응답
+FALLBACK_RESPONSES = [
+    "죄송합니다. 현재 시스템에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요.",
+    "서비스 연결에 문제가 있습니다. 다시 질문해주시면 더 나은 답변을 드리겠습니다.",
+    "기술적 오류가 발생했습니다. 곧 정상화되니 양해 부탁드립니다."
+]
 
 # 도우미 응답 생성 함수 (고급 수준)
-def generate_ai_response_advanced(user_input, task_context=None, writing_content=""):
-    try:
-        # 고급 수준 학습자를 위한 시스템 프롬프트
-        system_prompt = f"""
-        당신은 한국 고등학생 및 대학생 수준의 고급 영어 학습자를 위한 전문적인 AI 영어 튜터입니다.
-        
-        특징:
-        - 고도의 분석적이고 비판적 사고 능력 개발
-        - 복잡한 문법 구조와 고급 어휘 활용 지도
-        - 창의성과 독창성을 중시하는 접근
-        - 학문적이고 전문적인 글쓰기 기술 향상
-        - 자기성찰과 메타인지 전략 촉진
-        
-        현재 과제 유형: {task_context if task_context else "일반"}
-        
-        학습자가 질문하면:
-        1. 내용: 복잡한 아이디어 발전, 비판적 분석, 독창적 관점 개발
-        2. 구조: 고급 에세이 구조, 논리적 흐름, coherence와 cohesion
-        3. 언어: 정교한 어휘 선택, 복잡한 문장 구조, 수사법 활용
-        4. 스타일: 학문적 어조, 개인적 목소리, 장르별 특성
-        
-        답변은 5-6문장으로 심도 있고 전문적으로, 이모지를 최소한으로 사용해주세요.
-        """
-        
-        # 사용자의 현재 작성 내용과 과제 맥락 제공
-        user_message = f"학생 질문: {user_input}"
-        if writing_content.strip():
-            user_message += f"\n\n학생이 현재 작성 중인 글: {writing_content[:500]}..."
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.8,
-            max_tokens=400
-        )
-        
-        return response.choices[0].message.content
-        
-    except Exception as e:
-        # API 오류 시 기본 응답
-        fallback_responses = [
-            "죄송합니다. 현재 시스템에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요.",
-            "서비스 연결에 문제가 있습니다. 다시 질문해주시면 더 나은 답변을 드리겠습니다.",
-            "기술적 오류가 발생했습니다. 곧 정상화되니 양해 부탁드립니다."
-        ]
-        return random.choice(fallback_responses)
+# stream=True이면 답변 조각과 출처(실시간/캐시/대체 답변)를 담은 TutorReply를 반환
+# quick=True(빠른 질문 버튼)는 직접 입력한 질문보다 나중에 처리됨
+# history를 주면 이전 대화를 요약과 최근 몇 턴으로 압축해서 함께 보냄
+# record_route=False(미리 받기, 캐시 확인용)이면 모델 등급 라우팅 통계에 세지 않음
+def build_ai_request_advanced(user_input, task_context=None, writing_content="", quick=False, history=None, record_route=True):
+    # 토큰 예산 안에서 수정 중인 문단, 서론, 결론 위주로 글을 골라 담음
+    context = pack_for_level("advanced", writing_content, user_input, st.session_state.edited_paragraph_adv)
+    history_messages = build_history_messages("advanced", history, st.session_state.memory_state_adv) if history else []
+    # 고정 지시문 → 이전 대화 → 과제 유형·질문·글 내용 순서 (앞부분이 1024토큰을 넘는 긴 대화에서만 프롬프트 캐시에 재사용됨)
+    messages = build_messages("advanced", user_input, context, task_context, history_messages)
+    # 요청 종류와 모델 상태에 따라 빠른·표준·대형 모델 중 하나를 고름
+    params = get_router().params_for("advanced", quick, context, record=record_route)
+    
+    # 같은 수준·과제·질문·글 내용이면 캐시된 답변을 재사용
+    cache_key = make_cache_key("advanced", task_context, user_input, context, history_messages)
+    return {
+        "messages": messages,
+        "params": params,
+        "cache_key": cache_key,
+        "offline": get_answer_bank().answer_for_prompt("advanced", task_context, user_input),
+    }
+
+def generate_ai_response_advanced(user_input, task_context=None, writing_content="", stream=False, quick=False, history=None):
+    request = build_ai_request_advanced(user_input, task_context, writing_content, quick, history)
+    return generate_reply(
+        client, "advanced", request["messages"], request["params"], FALLBACK_RESPONSES, request["cache_key"], stream=stream,
+        priority=PRIORITY_QUICK if quick else PRIORITY_FREE_FORM,
+        class_id=class_id, student_id=student_id, offline=request["offline"]
+    )
 
 # 메인 헤더
 st.title("🌳 고급 영어 쓰기")
@@ -228,6 +111,16 @@ with st.sidebar:
     if selected_task_name != "선택해주세요":
         st.session_state.selected_task_adv = ADVANCED_TASKS[selected_task_name]
         st.success(f"'{selected_task_name}' 과제를 선택했습니다!")
+        # 과제를 바꾸면 이전 과제의 예약은 취소하고 새 과제의 빠른 질문 답변을 미리 받아 둠
+        if st.session_state.prefetched_task_adv != selected_task_name:
+            st.session_state.prefetched_task_adv = selected_task_name
+            get_prefetcher().start(
+                f"{student_id}/advanced", client, "advanced",
+                [build_ai_request_advanced(
+                    question["prompt"], st.session_state.selected_task_adv["type"],
+                    st.session_state.writing_content_adv, quick=True, record_route=False
+                ) for question in QUICK_QUESTIONS["advanced"]]
+            )
     
     st.markdown("---")
     st.markdown("### 🎯 고급 수준 특징")
@@ -260,6 +153,13 @@ with st.sidebar:
 if st.session_state.selected_task_adv:
     task = st.session_state.selected_task_adv
     
+    # 과제를 고르거나 새로고침한 뒤 처음 그릴 때 저장해 둔 초안을 불러옴
+    if st.session_state.draft_task_adv != task["type"]:
+        # 저장된 초안이 없으면 비워서 앞 과제의 글이 새 과제로 저장되지 않게 함
+        saved_draft = get_draft_store().load(student_id, "advanced", task["type"])
+        st.session_state.writing_content_adv = saved_draft if saved_draft is not None else ""
+        st.session_state.draft_task_adv = task["type"]
+    
     # 과제 설명
     st.markdown("## 📝 과제 설명")
     st.info(task["description"])
@@ -283,14 +183,20 @@ if st.session_state.selected_task_adv:
             height=500,
             placeholder="자유롭게, 창의적으로 여러분만의 목소리로 글을 써보세요..."
         )
+        # 바뀐 문단을 기억해 두었다가 AI 도우미에게 우선 보여줌
+        if writing_text != st.session_state.writing_content_adv:
+            st.session_state.edited_paragraph_adv = find_edited_paragraph(st.session_state.writing_content_adv, writing_text)
         st.session_state.writing_content_adv = writing_text
+        # 바뀐 글만 자동 저장 (실제 쓰기는 백그라운드 스레드가 모아서 함)
+        get_draft_store().save(student_id, "advanced", task["type"], writing_text)
         
         # 실시간 통계
         if writing_text:
-            words = len(writing_text.split())
-            chars = len(writing_text)
-            sentences = len([s for s in writing_text.split('.') if s.strip()])
-            paragraphs = len([p for p in writing_text.split('\n\n') if p.strip()])
+            stats = text_stats(writing_text)
+            words = stats["words"]
+            chars = stats["chars"]
+            sentences = stats["sentences"]
+            paragraphs = stats["paragraphs"]
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -302,12 +208,28 @@ if st.session_state.selected_task_adv:
             with col4:
                 st.metric("문단", paragraphs)
         
+        # 글에 쓴 복합 문장 구조와 수사 기법 (탐지 결과는 도구 탭에서도 예시로 보여줌)
+        rhetoric = get_rhetoric_detector(task).detect(writing_text)
+        if writing_text.strip():
+            used_structures = [item for item in rhetoric["structures"] if item["used"]]
+            with st.expander(f"🎭 문장 구조·수사 기법 ({len(used_structures)}개 구조, {len(rhetoric['devices'])}개 기법)"):
+                for item in used_structures:
+                    start, end = item["positions"][0][0], item["positions"][-1][1]
+                    st.markdown(f"✅ **{item['target']}** — “{writing_text[start:end]}”")
+                for device in rhetoric["devices"]:
+                    st.markdown(f"🎨 **{device['label']}** — “{device['text']}”")
+                if not used_structures and not rhetoric["devices"]:
+                    st.caption("아직 찾은 구조나 수사 기법이 없어요. 도구 탭의 Rhetorical Devices를 참고해 보세요.")
+        
         # 작성 도구
         st.markdown("### 🛠️ 작성 도구")
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
             if st.button("💾 저장하기", type="primary"):
+                get_draft_store().save(student_id, "advanced", task["type"], writing_text, submitted=True)
+                # 반 전체 제출 글의 유사도 색인에 더함 (교사는 python -m writing_helper.duplicates --report로 확인)
+                get_duplicate_index().add(student_id, "advanced", task["type"], writing_text)
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 st.success(f"작품이 저장되었습니다! ({timestamp})")
                 st.balloons()
@@ -322,8 +244,8 @@ if st.session_state.selected_task_adv:
             if st.button("📊 상세 분석"):
                 if writing_text:
                     # 고급 텍스트 분석
-                    avg_words_per_sentence = words / max(sentences, 1)
-                    avg_chars_per_word = chars / max(words, 1)
+                    avg_words_per_sentence = stats["avg_words_per_sentence"]
+                    avg_chars_per_word = stats["avg_chars_per_word"]
                     
                     st.markdown("#### 📈 글쓰기 분석")
                     col_a, col_b = st.columns(2)
@@ -338,6 +260,31 @@ if st.session_state.selected_task_adv:
                             st.info("🔍 복잡한 문장 구조를 잘 활용하고 있습니다")
                         if paragraphs >= 4:
                             st.success("📝 잘 구조화된 글입니다")
+                    
+                    # 가독성·어휘 다양성 지표
+                    metrics = draft_metrics(writing_text)
+                    col_c, col_d, col_e, col_f = st.columns(4)
+                    with col_c:
+                        st.metric("FK 학년 수준", f"{metrics['fk_grade']:.1f}")
+                    with col_d:
+                        st.metric("읽기 쉬움 점수", f"{metrics['reading_ease']:.0f}")
+                    with col_e:
+                        st.metric("어휘 다양성 (MTLD)", f"{metrics['mtld']:.0f}", help=f"TTR {metrics['ttr']:.2f}")
+                    with col_f:
+                        st.metric("문장 길이 표준편차", f"{metrics['sentence_length_var'] ** 0.5:.1f}")
+                    
+                    # 문법 규칙 점검 (틀린 부분과 고칠 말을 문맥과 함께 표시)
+                    diagnostics = check_grammar(writing_text)
+                    st.markdown("#### ✏️ 문법 점검")
+                    if diagnostics:
+                        counts = summarize(diagnostics)
+                        st.caption(" · ".join(f"{category} {count}" for category, count in counts.items() if count))
+                        for d in diagnostics[:10]:
+                            before = writing_text[max(d["start"] - 20, 0):d["start"]]
+                            after = writing_text[d["end"]:d["end"] + 20]
+                            st.markdown(f"- …{before}~~{d['text']}~~ **{d['suggestion']}**{after}…  \n  {d['category']}: {d['message']}")
+                    else:
+                        st.success("자주 틀리는 문법 규칙에서는 오류를 찾지 못했어요!")
                 else:
                     st.warning("먼저 글을 작성해주세요!")
         
@@ -359,18 +306,13 @@ if st.session_state.selected_task_adv:
         with col5:
             if st.button("💡 창의성 피드백"):
                 if writing_text:
-                    # 창의성 관련 피드백
-                    creativity_aspects = [
-                        ("독창적 아이디어", random.randint(70, 95)),
-                        ("표현의 다양성", random.randint(65, 90)),
-                        ("개인적 목소리", random.randint(75, 100)),
-                        ("구조적 혁신", random.randint(60, 85))
-                    ]
+                    # 어휘·문장·구조 특징으로 계산한 창의성 점수 (같은 글은 다시 계산하지 않음)
+                    creativity = score_creativity(writing_text, task_vocabulary(task))
                     
                     st.markdown("#### 🎨 창의성 평가")
-                    for aspect, score in creativity_aspects:
-                        st.progress(score/100)
-                        st.caption(f"{aspect}: {score}/100")
+                    for aspect, result in creativity.items():
+                        st.progress(result["score"]/100)
+                        st.caption(f"{aspect}: {result['score']}/100 · 💡 {result['tip']}")
                 else:
                     st.warning("먼저 글을 작성해주세요!")
     
@@ -397,6 +339,12 @@ if st.session_state.selected_task_adv:
                     }
                     if tool in rhetorical_examples:
                         st.code(rhetorical_examples[tool])
+                    # 내 글에서 찾은 같은 기법
+                    found = [device["text"] for device in rhetoric["devices"] if device["device"] == tool]
+                    if found:
+                        st.markdown("**내 글에서 찾은 예:**")
+                        for example in found[:3]:
+                            st.markdown(f"> {example}")
                 
                 elif tool_category == "Essay Structures":
                     # 에세이 구조 안내
@@ -414,18 +362,25 @@ if st.session_state.selected_task_adv:
         st.markdown("---")
         st.markdown("### 📚 고급 어휘 및 표현")
         
+        # 글에서 사용한 어휘와 구조를 ✅로 표시
+        vocabulary_usage = get_vocabulary_index("advanced", task).scan(st.session_state.writing_content_adv)
+        used_targets = {item["target"] for item in vocabulary_usage["items"] if item["used"]}
+        used_words, total_words = vocabulary_usage["coverage"]["word"]
+        used_structures, total_structures = vocabulary_usage["coverage"]["expression"]
+        st.caption(f"사용한 고급 어휘 {used_words}/{total_words} · 복합 문장 구조 {used_structures}/{total_structures}")
+        
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("#### 🎓 고급 어휘")
             for vocab in task["advanced_vocabulary"][:8]:
-                if st.button(f"📝 {vocab}", key=f"vocab_{vocab}"):
+                if st.button(f"{'✅' if vocab in used_targets else '📝'} {vocab}", key=f"vocab_{vocab}"):
                     # 클립보드나 텍스트 영역에 단어 추가하는 기능 (구현 예정)
                     st.info(f"'{vocab}' 선택됨")
         
         with col2:
             st.markdown("#### 🔗 복합 문장 구조")
             for structure in task["complex_structures"]:
-                with st.expander(f"📖 {structure[:30]}..."):
+                with st.expander(f"{'✅' if structure in used_targets else '📖'} {structure[:30]}..."):
                     st.code(structure)
     
     with tab3:
@@ -659,6 +614,50 @@ with chat_container:
             st.markdown(f"**🙋‍♀️ 나:** {chat['message']}")
         else:
             st.markdown(f"**🎓 AI 멘토:** {chat['message']}")
+            if chat.get("degraded"):
+                st.caption("⚠️ AI 연결이 원활하지 않아 미리 준비된 답변을 보여드렸어요.")
+
+# 질문을 기록하고 답변을 도착하는 대로 채팅 창에 보여준 뒤 저장
+def ask_ai(message, prompt=None, task_type=None, quick=True):
+    st.session_state.chat_history_adv.append({"role": "user", "message": message})
+    # 인사·잡담·글 없는 첨삭 요청처럼 AI가 필요 없는 입력은 준비된 문장으로 바로 답함
+    if not quick:
+        local = local_reply(message, st.session_state.writing_content_adv)
+        if local is not None:
+            st.session_state.chat_history_adv.append({"role": "ai", "message": local})
+            st.rerun()
+    with chat_container:
+        st.markdown(f"**🙋‍♀️ 나:** {message}")
+        st.markdown("**🎓 AI 멘토:**")
+        # 빠른 질문은 이전 대화 없이 보내 다른 학생과 캐시·호출을 공유함
+        reply = generate_ai_response_advanced(
+            prompt or message, task_type, st.session_state.writing_content_adv, stream=True, quick=quick,
+            history=None if quick else st.session_state.chat_history_adv[:-1]
+        )
+        ai_response = st.write_stream(reply.chunks())
+    st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response, "degraded": reply.degraded})
+    st.rerun()
+
+# 빠른 질문은 미리 준비된 답변으로 바로 답하고, 내 글에 맞춘 답변은 필요할 때만 AI에게 요청
+def ask_quick(question):
+    task_type = st.session_state.selected_task_adv["type"] if st.session_state.selected_task_adv else None
+    # 미리 받아 둔 내 글 맞춤 답변이 있으면 그 답변을, 없으면 준비된 답변을 보여줌
+    request = build_ai_request_advanced(question["prompt"], task_type, st.session_state.writing_content_adv, quick=True, record_route=False)
+    cached = get_response_cache().contains(request["cache_key"])
+    answer = None if cached else get_answer_bank().answer("advanced", task_type, question["id"])
+    if answer is None:
+        ask_ai(question["message"], question["prompt"], task_type=task_type)
+        # ask_ai가 답변을 기록하고 다시 그리므로 준비된 답변(None)은 더하지 않음
+        return
+    st.session_state.chat_history_adv.append({"role": "user", "message": question["message"]})
+    st.session_state.chat_history_adv.append({"role": "ai", "message": answer, "followup": question["prompt"]})
+    st.rerun()
+
+last_chat = st.session_state.chat_history_adv[-1] if st.session_state.chat_history_adv else None
+if last_chat and last_chat.get("followup"):
+    if st.button("✨ 내 글에 맞춘 답변 받기"):
+        task_type = st.session_state.selected_task_adv["type"] if st.session_state.selected_task_adv else None
+        ask_ai("내 글에 맞춰서 더 자세히 알려주세요", last_chat["followup"], task_type=task_type)
 
 # 사용자 입력
 col1, col2 = st.columns([5, 1])
@@ -671,52 +670,17 @@ with col2:
     send_button = st.button("보내기", type="primary")
 
 if send_button and user_input:
-    # 사용자 메시지 추가
-    st.session_state.chat_history_adv.append({"role": "user", "message": user_input})
-    
     # AI 응답 생성 (과제 타입 정보와 현재 글 내용 포함)
     task_type = st.session_state.selected_task_adv["type"] if st.session_state.selected_task_adv else None
-    with st.spinner("AI 멘토가 깊이 생각하고 있습니다..."):
-        ai_response = generate_ai_response_advanced(user_input, task_type, st.session_state.writing_content_adv)
-    st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response})
-    
-    st.rerun()
+    ask_ai(user_input, task_type=task_type, quick=False)
 
 # 전문가 수준 질문 버튼들
 st.markdown("#### 전문가 질문:")
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    if st.button("🎨 창의성 개발"):
-        st.session_state.chat_history_adv.append({"role": "user", "message": "창의적 사고와 독창적 표현을 어떻게 개발할 수 있을까요?"})
-        with st.spinner("창의성에 대해 분석 중..."):
-            ai_response = generate_ai_response_advanced("창의적 사고와 독창적 표현을 어떻게 개발할 수 있을까요?", None, st.session_state.writing_content_adv)
-        st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col2:
-    if st.button("🧠 비판적 사고"):
-        st.session_state.chat_history_adv.append({"role": "user", "message": "비판적 분석과 논리적 추론을 향상시키려면 어떻게 해야 할까요?"})
-        with st.spinner("비판적 사고에 대해 분석 중..."):
-            ai_response = generate_ai_response_advanced("비판적 분석과 논리적 추론을 향상시키려면 어떻게 해야 할까요?", None, st.session_state.writing_content_adv)
-        st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col3:
-    if st.button("📚 학문적 글쓰기"):
-        st.session_state.chat_history_adv.append({"role": "user", "message": "더 학문적이고 정교한 글쓰기를 위한 조언을 주세요"})
-        with st.spinner("학문적 글쓰기에 대해 분석 중..."):
-            ai_response = generate_ai_response_advanced("더 학문적이고 정교한 글쓰기를 위한 조언을 주세요", None, st.session_state.writing_content_adv)
-        st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col4:
-    if st.button("🎭 개인적 목소리"):
-        st.session_state.chat_history_adv.append({"role": "user", "message": "나만의 독특한 글쓰기 스타일과 목소리를 어떻게 개발할 수 있을까요?"})
-        with st.spinner("개인적 목소리에 대해 분석 중..."):
-            ai_response = generate_ai_response_advanced("나만의 독특한 글쓰기 스타일과 목소리를 어떻게 개발할 수 있을까요?", None, st.session_state.writing_content_adv)
-        st.session_state.chat_history_adv.append({"role": "ai", "message": ai_response})
-        st.rerun()
+quick_questions = QUICK_QUESTIONS["advanced"]
+for col, question in zip(st.columns(len(quick_questions)), quick_questions):
+    with col:
+        if st.button(question["label"]):
+            ask_quick(question)
 
 # 채팅 기록 관리
 if st.session_state.chat_history_adv:
@@ -734,6 +698,7 @@ if st.session_state.chat_history_adv:
     with col2:
         if st.button("🗑️ 채팅 기록 삭제"):
             st.session_state.chat_history_adv = []
+            st.session_state.memory_state_adv = new_memory_state()
             st.rerun()
 
 else:
@@ -3,6 +3,26 @@ import random
 from datetime import datetime
 from openai import OpenAI
 
+from writing_helper.answer_bank import get_answer_bank
+from writing_helper.blank_fill import STATUS_LABELS, get_template_matcher
+from writing_helper.cache import get_response_cache, make_cache_key
+from writing_helper.context import find_edited_paragraph, pack_for_level
+from writing_helper.drafts import get_draft_store
+from writing_helper.duplicates import get_duplicate_index
+from writing_helper.grammar import check_grammar, summarize
+from writing_helper.learner import get_learner
+from writing_helper.memory import build_history_messages, new_memory_state
+from writing_helper.prefetch import get_prefetcher
+from writing_helper.prefilter import local_reply
+from writing_helper.prompts import build_messages
+from writing_helper.router import get_router
+from writing_helper.scheduler import PRIORITY_FREE_FORM, PRIORITY_QUICK
+from writing_helper.spelling import check_spelling, spelling_index_ready, task_words, warm_spelling_index
+from writing_helper.tasks import BEGINNER_TASKS, QUICK_QUESTIONS
+from writing_helper.textstats import text_stats
+from writing_helper.tutor import generate_reply
+from writing_helper.vocab_index import get_vocabulary_index
+
 # 페이지 설정
 st.set_page_config(
     page_title="초급 영어 쓰기",
@@ -16,94 +36,64 @@ def init_openai_client():
     return OpenAI(api_key=st.secrets["openai"]["api_key"])
 
 client = init_openai_client()
+class_id, student_id = get_learner()
+# 철자 색인은 글을 쓰기 시작하기 전에 백그라운드에서 미리 열어 둠
+warm_spelling_index()
 
 # 세션 상태 초기화
 if 'writing_content' not in st.session_state:
     st.session_state.writing_content = ""
+if 'draft_task' not in st.session_state:
+    st.session_state.draft_task = None
+if 'edited_paragraph' not in st.session_state:
+    st.session_state.edited_paragraph = None
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
+if 'memory_state' not in st.session_state:
+    st.session_state.memory_state = new_memory_state()
 if 'selected_task' not in st.session_state:
     st.session_state.selected_task = None
+if 'prefetched_task' not in st.session_state:
+    st.session_state.prefetched_task = None
 
-# 초급 수준 과제 데이터
-BEGINNER_TASKS = {
-    "자기소개": {
-        "type": "fill_blanks",
-        "description": "빈칸을 채워서 자기소개 문단을 완성하세요.",
-        "template": """Hello! My name is _______. I am _______ years old. I live in _______ with my _______. 
-I have _______ (pet/hobby). My favorite subject is _______. I like to _______ in my free time. 
-My favorite food is _______. Nice to meet you!""",
-        "vocabulary": ["name", "age", "family", "hobby", "subject", "food", "pet"],
-        "hints": ["이름을 써보세요", "나이를 숫자로 써보세요", "사는 곳을 써보세요"]
-    },
-    "내 방 묘사": {
-        "type": "picture_description",
-        "description": "그림을 보고 방을 묘사하는 글을 써보세요.",
-        "template": """This is my room. In my room, there is _______. 
-The _______ is next to the _______. I have _______ on the desk. 
-The walls are _______ color. I like my room because _______.""",
-        "vocabulary": ["bed", "desk", "chair", "window", "door", "lamp", "book", "computer"],
-        "hints": ["방에 있는 물건들을 써보세요", "색깔을 설명해보세요", "위치를 나타내는 말을 써보세요"]
-    },
-    "좋아하는 음식": {
-        "type": "opinion",
-        "description": "좋아하는 음식에 대해 간단히 써보세요.",
-        "template": """My favorite food is _______. It tastes _______. 
-I usually eat it _______. My mom/dad makes it for me. 
-I like it because _______. When I eat it, I feel _______.""",
-        "vocabulary": ["delicious", "sweet", "spicy", "healthy", "happy", "hungry", "breakfast", "lunch", "dinner"],
-        "hints": ["음식 이름을 써보세요", "맛을 설명해보세요", "언제 먹는지 써보세요"]
-    }
-}
+# API 오류 시 기본 응답
+FALLBACK_RESPONSES = [
+    "죄송해요! 일시적으로 문제가 있네요. 다시 시도해주세요. 🤖",
+    "잠깐만요! 다시 한 번 물어봐주시겠어요? 😊",
+    "아, 지금 조금 바빠요! 곧 도와드릴게요! ⏰"
+]
 
 # 도우미 응답 생성 함수 (OpenAI API 사용)
-def generate_ai_response(user_input, writing_content=""):
-    try:
-        # 초급 수준 학습자를 위한 시스템 프롬프트
-        system_prompt = """
-        당신은 한국 중학생 영어 초급 학습자를 위한 친근하고 도움이 되는 AI 영어 선생님입니다.
-        
-        특징:
-        - 간단하고 이해하기 쉬운 한국어로 설명
-        - 기초적인 문법과 어휘 중심
-        - 격려와 동기부여 제공
-        - 실수를 두려워하지 않도록 따뜻한 톤
-        - 구체적이고 실용적인 조언
-        
-        학습자가 질문하면:
-        1. 문법: 기본 문법을 예시와 함께 설명
-        2. 어휘: 초급 수준 단어와 표현 제안
-        3. 작문: 간단한 문장 구조와 아이디어 제공
-        4. 일반: 영어 학습 동기부여와 격려
-        
-        답변은 3-4문장으로 간결하게, 이모지를 적절히 사용해서 친근하게 해주세요.
-        """
-        
-        # 사용자의 현재 작성 내용도 컨텍스트로 제공
-        user_message = f"학생 질문: {user_input}"
-        if writing_content.strip():
-            user_message += f"\n\n학생이 현재 작성 중인 글: {writing_content[:200]}..."
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            max_tokens=200
-        )
-        
-        return response.choices[0].message.content
-        
-    except Exception as e:
-        # API 오류 시 기본 응답
-        fallback_responses = [
-            "죄송해요! 일시적으로 문제가 있네요. 다시 시도해주세요. 🤖",
-            "잠깐만요! 다시 한 번 물어봐주시겠어요? 😊",
-            "아, 지금 조금 바빠요! 곧 도와드릴게요! ⏰"
-        ]
-        return random.choice(fallback_responses)
+# stream=True이면 답변 조각과 출처(실시간/캐시/대체 답변)를 담은 TutorReply를 반환
+# quick=True(빠른 질문 버튼)는 직접 입력한 질문보다 나중에 처리됨
+# history를 주면 이전 대화를 요약과 최근 몇 턴으로 압축해서 함께 보냄
+# record_route=False(미리 받기, 캐시 확인용)이면 모델 등급 라우팅 통계에 세지 않음
+def build_ai_request(user_input, writing_content="", quick=False, history=None, record_route=True):
+    task_type = st.session_state.selected_task["type"] if st.session_state.selected_task else None
+    # 토큰 예산 안에서 수정 중인 문단, 서론, 결론 위주로 글을 골라 담음
+    context = pack_for_level("beginner", writing_content, user_input, st.session_state.edited_paragraph)
+    history_messages = build_history_messages("beginner", history, st.session_state.memory_state) if history else []
+    # 고정 지시문 → 이전 대화 → 과제 유형·질문·글 내용 순서 (앞부분이 1024토큰을 넘는 긴 대화에서만 프롬프트 캐시에 재사용됨)
+    messages = build_messages("beginner", user_input, context, task_type, history_messages)
+    # 요청 종류와 모델 상태에 따라 빠른·표준·대형 모델 중 하나를 고름
+    params = get_router().params_for("beginner", quick, context, record=record_route)
+    
+    # 같은 수준·과제·질문·글 내용이면 캐시된 답변을 재사용
+    cache_key = make_cache_key("beginner", task_type, user_input, context, history_messages)
+    return {
+        "messages": messages,
+        "params": params,
+        "cache_key": cache_key,
+        "offline": get_answer_bank().answer_for_prompt("beginner", task_type, user_input),
+    }
+
+def generate_ai_response(user_input, writing_content="", stream=False, quick=False, history=None):
+    request = build_ai_request(user_input, writing_content, quick, history)
+    return generate_reply(
+        client, "beginner", request["messages"], request["params"], FALLBACK_RESPONSES, request["cache_key"], stream=stream,
+        priority=PRIORITY_QUICK if quick else PRIORITY_FREE_FORM,
+        class_id=class_id, student_id=student_id, offline=request["offline"]
+    )
 
 # 메인 헤더
 st.title("🌱 초급 영어 쓰기")
@@ -119,6 +109,14 @@ with st.sidebar:
     if selected_task_name != "선택해주세요":
         st.session_state.selected_task = BEGINNER_TASKS[selected_task_name]
         st.success(f"'{selected_task_name}' 과제를 선택했습니다!")
+        # 과제를 바꾸면 이전 과제의 예약은 취소하고 새 과제의 빠른 질문 답변을 미리 받아 둠
+        if st.session_state.prefetched_task != selected_task_name:
+            st.session_state.prefetched_task = selected_task_name
+            get_prefetcher().start(
+                f"{student_id}/beginner", client, "beginner",
+                [build_ai_request(question["prompt"], st.session_state.writing_content, quick=True, record_route=False)
+                 for question in QUICK_QUESTIONS["beginner"]]
+            )
     
     st.markdown("---")
     st.markdown("### 🎯 초급 수준 특징")
@@ -131,6 +129,13 @@ with st.sidebar:
 if st.session_state.selected_task:
     task = st.session_state.selected_task
     
+    # 과제를 고르거나 새로고침한 뒤 처음 그릴 때 저장해 둔 초안을 불러옴
+    if st.session_state.draft_task != task["type"]:
+        # 저장된 초안이 없으면 비워서 앞 과제의 글이 새 과제로 저장되지 않게 함
+        saved_draft = get_draft_store().load(student_id, "beginner", task["type"])
+        st.session_state.writing_content = saved_draft if saved_draft is not None else ""
+        st.session_state.draft_task = task["type"]
+    
     # 과제 설명
     st.markdown("## 📝 과제 설명")
     st.info(task["description"])
@@ -150,12 +155,44 @@ if st.session_state.selected_task:
             height=300,
             placeholder="위의 템플릿을 참고해서 빈칸을 채워보세요..."
         )
+        # 바뀐 문단을 기억해 두었다가 AI 도우미에게 우선 보여줌
+        if writing_text != st.session_state.writing_content:
+            st.session_state.edited_paragraph = find_edited_paragraph(st.session_state.writing_content, writing_text)
         st.session_state.writing_content = writing_text
+        # 바뀐 글만 자동 저장 (실제 쓰기는 백그라운드 스레드가 모아서 함)
+        get_draft_store().save(student_id, "beginner", task["type"], writing_text)
+        
+        # 빈칸별 확인 (템플릿에 맞춰 정렬해서 채운 빈칸, 남은 빈칸, 바뀐 틀을 바로 보여줌)
+        if writing_text.strip():
+            blank_check = get_template_matcher(task["template"]).check(writing_text)
+            st.progress(blank_check["filled"] / max(blank_check["total"], 1),
+                        text=f"🧩 빈칸 {blank_check['filled']}/{blank_check['total']}개 채움")
+            with st.expander("🧩 빈칸 확인"):
+                for blank in blank_check["blanks"]:
+                    value = f" → **{blank['value']}**" if blank["value"] else ""
+                    st.markdown(f"{STATUS_LABELS[blank['status']]} · `{blank['label']}`{value}")
+                if blank_check["changed"]:
+                    st.caption("✏️ 템플릿과 달라진 부분: " + " / ".join(blank_check["changed"][:5]))
+            
+            # 철자 확인 (과제 단어를 우선 추천, 색인을 여는 중이면 다음 입력 때 확인)
+            spelling_ready = spelling_index_ready()
+            misspelled = check_spelling(writing_text, task_words(task)) if spelling_ready else ()
+            if not spelling_ready:
+                st.caption("🔤 철자 사전을 준비하고 있어요...")
+            elif misspelled:
+                with st.expander(f"🔤 철자 확인 ({len(misspelled)}개)", expanded=True):
+                    for item in misspelled:
+                        best, *others = item["suggestions"]
+                        alternatives = f" (또는 {', '.join(others)})" if others else ""
+                        st.markdown(f"~~{item['text']}~~ → **{best}**{alternatives}")
         
         # 저장 버튼
         col1_1, col1_2, col1_3 = st.columns(3)
         with col1_1:
             if st.button("💾 저장하기", type="primary"):
+                get_draft_store().save(student_id, "beginner", task["type"], writing_text, submitted=True)
+                # 반 전체 제출 글의 유사도 색인에 더함 (교사는 python -m writing_helper.duplicates --report로 확인)
+                get_duplicate_index().add(student_id, "beginner", task["type"], writing_text)
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 st.success(f"글이 저장되었습니다! ({timestamp})")
                 st.balloons()
@@ -168,20 +205,36 @@ if st.session_state.selected_task:
         with col1_3:
             if st.button("📊 기본 분석"):
                 if writing_text:
-                    word_count = len(writing_text.split())
-                    char_count = len(writing_text)
+                    stats = text_stats(writing_text)
+                    word_count = stats["words"]
+                    char_count = stats["chars"]
                     st.metric("단어 수", word_count)
                     st.metric("글자 수", char_count)
+                    # 문법 규칙 점검 (틀린 부분과 고칠 말을 문맥과 함께 표시)
+                    diagnostics = check_grammar(writing_text)
+                    st.markdown("#### ✏️ 문법 점검")
+                    if diagnostics:
+                        counts = summarize(diagnostics)
+                        st.caption(" · ".join(f"{category} {count}" for category, count in counts.items() if count))
+                        for d in diagnostics[:10]:
+                            before = writing_text[max(d["start"] - 20, 0):d["start"]]
+                            after = writing_text[d["end"]:d["end"] + 20]
+                            st.markdown(f"- …{before}~~{d['text']}~~ **{d['suggestion']}**{after}…  \n  {d['category']}: {d['message']}")
+                    else:
+                        st.success("자주 틀리는 문법 규칙에서는 오류를 찾지 못했어요!")
                 else:
                     st.warning("먼저 글을 작성해주세요!")
     
     with col2:
         st.markdown("### 💡 도움말")
         
-        # 어휘 도움말
-        with st.expander("📚 유용한 단어들", expanded=True):
+        # 어휘 도움말 (글에 이미 쓴 단어는 ✅ 표시)
+        vocabulary_usage = get_vocabulary_index("beginner", task).scan(writing_text)
+        used_words = {item["target"] for item in vocabulary_usage["items"] if item["used"]}
+        used, total = vocabulary_usage["coverage"]["word"]
+        with st.expander(f"📚 유용한 단어들 (사용 {used}/{total})", expanded=True):
             for word in task["vocabulary"]:
-                st.markdown(f"- **{word}**")
+                st.markdown(f"- {'✅' if word in used_words else '⬜'} **{word}**")
         
         # 힌트
         with st.expander("🔍 힌트", expanded=True):
@@ -212,6 +265,49 @@ with chat_container:
             st.markdown(f"**🙋‍♀️ 나:** {chat['message']}")
         else:
             st.markdown(f"**🤖 AI 도우미:** {chat['message']}")
+            if chat.get("degraded"):
+                st.caption("⚠️ AI 연결이 원활하지 않아 미리 준비된 답변을 보여드렸어요.")
+
+# 질문을 기록하고 답변을 도착하는 대로 채팅 창에 보여준 뒤 저장
+def ask_ai(message, prompt=None, quick=True):
+    st.session_state.chat_history.append({"role": "user", "message": message})
+    # 인사·잡담·글 없는 첨삭 요청처럼 AI가 필요 없는 입력은 준비된 문장으로 바로 답함
+    if not quick:
+        local = local_reply(message, st.session_state.writing_content)
+        if local is not None:
+            st.session_state.chat_history.append({"role": "ai", "message": local})
+            st.rerun()
+    with chat_container:
+        st.markdown(f"**🙋‍♀️ 나:** {message}")
+        st.markdown("**🤖 AI 도우미:**")
+        # 빠른 질문은 이전 대화 없이 보내 다른 학생과 캐시·호출을 공유함
+        reply = generate_ai_response(
+            prompt or message, st.session_state.writing_content, stream=True, quick=quick,
+            history=None if quick else st.session_state.chat_history[:-1]
+        )
+        ai_response = st.write_stream(reply.chunks())
+    st.session_state.chat_history.append({"role": "ai", "message": ai_response, "degraded": reply.degraded})
+    st.rerun()
+
+# 빠른 질문은 미리 준비된 답변으로 바로 답하고, 내 글에 맞춘 답변은 필요할 때만 AI에게 요청
+def ask_quick(question):
+    task_type = st.session_state.selected_task["type"] if st.session_state.selected_task else None
+    # 미리 받아 둔 내 글 맞춤 답변이 있으면 그 답변을, 없으면 준비된 답변을 보여줌
+    request = build_ai_request(question["prompt"], st.session_state.writing_content, quick=True, record_route=False)
+    cached = get_response_cache().contains(request["cache_key"])
+    answer = None if cached else get_answer_bank().answer("beginner", task_type, question["id"])
+    if answer is None:
+        ask_ai(question["message"], question["prompt"])
+        # ask_ai가 답변을 기록하고 다시 그리므로 준비된 답변(None)은 더하지 않음
+        return
+    st.session_state.chat_history.append({"role": "user", "message": question["message"]})
+    st.session_state.chat_history.append({"role": "ai", "message": answer, "followup": question["prompt"]})
+    st.rerun()
+
+last_chat = st.session_state.chat_history[-1] if st.session_state.chat_history else None
+if last_chat and last_chat.get("followup"):
+    if st.button("✨ 내 글에 맞춘 답변 받기"):
+        ask_ai("내 글에 맞춰서 더 자세히 알려주세요", last_chat["followup"])
 
 # 사용자 입력
 col1, col2 = st.columns([4, 1])
@@ -221,48 +317,22 @@ with col2:
     send_button = st.button("보내기", type="primary")
 
 if send_button and user_input:
-    # 사용자 메시지 추가
-    st.session_state.chat_history.append({"role": "user", "message": user_input})
-    
     # AI 응답 생성 (현재 작성 중인 글도 함께 전달)
-    with st.spinner("AI가 생각하고 있어요..."):
-        ai_response = generate_ai_response(user_input, st.session_state.writing_content)
-    st.session_state.chat_history.append({"role": "ai", "message": ai_response})
-    
-    st.rerun()
+    ask_ai(user_input, quick=False)
 
 # 퀵 질문 버튼들
 st.markdown("#### 빠른 질문:")
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button("❓ 문법이 궁금해요"):
-        st.session_state.chat_history.append({"role": "user", "message": "문법에 대해 도움을 주세요"})
-        with st.spinner("답변을 준비하고 있어요..."):
-            ai_response = generate_ai_response("문법에 대해 도움을 주세요", st.session_state.writing_content)
-        st.session_state.chat_history.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col2:
-    if st.button("📖 단어를 모르겠어요"):
-        st.session_state.chat_history.append({"role": "user", "message": "단어에 대해 도움을 주세요"})
-        with st.spinner("답변을 준비하고 있어요..."):
-            ai_response = generate_ai_response("단어에 대해 도움을 주세요", st.session_state.writing_content)
-        st.session_state.chat_history.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col3:
-    if st.button("💭 아이디어가 떠오르지 않아요"):
-        st.session_state.chat_history.append({"role": "user", "message": "아이디어에 대해 도움을 주세요"})
-        with st.spinner("답변을 준비하고 있어요..."):
-            ai_response = generate_ai_response("아이디어에 대해 도움을 주세요", st.session_state.writing_content)
-        st.session_state.chat_history.append({"role": "ai", "message": ai_response})
-        st.rerun()
+quick_questions = QUICK_QUESTIONS["beginner"]
+for col, question in zip(st.columns(len(quick_questions)), quick_questions):
+    with col:
+        if st.button(question["label"]):
+            ask_quick(question)
 
 # 채팅 기록 초기화 버튼
 if st.session_state.chat_history:
     if st.button("🗑️ 채팅 기록 지우기"):
         st.session_state.chat_history = []
+        st.session_state.memory_state = new_memory_state()
         st.rerun()
 
 else:
@@ -1,8 +1,28 @@
 import streamlit as st
 import random
 from datetime import datetime
+import pandas as pd
 from openai import OpenAI
 
+from writing_helper.answer_bank import get_answer_bank
+from writing_helper.cache import get_response_cache, make_cache_key
+from writing_helper.context import find_edited_paragraph, pack_for_level
+from writing_helper.drafts import get_draft_store
+from writing_helper.duplicates import get_duplicate_index
+from writing_helper.grammar import check_grammar, summarize
+from writing_helper.guide_coverage import get_guide_index
+from writing_helper.learner import get_learner
+from writing_helper.memory import build_history_messages, new_memory_state
+from writing_helper.prefetch import get_prefetcher
+from writing_helper.prefilter import local_reply
+from writing_helper.prompts import build_messages
+from writing_helper.router import get_router
+from writing_helper.scheduler import PRIORITY_FREE_FORM, PRIORITY_QUICK
+from writing_helper.tasks import INTERMEDIATE_TASKS, QUICK_QUESTIONS
+from writing_helper.textstats import text_stats
+from writing_helper.tutor import generate_reply
+from writing_helper.vocab_index import get_vocabulary_index
+
 # 페이지 설정
 st.set_page_config(
     page_title="중급 영어 쓰기",
@@ -16,85 +36,26 @@ def init_openai_client():
     return OpenAI(api_key=st.secrets["openai"]["api_key"])
 
 client = init_openai_client()
+class_id, student_id = get_learner()
 
 # 세션 상태 초기화
 if 'writing_content_inter' not in st.session_state:
     st.session_state.writing_content_inter = ""
+if 'draft_task_inter' not in st.session_state:
+    st.session_state.draft_task_inter = None
+if 'edited_paragraph_inter' not in st.session_state:
+    st.session_state.edited_paragraph_inter = None
 if 'chat_history_inter' not in st.session_state:
     st.session_state.chat_history_inter = []
+if 'memory_state_inter' not in st.session_state:
+    st.session_state.memory_state_inter = new_memory_state()
 if 'selected_task_inter' not in st.session_state:
     st.session_state.selected_task_inter = None
+if 'prefetched_task_inter' not in st.session_state:
+    st.session_state.prefetched_task_inter = None
 if 'brainstorming_ideas' not in st.session_state:
     st.session_state.brainstorming_ideas = []
 
-# 중급 수준 과제 데이터
-INTERMEDIATE_TASKS = {
-    "나의 꿈": {
-        "type": "opinion_essay",
-        "description": "미래의 꿈과 목표에 대해 3-4개 문단으로 글을 써보세요.",
-        "guide_questions": [
-            "What is your dream job? Why do you want this job?",
-            "What skills do you need to achieve your dream?",
-            "How will you prepare for your future career?",
-            "What challenges might you face and how will you overcome them?"
-        ],
-        "useful_expressions": {
-            "서론": ["In the future, I want to...", "My dream is to...", "I have always wanted to..."],
-            "본론": ["The reason why I want this job is...", "First of all,", "Moreover,", "In addition to that,"],
-            "결론": ["In conclusion,", "To sum up,", "I believe that...", "I am confident that..."]
-        },
-        "vocabulary": ["ambitious", "goal", "achieve", "determine", "challenge", "overcome", "prepare", "career"]
-    },
-    "환경 보호": {
-        "type": "argumentative",
-        "description": "환경 보호의 중요성과 실천 방법에 대해 설득력 있는 글을 써보세요.",
-        "guide_questions": [
-            "Why is environmental protection important?",
-            "What are the main environmental problems we face today?",
-            "What can individuals do to protect the environment?",
-            "How can we encourage others to be more environmentally friendly?"
-        ],
-        "useful_expressions": {
-            "의견 제시": ["I strongly believe that...", "It is crucial that...", "We must realize that..."],
-            "예시 제공": ["For example,", "For instance,", "Such as", "A good example is..."],
-            "결과 표현": ["As a result,", "Therefore,", "Consequently,", "This leads to..."]
-        },
-        "vocabulary": ["pollution", "sustainable", "recycle", "renewable", "conservation", "ecosystem", "reduce", "global warming"]
-    },
-    "문화 비교": {
-        "type": "compare_contrast",
-        "description": "한국 문화와 다른 나라 문화를 비교하고 대조하는 글을 써보세요.",
-        "guide_questions": [
-            "What country would you like to compare with Korea?",
-            "What are the similarities between the two cultures?",
-            "What are the main differences?",
-            "What can we learn from each other's cultures?"
-        ],
-        "useful_expressions": {
-            "유사점": ["Both countries have...", "Similarly,", "In the same way,", "Like Korea,"],
-            "차이점": ["However,", "On the other hand,", "In contrast,", "Unlike Korea,"],
-            "비교": ["compared to", "while", "whereas", "although"]
-        },
-        "vocabulary": ["tradition", "custom", "festival", "cuisine", "language", "society", "values", "diversity"]
-    },
-    "학교생활 경험": {
-        "type": "narrative",
-        "description": "기억에 남는 학교생활 경험이나 사건에 대한 이야기를 써보세요.",
-        "guide_questions": [
-            "What memorable event happened at school?",
-            "When and where did it happen?",
-            "Who was involved in this experience?",
-            "How did you feel and what did you learn from it?"
-        ],
-        "useful_expressions": {
-            "시간 순서": ["First,", "Then,", "After that,", "Finally,", "Meanwhile,"],
-            "감정 표현": ["I felt...", "I was excited/nervous/proud", "It made me realize..."],
-            "묘사": ["It was...", "The atmosphere was...", "I remember that..."]
-        },
-        "vocabulary": ["memorable", "experience", "participate", "nervous", "proud", "realize", "atmosphere", "encourage"]
-    }
-}
-
 # 아이디어 구상 도구
 BRAINSTORMING_PROMPTS = {
     "Mind Map": ["중심 주제에서 시작해서 관련된 아이디어들을 가지치기해보세요", "각 가지에서 더 구체적인 예시나 경험을 생각해보세요"],
@@ -103,56 +64,43 @@ BRAINSTORMING_PROMPTS = {
     "Story Structure": ["배경 설정 → 문제/갈등 → 해결과정 → 결과/교훈 순서로 구성해보세요"]
 }
 
+# API 오류 시 기본 응답
+FALLBACK_RESPONSES = [
+    "미안해요! 지금 일시적으로 문제가 있어요. 다시 한 번 시도해주세요. 🔄",
+    "잠깐만요! 더 나은 답변을 위해 다시 질문해주세요. 💭",
+    "앗, 무언가 잘못됐네요! 조금 후에 다시 시도해주세요. ⚡"
+]
+
 # 도우미 응답 생성 함수 (중급 수준)
-def generate_ai_response_intermediate(user_input, task_context=None, writing_content=""):
-    try:
-        # 중급 수준 학습자를 위한 시스템 프롬프트
-        system_prompt = f"""
-        당신은 한국 중학생 영어 중급 학습자를 위한 전문적이고 도움이 되는 AI 영어 선생님입니다.
-        
-        특징:
-        - 체계적이고 구조적인 조언 제공
-        - 중급 수준의 문법과 어휘 활용
-        - 글의 구조와 논리적 전개 중시
-        - 구체적인 예시와 함께 설명
-        - 학습자의 창의성과 자기표현 격려
-        
-        현재 과제 유형: {task_context if task_context else "일반"}
-        
-        학습자가 질문하면:
-        1. 구조: 서론-본론-결론, 문단 구성, 연결어구 활용
-        2. 어휘: 다양한 표현, 동의어, 연결어구 제안
-        3. 문법: 복합문, 다양한 시제, 문장 패턴
-        4. 내용: 아이디어 발전, 근거 제시, 예시 활용
-        
-        답변은 4-5문장으로 구체적이고 실용적으로, 이모지를 적절히 사용해주세요.
-        """
-        
-        # 사용자의 현재 작성 내용과 과제 맥락 제공
-        user_message = f"학생 질문: {user_input}"
-        if writing_content.strip():
-            user_message += f"\n\n학생이 현재 작성 중인 글: {writing_content[:300]}..."
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            max_tokens=300
-        )
-        
-        return response.choices[0].message.content
-        
-    except Exception as e:
-        # API 오류 시 기본 응답
-        fallback_responses = [
-            "미안해요! 지금 일시적으로 문제가 있어요. 다시 한 번 시도해주세요. 🔄",
-            "잠깐만요! 더 나은 답변을 위해 다시 질문해주세요. 💭",
-            "앗, 무언가 잘못됐네요! 조금 후에 다시 시도해주세요. ⚡"
-        ]
-        return random.choice(fallback_responses)
+# stream=True이면 답변 조각과 출처(실시간/캐시/대체 답변)를 담은 TutorReply를 반환
+# quick=True(빠른 질문 버튼)는 직접 입력한 질문보다 나중에 처리됨
+# history를 주면 이전 대화를 요약과 최근 몇 턴으로 압축해서 함께 보냄
+# record_route=False(미리 받기, 캐시 확인용)이면 모델 등급 라우팅 통계에 세지 않음
+def build_ai_request_intermediate(user_input, task_context=None, writing_content="", quick=False, history=None, record_route=True):
+    # 토큰 예산 안에서 수정 중인 문단, 서론, 결론 위주로 글을 골라 담음
+    context = pack_for_level("intermediate", writing_content, user_input, st.session_state.edited_paragraph_inter)
+    history_messages = build_history_messages("intermediate", history, st.session_state.memory_state_inter) if history else []
+    # 고정 지시문 → 이전 대화 → 과제 유형·질문·글 내용 순서 (앞부분이 1024토큰을 넘는 긴 대화에서만 프롬프트 캐시에 재사용됨)
+    messages = build_messages("intermediate", user_input, context, task_context, history_messages)
+    # 요청 종류와 모델 상태에 따라 빠른·표준·대형 모델 중 하나를 고름
+    params = get_router().params_for("intermediate", quick, context, record=record_route)
+    
+    # 같은 수준·과제·질문·글 내용이면 캐시된 답변을 재사용
+    cache_key = make_cache_key("intermediate", task_context, user_input, context, history_messages)
+    return {
+        "messages": messages,
+        "params": params,
+        "cache_key": cache_key,
+        "offline": get_answer_bank().answer_for_prompt("intermediate", task_context, user_input),
+    }
+
+def generate_ai_response_intermediate(user_input, task_context=None, writing_content="", stream=False, quick=False, history=None):
+    request = build_ai_request_intermediate(user_input, task_context, writing_content, quick, history)
+    return generate_reply(
+        client, "intermediate", request["messages"], request["params"], FALLBACK_RESPONSES, request["cache_key"], stream=stream,
+        priority=PRIORITY_QUICK if quick else PRIORITY_FREE_FORM,
+        class_id=class_id, student_id=student_id, offline=request["offline"]
+    )
 
 # 메인 헤더
 st.title("🌿 중급 영어 쓰기")
@@ -168,6 +116,16 @@ with st.sidebar:
     if selected_task_name != "선택해주세요":
         st.session_state.selected_task_inter = INTERMEDIATE_TASKS[selected_task_name]
         st.success(f"'{selected_task_name}' 과제를 선택했습니다!")
+        # 과제를 바꾸면 이전 과제의 예약은 취소하고 새 과제의 빠른 질문 답변을 미리 받아 둠
+        if st.session_state.prefetched_task_inter != selected_task_name:
+            st.session_state.prefetched_task_inter = selected_task_name
+            get_prefetcher().start(
+                f"{student_id}/intermediate", client, "intermediate",
+                [build_ai_request_intermediate(
+                    question["prompt"], st.session_state.selected_task_inter["type"],
+                    st.session_state.writing_content_inter, quick=True, record_route=False
+                ) for question in QUICK_QUESTIONS["intermediate"]]
+            )
     
     st.markdown("---")
     st.markdown("### 🎯 중급 수준 특징")
@@ -195,6 +153,13 @@ with st.sidebar:
 if st.session_state.selected_task_inter:
     task = st.session_state.selected_task_inter
     
+    # 과제를 고르거나 새로고침한 뒤 처음 그릴 때 저장해 둔 초안을 불러옴
+    if st.session_state.draft_task_inter != task["type"]:
+        # 저장된 초안이 없으면 비워서 앞 과제의 글이 새 과제로 저장되지 않게 함
+        saved_draft = get_draft_store().load(student_id, "intermediate", task["type"])
+        st.session_state.writing_content_inter = saved_draft if saved_draft is not None else ""
+        st.session_state.draft_task_inter = task["type"]
+    
     # 과제 설명
     st.markdown("## 📝 과제 설명")
     st.info(task["description"])
@@ -211,12 +176,20 @@ if st.session_state.selected_task_inter:
             height=400,
             placeholder="안내 질문들을 참고해서 체계적으로 글을 써보세요..."
         )
+        # 바뀐 문단을 기억해 두었다가 AI 도우미에게 우선 보여줌
+        if writing_text != st.session_state.writing_content_inter:
+            st.session_state.edited_paragraph_inter = find_edited_paragraph(st.session_state.writing_content_inter, writing_text)
         st.session_state.writing_content_inter = writing_text
+        # 바뀐 글만 자동 저장 (실제 쓰기는 백그라운드 스레드가 모아서 함)
+        get_draft_store().save(student_id, "intermediate", task["type"], writing_text)
         
         # 작성 도구
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             if st.button("💾 저장하기", type="primary"):
+                get_draft_store().save(student_id, "intermediate", task["type"], writing_text, submitted=True)
+                # 반 전체 제출 글의 유사도 색인에 더함 (교사는 python -m writing_helper.duplicates --report로 확인)
+                get_duplicate_index().add(student_id, "intermediate", task["type"], writing_text)
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 st.success(f"글이 저장되었습니다! ({timestamp})")
                 st.balloons()
@@ -229,17 +202,28 @@ if st.session_state.selected_task_inter:
         with col3:
             if st.button("📊 글 분석"):
                 if writing_text:
-                    words = writing_text.split()
-                    sentences = writing_text.split('.')
-                    paragraphs = writing_text.split('\n\n')
+                    stats = text_stats(writing_text)
                     
                     col_a, col_b, col_c = st.columns(3)
                     with col_a:
-                        st.metric("단어 수", len(words))
+                        st.metric("단어 수", stats["words"])
                     with col_b:
-                        st.metric("문장 수", len([s for s in sentences if s.strip()]))
+                        st.metric("문장 수", stats["sentences"])
                     with col_c:
-                        st.metric("문단 수", len([p for p in paragraphs if p.strip()]))
+                        st.metric("문단 수", stats["paragraphs"])
+                    
+                    # 문법 규칙 점검 (틀린 부분과 고칠 말을 문맥과 함께 표시)
+                    diagnostics = check_grammar(writing_text)
+                    st.markdown("#### ✏️ 문법 점검")
+                    if diagnostics:
+                        counts = summarize(diagnostics)
+                        st.caption(" · ".join(f"{category} {count}" for category, count in counts.items() if count))
+                        for d in diagnostics[:10]:
+                            before = writing_text[max(d["start"] - 20, 0):d["start"]]
+                            after = writing_text[d["end"]:d["end"] + 20]
+                            st.markdown(f"- …{before}~~{d['text']}~~ **{d['suggestion']}**{after}…  \n  {d['category']}: {d['message']}")
+                    else:
+                        st.success("자주 틀리는 문법 규칙에서는 오류를 찾지 못했어요!")
                 else:
                     st.warning("먼저 글을 작성해주세요!")
         
@@ -247,7 +231,8 @@ if st.session_state.selected_task_inter:
             if st.button("🔍 기본 피드백"):
                 if writing_text:
                     # 기본적인 피드백 제공
-                    word_count = len(writing_text.split())
+                    stats = text_stats(writing_text)
+                    word_count = stats["words"]
                     if word_count < 50:
                         st.warning("더 자세히 써보세요! (최소 50단어 권장)")
                     elif word_count > 200:
@@ -256,10 +241,18 @@ if st.session_state.selected_task_inter:
                         st.success("적절한 길이의 글이에요!")
                     
                     # 문단 체크
-                    if '\n\n' in writing_text:
+                    if stats["paragraphs"] > 1:
                         st.success("✅ 문단 구분이 잘 되어 있어요!")
                     else:
                         st.info("💡 문단을 나누어서 써보세요!")
+                    
+                    # 안내 질문 체크
+                    guide = get_guide_index(task).score(writing_text)
+                    missing = [q for q, covered in zip(task["guide_questions"], guide["covered"]) if not covered]
+                    if missing:
+                        st.info("💡 아직 답하지 않은 안내 질문: " + " / ".join(missing))
+                    else:
+                        st.success("✅ 안내 질문에 모두 답했어요!")
                 else:
                     st.warning("먼저 글을 작성해주세요!")
     
@@ -268,8 +261,15 @@ if st.session_state.selected_task_inter:
         st.markdown("### 🗣️ 안내 질문들")
         st.markdown("이 질문들을 하나씩 생각하며 글을 써보세요:")
         
+        # 작성한 글의 문단마다 어떤 안내 질문에 답했는지 확인
+        guide = get_guide_index(task).score(st.session_state.writing_content_inter)
+        if guide["paragraphs"]:
+            st.caption(f"작성한 글이 안내 질문 {sum(guide['covered'])}/{len(guide['covered'])}개에 답하고 있어요")
+        
         for i, question in enumerate(task["guide_questions"], 1):
-            with st.expander(f"질문 {i}: {question}"):
+            with st.expander(f"{'✅' if guide['covered'][i - 1] else '⬜'} 질문 {i}: {question}"):
+                if guide["covered"][i - 1]:
+                    st.caption(f"문단 {guide['best'][i - 1] + 1}에서 답했어요 (유사도 {guide['scores'][i - 1]:.2f})")
                 st.text_area(
                     f"답변 {i}:",
                     key=f"answer_{i}",
@@ -277,19 +277,33 @@ if st.session_state.selected_task_inter:
                     height=100
                 )
         
+        if guide["paragraphs"]:
+            with st.expander("📐 문단별 안내 질문 유사도"):
+                st.dataframe(pd.DataFrame(
+                    guide["matrix"].round(2),
+                    index=[f"문단 {i}" for i in range(1, guide["paragraphs"] + 1)],
+                    columns=[f"질문 {i}" for i in range(1, len(task["guide_questions"]) + 1)]
+                ))
+        
+        # 글에서 사용한 표현과 어휘를 ✅로 표시
+        vocabulary_usage = get_vocabulary_index("intermediate", task).scan(st.session_state.writing_content_inter)
+        used_targets = {item["target"] for item in vocabulary_usage["items"] if item["used"]}
+        
         # 유용한 표현들
-        st.markdown("### 💬 유용한 표현들")
+        used, total = vocabulary_usage["coverage"]["expression"]
+        st.markdown(f"### 💬 유용한 표현들 (사용 {used}/{total})")
         for category, expressions in task["useful_expressions"].items():
             with st.expander(f"📝 {category}"):
                 for expr in expressions:
-                    st.markdown(f"• {expr}")
+                    st.markdown(f"{'✅' if expr in used_targets else '•'} {expr}")
         
         # 어휘 목록
-        st.markdown("### 📚 주요 어휘")
+        used, total = vocabulary_usage["coverage"]["word"]
+        st.markdown(f"### 📚 주요 어휘 (사용 {used}/{total})")
         vocab_cols = st.columns(3)
         for i, word in enumerate(task["vocabulary"]):
             with vocab_cols[i % 3]:
-                st.markdown(f"**{word}**")
+                st.markdown(f"{'✅ ' if word in used_targets else ''}**{word}**")
     
     with tab3:
         # 아이디어 구상 결과
@@ -330,6 +344,50 @@ with chat_container:
             st.markdown(f"**🙋‍♀️ 나:** {chat['message']}")
         else:
             st.markdown(f"**🤖 AI 도우미:** {chat['message']}")
+            if chat.get("degraded"):
+                st.caption("⚠️ AI 연결이 원활하지 않아 미리 준비된 답변을 보여드렸어요.")
+
+# 질문을 기록하고 답변을 도착하는 대로 채팅 창에 보여준 뒤 저장
+def ask_ai(message, prompt=None, task_type=None, quick=True):
+    st.session_state.chat_history_inter.append({"role": "user", "message": message})
+    # 인사·잡담·글 없는 첨삭 요청처럼 AI가 필요 없는 입력은 준비된 문장으로 바로 답함
+    if not quick:
+        local = local_reply(message, st.session_state.writing_content_inter)
+        if local is not None:
+            st.session_state.chat_history_inter.append({"role": "ai", "message": local})
+            st.rerun()
+    with chat_container:
+        st.markdown(f"**🙋‍♀️ 나:** {message}")
+        st.markdown("**🤖 AI 도우미:**")
+        # 빠른 질문은 이전 대화 없이 보내 다른 학생과 캐시·호출을 공유함
+        reply = generate_ai_response_intermediate(
+            prompt or message, task_type, st.session_state.writing_content_inter, stream=True, quick=quick,
+            history=None if quick else st.session_state.chat_history_inter[:-1]
+        )
+        ai_response = st.write_stream(reply.chunks())
+    st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response, "degraded": reply.degraded})
+    st.rerun()
+
+# 빠른 질문은 미리 준비된 답변으로 바로 답하고, 내 글에 맞춘 답변은 필요할 때만 AI에게 요청
+def ask_quick(question):
+    task_type = st.session_state.selected_task_inter["type"] if st.session_state.selected_task_inter else None
+    # 미리 받아 둔 내 글 맞춤 답변이 있으면 그 답변을, 없으면 준비된 답변을 보여줌
+    request = build_ai_request_intermediate(question["prompt"], task_type, st.session_state.writing_content_inter, quick=True, record_route=False)
+    cached = get_response_cache().contains(request["cache_key"])
+    answer = None if cached else get_answer_bank().answer("intermediate", task_type, question["id"])
+    if answer is None:
+        ask_ai(question["message"], question["prompt"], task_type=task_type)
+        # ask_ai가 답변을 기록하고 다시 그리므로 준비된 답변(None)은 더하지 않음
+        return
+    st.session_state.chat_history_inter.append({"role": "user", "message": question["message"]})
+    st.session_state.chat_history_inter.append({"role": "ai", "message": answer, "followup": question["prompt"]})
+    st.rerun()
+
+last_chat = st.session_state.chat_history_inter[-1] if st.session_state.chat_history_inter else None
+if last_chat and last_chat.get("followup"):
+    if st.button("✨ 내 글에 맞춘 답변 받기"):
+        task_type = st.session_state.selected_task_inter["type"] if st.session_state.selected_task_inter else None
+        ask_ai("내 글에 맞춰서 더 자세히 알려주세요", last_chat["followup"], task_type=task_type)
 
 # 사용자 입력
 col1, col2 = st.columns([4, 1])
@@ -342,57 +400,23 @@ with col2:
     send_button = st.button("보내기", type="primary")
 
 if send_button and user_input:
-    # 사용자 메시지 추가
-    st.session_state.chat_history_inter.append({"role": "user", "message": user_input})
-    
     # AI 응답 생성 (과제 타입 정보와 현재 글 내용 포함)
     task_type = st.session_state.selected_task_inter["type"] if st.session_state.selected_task_inter else None
-    with st.spinner("AI가 분석하고 있어요..."):
-        ai_response = generate_ai_response_intermediate(user_input, task_type, st.session_state.writing_content_inter)
-    st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response})
-    
-    st.rerun()
+    ask_ai(user_input, task_type=task_type, quick=False)
 
 # 퀵 질문 버튼들
 st.markdown("#### 빠른 질문:")
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    if st.button("📐 글 구조"):
-        st.session_state.chat_history_inter.append({"role": "user", "message": "글의 구조에 대해 도움을 주세요"})
-        with st.spinner("구조 분석 중..."):
-            ai_response = generate_ai_response_intermediate("글의 구조에 대해 도움을 주세요", None, st.session_state.writing_content_inter)
-        st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col2:
-    if st.button("📚 어휘 선택"):
-        st.session_state.chat_history_inter.append({"role": "user", "message": "어휘 선택에 대해 도움을 주세요"})
-        with st.spinner("어휘 분석 중..."):
-            ai_response = generate_ai_response_intermediate("더 나은 어휘 선택에 대해 조언해주세요", None, st.session_state.writing_content_inter)
-        st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col3:
-    if st.button("✏️ 문법 활용"):
-        st.session_state.chat_history_inter.append({"role": "user", "message": "문법 활용에 대해 도움을 주세요"})
-        with st.spinner("문법 분석 중..."):
-            ai_response = generate_ai_response_intermediate("더 다양한 문법 구조 활용에 대해 조언해주세요", None, st.session_state.writing_content_inter)
-        st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response})
-        st.rerun()
-
-with col4:
-    if st.button("💭 내용 전개"):
-        st.session_state.chat_history_inter.append({"role": "user", "message": "내용 전개에 대해 도움을 주세요"})
-        with st.spinner("내용 분석 중..."):
-            ai_response = generate_ai_response_intermediate("내용을 더 효과적으로 전개하는 방법에 대해 조언해주세요", None, st.session_state.writing_content_inter)
-        st.session_state.chat_history_inter.append({"role": "ai", "message": ai_response})
-        st.rerun()
+quick_questions = QUICK_QUESTIONS["intermediate"]
+for col, question in zip(st.columns(len(quick_questions)), quick_questions):
+    with col:
+        if st.button(question["label"]):
+            ask_quick(question)
 
 # 채팅 기록 초기화 버튼
 if st.session_state.chat_history_inter:
     if st.button("🗑️ 채팅 기록 지우기"):
         st.session_state.chat_history_inter = []
+        st.session_state.memory_state_inter = new_memory_state()
         st.rerun()
 
 else:
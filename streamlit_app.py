@@ -1,6 +1,22 @@
 import streamlit as st
 import subprocess
 import sys
+import pandas as pd
+
+from writing_helper.answer_bank import get_answer_bank
+from writing_helper.cache import get_response_cache
+from writing_helper.cefr import COVERAGE, MIN_WORDS, diagnose
+from writing_helper.learner import is_teacher
+from writing_helper.prefetch import get_prefetcher
+from writing_helper.prefilter import CATEGORY_LABELS, prefilter_stats
+from writing_helper.prompts import PROMPT_CACHE_MIN_TOKENS
+from writing_helper.resilience import policy_stats
+from writing_helper.router import get_router
+from writing_helper.semantic_cache import get_semantic_cache
+from writing_helper.scheduler import get_scheduler
+from writing_helper.singleflight import get_single_flight
+from writing_helper.spelling import warm_spelling_index
+from writing_helper.usage import get_usage_tracker
 
 # 페이지 설정
 st.set_page_config(
@@ -10,6 +26,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 초급 페이지의 철자 확인이 처음 쓰일 때 기다리지 않도록 서버가 뜨면 바로 철자 색인을 백그라운드에서 엶
+warm_spelling_index()
+
 # 사이드바 메뉴
 st.sidebar.title("🎯 수준 선택")
 page = st.sidebar.selectbox(
@@ -102,9 +121,30 @@ def main_page():
         
         간단한 진단 평가를 통해 자신의 영어 쓰기 수준을 확인해보세요!
         """)
+        diagnosis_text = st.text_area(
+            "자기소개나 좋아하는 것에 대해 영어로 자유롭게 써보세요 (3~5문장 이상):",
+            height=150,
+            key="diagnosis_text"
+        )
         if st.button("🔍 수준 진단 받기", type="primary"):
-            st.balloons()
-            st.success("수준 진단 기능은 곧 추가될 예정입니다!")
+            # 어휘 수준·문장 길이·어휘 다양성으로 바로 진단 (AI 호출 없음)
+            diagnosis = diagnose(diagnosis_text)
+            if diagnosis["level"] is None:
+                st.warning(f"진단하려면 영어 단어 {MIN_WORDS}개 이상이 필요해요! (지금 {diagnosis['words']}개)")
+            else:
+                st.success(f"추천 수준: **{diagnosis['level']}** (CEFR {diagnosis['cefr']} 정도)")
+                col_a, col_b, col_c = st.columns(3)
+                with col_a:
+                    st.metric("진단 점수", f"{diagnosis['score']}/100")
+                with col_b:
+                    st.metric("어휘 수준", diagnosis["vocabulary_level"],
+                              help=f"쓴 단어의 {COVERAGE:.0%}가 이 단계 안에 있어요")
+                with col_c:
+                    st.metric("문장당 평균 단어 수", f"{diagnosis['features']['words_per_sentence']:.1f}")
+                st.bar_chart(pd.Series(diagnosis["bands"], name="단어 비율"))
+                if diagnosis["advanced_words"]:
+                    st.caption("수준 높은 단어: " + ", ".join(diagnosis["advanced_words"]))
+                st.info(f"왼쪽 사이드바에서 '{diagnosis['level']}' 수준을 선택해 시작해보세요!")
     
     with col2:
         st.markdown("""
@@ -116,6 +156,135 @@ def main_page():
         4. 완성된 글 저장 및 피드백 받기
         """)
     
+    # 운영 현황 (교사용): 교사 링크(?teacher=키)로 들어온 경우에만 보여줌
+    if is_teacher():
+        st.markdown("---")
+        with st.expander("🛠️ 운영 현황 (교사용)"):
+            st.markdown("#### 💾 응답 캐시")
+            cache_stats = get_response_cache().stats()
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("캐시 적중", cache_stats["hits"])
+            with col2:
+                st.metric("캐시 미스", cache_stats["misses"])
+            with col3:
+                st.metric("적중률", f"{cache_stats['hit_rate']:.0%}")
+            with col4:
+                st.metric("저장된 답변", cache_stats["size"])
+            st.caption(f"📚 준비된 답변으로 바로 답한 빠른 질문: {get_answer_bank().served}회")
+            semantic_stats = get_semantic_cache().stats()
+            st.caption(
+                f"🧩 비슷한 질문 캐시: 적중 {semantic_stats['hits']}회 / 미스 {semantic_stats['misses']}회 "
+                f"(적중률 {semantic_stats['hit_rate']:.0%}, 저장 {semantic_stats['size']}개, 교체 {semantic_stats['evictions']}회)"
+            )
+            
+            st.markdown("#### 🚪 로컬 사전 필터")
+            filter_stats = prefilter_stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("검사한 질문", filter_stats["checked"])
+            with col2:
+                st.metric("AI 없이 답한 질문", filter_stats["answered"])
+            with col3:
+                st.metric("줄어든 요청 비율", f"{filter_stats['saved_ratio']:.0%}")
+            if filter_stats["by_category"]:
+                st.caption(" · ".join(f"{CATEGORY_LABELS[category]}: {count}회" for category, count in sorted(filter_stats["by_category"].items())))
+            
+            st.markdown("#### 🔗 동일 요청 합치기")
+            flight_stats = get_single_flight().stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("업스트림 호출", flight_stats["calls"])
+            with col2:
+                st.metric("합쳐진 요청", flight_stats["coalesced"])
+            with col3:
+                st.metric("진행 중", flight_stats["in_flight"])
+            
+            st.markdown("#### ⏩ 빠른 질문 답변 미리 받기")
+            prefetch_stats = get_prefetcher().stats()
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("미리 받은 답변", prefetch_stats["warmed"])
+            with col2:
+                st.metric("이미 캐시에 있음", prefetch_stats["cached"])
+            with col3:
+                st.metric("속도 한도로 건너뜀", prefetch_stats["throttled"])
+            with col4:
+                st.metric("과제 변경으로 취소", prefetch_stats["cancelled"])
+            with col5:
+                # 학생 예산에서 빼지 않고 따로 세는 미리 받기 사용량
+                st.metric("미리 받기 토큰(예산 제외)", prefetch_stats["tokens"])
+            
+            st.markdown("#### 🚦 LLM 스케줄러")
+            scheduler_stats = get_scheduler().stats()
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("대기 중", scheduler_stats["queue_depth"])
+            with col2:
+                st.metric("처리 중", scheduler_stats["running"])
+            with col3:
+                st.metric("평균 대기", f"{scheduler_stats['avg_wait']:.2f}초")
+            with col4:
+                st.metric("p95 대기", f"{scheduler_stats['p95_wait']:.2f}초")
+            with col5:
+                st.metric("예산 초과 거절", scheduler_stats["rejected"])
+            
+            st.markdown("#### 🛡️ 장애 대응")
+            resilience_stats = policy_stats()
+            if resilience_stats:
+                st.dataframe([
+                    {
+                        "수준": level,
+                        "모델": model,
+                        "마감(초)": stats["deadline"],
+                        "첫 토큰 p95(초)": round(stats["p95_first_token"], 2) if stats["p95_first_token"] else None,
+                        "재시도": stats["retries"],
+                        "헤징": stats["hedges"],
+                        "실패": stats["failures"],
+                        "회로 상태": stats["breaker"],
+                    }
+                    for (level, model), stats in resilience_stats.items()
+                ])
+            else:
+                st.caption("아직 호출 기록이 없습니다.")
+            
+            st.markdown("#### 💰 토큰 사용량과 프롬프트 캐시 효과")
+            usage_report = get_usage_tracker().report()
+            if usage_report:
+                st.dataframe([
+                    {
+                        "수준": row["level"],
+                        "등급": row["tier"],
+                        "모델": row["model"],
+                        "호출": row["calls"],
+                        "입력 토큰": row["prompt_tokens"],
+                        "캐시된 입력 비율": f"{row['cached_ratio']:.0%}",
+                        "출력 토큰": row["completion_tokens"],
+                        "비용($)": round(row["cost"], 4),
+                        "캐시 절감($)": round(row["cost_saved"], 4),
+                        "첫 토큰(캐시 적중, 초)": round(row["first_token_cached"], 2) if row["first_token_cached"] is not None else None,
+                        "첫 토큰(미적중, 초)": round(row["first_token_uncached"], 2) if row["first_token_uncached"] is not None else None,
+                        "절감 시간(초)": round(row["time_saved"], 1),
+                    }
+                    for row in usage_report
+                ])
+                st.caption(f"프롬프트 캐시는 고정 지시문과 이전 대화를 합친 앞부분이 {PROMPT_CACHE_MIN_TOKENS}토큰 이상일 때만 "
+                           "적용됩니다. 지시문은 약 300토큰이라 짧은 대화에서는 캐시된 입력 비율이 0%로 나옵니다.")
+            else:
+                st.caption("아직 호출 기록이 없습니다.")
+            
+            st.markdown("#### 🧭 모델 등급 라우팅")
+            router_stats = get_router().stats()
+            if router_stats["routed"]:
+                st.dataframe([
+                    {"수준": level, "요청 종류": request_class, "등급": tier, "요청 수": count}
+                    for (level, request_class, tier), count in sorted(router_stats["routed"].items())
+                ])
+                for (level, tier, reason), count in sorted(router_stats["downgrades"].items()):
+                    st.caption(f"⬇️ {level} 수준에서 '{tier}' 등급을 {count}회 건너뜀 ({'응답 지연' if reason == 'slow' else '호출 실패'})")
+            else:
+                st.caption("아직 라우팅 기록이 없습니다.")
+
     # 푸터
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1 @@
+# AI 영어 쓰기 도우미 공용 모듈
@@ -0,0 +1,140 @@
+# 빠른 질문용 오프라인 답변 모음
+# (수준, 과제 유형, 빠른 질문)마다 미리 준비한 답변 몇 개를 JSON으로 보관하고, 시작할 때 한 번 읽어 둠
+# 과제 유형이 "*"인 항목은 직접 작성한 수준 공통 답변이며, 과제별 답변은 아래 배치 명령으로 생성.
+# 저장소에 들어 있는 모음은 초급 과제별 답변 한 개씩과 수준 공통 답변뿐이라, 중급·고급 과제에서는 공통 답변이
+# 쓰이거나 API로 넘어감. 모자란 조합은 --report로 확인하고 API 키가 있는 곳에서 채움:
+#     python -m writing_helper.answer_bank --report
+#     python -m writing_helper.answer_bank --variants 3
+import argparse
+import json
+import os
+import random
+import threading
+
+from writing_helper.cache import normalize_prompt
+from writing_helper.tasks import LEVEL_TASKS, QUICK_QUESTIONS
+
+ANSWER_BANK_PATH = os.path.join(os.path.dirname(__file__), "data", "answer_bank.json")
+ANY_TASK = "*"
+
+
+class AnswerBank:
+    def __init__(self, answers):
+        self.answers = answers
+        # 질문 문장(표시용·전송용)으로 빠른 질문 ID를 찾기 위한 색인
+        self._question_ids = {}
+        for level, questions in QUICK_QUESTIONS.items():
+            for question in questions:
+                for text in (question["message"], question["prompt"]):
+                    self._question_ids[(level, normalize_prompt(text))] = question["id"]
+        self.served = 0
+
+    @classmethod
+    def load(cls, path=ANSWER_BANK_PATH):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls({})
+
+    def candidates(self, level, task_type, question_id):
+        # 과제별 답변과 수준 공통 답변을 함께 후보로 둠 (과제별 답변이 한두 개뿐이어도 매번 같은 답이 나오지 않게)
+        by_task = self.answers.get(level, {})
+        answers = list(by_task.get(ANY_TASK, {}).get(question_id, []))
+        if task_type and task_type != ANY_TASK:
+            answers = by_task.get(task_type, {}).get(question_id, []) + answers
+        return answers
+
+    def answer(self, level, task_type, question_id, count=True):
+        answers = self.candidates(level, task_type, question_id)
+        if not answers:
+            return None
+        if count:
+            self.served += 1
+        return random.choice(answers)
+
+    def answer_for_prompt(self, level, task_type, prompt):
+        # 빠른 질문과 같은 문장이면 해당 답변을 반환 (장애 중 대체 답변용)
+        question_id = self._question_ids.get((level, normalize_prompt(prompt)))
+        if question_id is None:
+            return None
+        # 실제로 쓰일지 모르는 대체 답변이므로 제공 횟수에는 세지 않음
+        return self.answer(level, task_type, question_id, count=False)
+
+
+_answer_bank = None
+_answer_bank_lock = threading.Lock()
+
+
+def get_answer_bank():
+    global _answer_bank
+    with _answer_bank_lock:
+        if _answer_bank is None:
+            _answer_bank = AnswerBank.load()
+        return _answer_bank
+
+
+def missing_answers(answers, variants=3):
+    # 과제별 답변이 variants개보다 적은 (수준, 과제, 빠른 질문, 있는 답변 수) 목록
+    missing = []
+    for level, tasks in LEVEL_TASKS.items():
+        for task in tasks.values():
+            for question in QUICK_QUESTIONS[level]:
+                count = len(answers.get(level, {}).get(task["type"], {}).get(question["id"], []))
+                if count < variants:
+                    missing.append((level, task["type"], question["id"], count))
+    return missing
+
+
+def build_answer_bank(client, variants=3, model=None, path=ANSWER_BANK_PATH, refresh=False):
+    # 모든 (수준, 과제, 빠른 질문) 조합에 답변이 variants개가 될 때까지 생성
+    # 이미 있는 답변은 유지하고 모자란 만큼만 생성
+    from writing_helper.llm import chat_completion
+    from writing_helper.prompts import LEVEL_PARAMS, build_messages
+
+    bank = AnswerBank.load(path).answers
+    if refresh:
+        # 직접 작성한 수준 공통 답변만 남기고 나머지는 다시 생성
+        bank = {level: {ANY_TASK: by_task[ANY_TASK]} for level, by_task in bank.items() if ANY_TASK in by_task}
+    created = 0
+    for level, tasks in LEVEL_TASKS.items():
+        params = dict(LEVEL_PARAMS[level], temperature=0.9)
+        if model:
+            params["model"] = model
+        for task in tasks.values():
+            for question in QUICK_QUESTIONS[level]:
+                answers = bank.setdefault(level, {}).setdefault(task["type"], {}).setdefault(question["id"], [])
+                while len(answers) < variants:
+                    messages = build_messages(level, question["prompt"], "", task["type"])
+                    answers.append(chat_completion(client, messages, **params))
+                    created += 1
+                    print(f"{level} / {task['type']} / {question['id']} ({len(answers)}/{variants})")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bank, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빠른 질문용 오프라인 답변 모음 생성")
+    parser.add_argument("--variants", type=int, default=3, help="조합마다 준비할 답변 수")
+    parser.add_argument("--model", default=None, help="생성에 사용할 모델 (기본값: 수준별 설정)")
+    parser.add_argument("--out", default=ANSWER_BANK_PATH, help="저장할 JSON 파일 경로")
+    parser.add_argument("--refresh", action="store_true", help="수준 공통 답변만 남기고 과제별 답변을 새로 생성")
+    parser.add_argument("--report", action="store_true", help="생성하지 않고 답변이 모자란 조합만 출력")
+    args = parser.parse_args()
+    if args.report:
+        missing = missing_answers(AnswerBank.load(args.out).answers, args.variants)
+        total = sum(len(tasks) * len(QUICK_QUESTIONS[level]) for level, tasks in LEVEL_TASKS.items())
+        print(f"과제별 답변이 {args.variants}개보다 적은 조합 {len(missing)}/{total}개")
+        for level, task_type, question_id, count in missing:
+            print(f"  {level} / {task_type} / {question_id}: {count}개")
+        return
+
+    from openai import OpenAI
+    created = build_answer_bank(OpenAI(), args.variants, args.model, args.out, args.refresh)
+    print(f"새 답변 {created}개를 {args.out}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
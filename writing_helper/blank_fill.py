@@ -0,0 +1,97 @@
+# 초급 빈칸 채우기 템플릿 확인
+# 템플릿을 한 번 낱말 열(고정 문구 + 빈칸)로 컴파일해 두고, 학생 글을 고정 문구에 맞춰 정렬해서
+# 빈칸마다 채웠는지, 아직 비었는지, 주변 틀이 바뀌었는지를 모델 호출 없이 바로 알려줌
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# 빈칸(___)과 단어, "mom/dad" 같은 선택지
+TOKEN_PATTERN = re.compile(r"_{2,}|[A-Za-z0-9]+(?:['’/][A-Za-z0-9]+)*")
+# 템플릿 안의 괄호 설명 "(pet/hobby)"는 학생이 지워도 되는 안내문
+HINT_PATTERN = re.compile(r"\([^)]*\)")
+BLANK = "___"
+# 빈칸 안내 문구는 빈칸 바로 앞의 고정 문구 (같은 문장·구절 안에서 최대 네 단어)
+LABEL_WORDS = 4
+
+FILLED, EMPTY, CHANGED = "filled", "empty", "changed"
+STATUS_LABELS = {FILLED: "✅ 채움", EMPTY: "⬜ 빈칸", CHANGED: "✏️ 틀 바뀜"}
+
+
+def _normalize(token):
+    return BLANK if token.startswith("_") else token.lower().replace("’", "'")
+
+
+class TemplateMatcher:
+    def __init__(self, template):
+        template = HINT_PATTERN.sub(" ", template)
+        # tokens: 고정 문구 낱말과 빈칸(BLANK)을 순서대로, blanks: 빈칸마다 (tokens 안의 위치, 안내 문구)
+        self.tokens = []
+        self.blanks = []
+        previous = 0
+        for match in TOKEN_PATTERN.finditer(template):
+            token = match.group()
+            if token.startswith("_"):
+                context = re.split(r"[.!?,]\s", template[previous:match.start()])[-1]
+                label = " ".join(TOKEN_PATTERN.findall(context)[-LABEL_WORDS:])
+                self.blanks.append((len(self.tokens), f"{label} ___".strip()))
+                previous = match.end()
+            self.tokens.append(token)
+        self._words = [_normalize(token) for token in self.tokens]
+        # "mom/dad"는 학생 글의 mom이나 dad와 같은 낱말로 봄
+        self._alternatives = {
+            option: word for word in self._words if "/" in word for option in word.split("/")
+        }
+
+    def check(self, text):
+        # {"blanks": [{"label", "status", "value"}], "filled": n, "total": n, "changed": [바뀐 고정 문구]}
+        matches = list(TOKEN_PATTERN.finditer(text))
+        words = [self._alternatives.get(_normalize(m.group()), _normalize(m.group())) for m in matches]
+        matcher = SequenceMatcher(None, self._words, words, autojunk=False)
+        # 템플릿 낱말 번호 → 학생 글의 낱말 번호 (학생 글에 남은 ___도 템플릿의 빈칸과 짝지음)
+        aligned = {}
+        for block in matcher.get_matching_blocks():
+            for offset in range(block.size):
+                aligned[block.a + offset] = block.b + offset
+
+        # 학생 글이 아직 닿지 않은 뒷부분의 빈칸은 틀을 바꾼 것이 아니라 아직 쓰지 않은 것
+        reached = max(aligned, default=-1)
+
+        blanks = []
+        for position, label in self.blanks:
+            before, after = position - 1, position + 1
+            # 바로 앞뒤의 템플릿 낱말을 학생 글에서 찾지 못하면 빈칸 주변의 틀을 고쳐 쓴 것
+            # (뒤 낱말이 없는 까닭이 글이 거기서 끝났기 때문이면 글 끝까지를 빈칸의 값으로 봄)
+            before_anchored = before < 0 or before in aligned
+            at_end = after >= len(self._words) or (after not in aligned and after > reached)
+            value = ""
+            if position in aligned or (position > reached and not before_anchored):
+                status = EMPTY
+            elif not before_anchored or not (after in aligned or at_end):
+                status = CHANGED
+            else:
+                start = aligned[before] + 1 if before >= 0 else 0
+                end = aligned[after] if after in aligned else len(words)
+                span = matches[start:end]
+                value = text[span[0].start():span[-1].end()] if span else ""
+                status = FILLED if value else EMPTY
+            blanks.append({"label": label, "status": status, "value": value})
+
+        # 고정 문구 가운데 학생 글에서 빠지거나 바뀐 부분 (빈칸을 채운 부분과 아직 쓰지 않은 뒷부분은 제외)
+        changed = []
+        if words:
+            for tag, i1, i2, _, _ in matcher.get_opcodes():
+                literals = [token for token in self.tokens[i1:i2] if not token.startswith("_")]
+                if tag in ("replace", "delete") and literals and i1 <= reached:
+                    changed.append(" ".join(literals))
+        return {
+            "blanks": blanks,
+            "filled": sum(1 for blank in blanks if blank["status"] == FILLED),
+            "total": len(blanks),
+            "changed": changed,
+        }
+
+
+@lru_cache(maxsize=64)
+def get_template_matcher(template):
+    # 템플릿마다 한 번만 컴파일해서 모든 세션이 공유
+    return TemplateMatcher(template)
@@ -0,0 +1,155 @@
+# 프로세스 전체가 공유하는 응답 캐시 (LRU + TTL, 선택적 디스크 저장)
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from writing_helper import settings
+
+# 만료된 답변도 장애 대비용으로 디스크에 하루 더 보관
+STALE_RETENTION = 24 * 60 * 60
+
+
+def normalize_prompt(prompt):
+    # 대소문자, 공백, 끝의 문장부호 차이는 같은 질문으로 취급
+    text = re.sub(r"\s+", " ", prompt.strip().lower())
+    return text.rstrip(" ?!.~")
+
+
+def content_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(level, task_type, prompt, context="", history=()):
+    # (수준, 과제 유형, 정규화된 질문, 잘라낸 글 내용의 해시, 이전 대화의 해시)
+    # 이전 대화를 함께 보내는 질문은 대화 내용까지 키에 포함 (의미 기반 캐시는 대화 해시 없이 묶음)
+    conversation = "".join(f"\x1e{m['role']}:{m['content']}" for m in history)
+    return (level, task_type or "", normalize_prompt(prompt), content_hash(context.strip()),
+            content_hash(conversation) if history else "")
+
+
+class ResponseCache:
+    def __init__(self, maxsize=512, ttl=3600, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time() - STALE_RETENTION,))
+            self._db.commit()
+
+    @staticmethod
+    def _disk_key(key):
+        return "\x1f".join(key)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires >= now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM responses WHERE key = ?", (self._disk_key(key),)
+                ).fetchone()
+                if row and row[1] >= now:
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def contains(self, key):
+        # 유효한 답변이 있는지만 확인 (적중률 통계와 LRU 순서는 건드리지 않음)
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] >= now:
+                return True
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires FROM responses WHERE key = ?", (self._disk_key(key),)
+                ).fetchone()
+                return bool(row and row[0] >= now)
+            return False
+
+    def get_stale(self, key):
+        # 장애 중에는 유효 시간이 지난 답변이라도 돌려줌 (LRU에서 밀려나기 전까지 보관됨)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                return entry[1]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM responses WHERE key = ?", (self._disk_key(key),)
+                ).fetchone()
+                if row:
+                    return row[0]
+            return None
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)",
+                    (self._disk_key(key), value, expires)
+                )
+                self._db.commit()
+
+    def _store(self, key, value, expires):
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "evictions": self.evictions,
+            }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    # 모든 세션과 페이지가 같은 캐시를 쓰도록 한 번만 생성
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                maxsize=settings.RESPONSE_CACHE_SIZE,
+                ttl=settings.RESPONSE_CACHE_TTL,
+                path=settings.RESPONSE_CACHE_PATH or None
+            )
+        return _response_cache
@@ -0,0 +1,197 @@
+# 어휘 수준(CEFR) 진단
+# 단어 빈도 순위를 CEFR 단계로 바꾼 표를 정렬된 바이트 배열 하나로 들고 있다가, 글의 모든 단어를
+# searchsorted 한 번으로 찾아 단계별 비율을 구하고, 문장 길이·어휘 다양성과 합쳐 초급/중급/고급을 추천함.
+# 표는 처음 진단할 때 한 번만 읽어서 모든 세션이 공유
+#     python -m writing_helper.cefr --calibrate
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from writing_helper.creativity import CALIBRATION_PATH
+from writing_helper.readability import ENGLISH_WORD, mtld
+from writing_helper.spelling import DICTIONARY_PATH, stems
+from writing_helper.textstats import text_stats
+
+# 빈도 순위 상한으로 나눈 CEFR 단계 (마지막 단계는 그 밖의 모든 사전 단어)
+CEFR_BANDS = (("A1", 1000), ("A2", 2000), ("B1", 3500), ("B2", 6000), ("C1", 10000), ("C2", None))
+CEFR_LEVELS = tuple(name for name, _ in CEFR_BANDS)
+UNKNOWN = len(CEFR_BANDS)
+WORD_WIDTH = 24
+MIN_WORDS = 20
+
+# 특징마다 (이 값 이하 → 0, 이 값 이상 → 1) 구간
+FEATURES = {
+    "beyond_b1": (0.03, 0.25),
+    "words_per_sentence": (6.0, 13.0),
+    "mtld": (20.0, 100.0),
+}
+# 종합 점수(0~1) 상한별 추천 수준. 경계는 기준 글에 딱 맞춘 값이 아니라 이웃한 두 수준의 평균 점수 사이
+# 가운데로 잡아 양쪽에 여유를 둠 (기준 글 9편 기준 초급 0.03·중급 0.72·고급 0.90, --calibrate로 다시 계산)
+LEVELS = (("초급", 0.38), ("중급", 0.81), ("고급", None))
+LEVEL_CEFR = {"초급": "A1–A2", "중급": "B1", "고급": "B2 이상"}
+# 어휘 수준: 아는 단어의 이 비율까지를 덮는 가장 낮은 단계
+COVERAGE = 0.9
+
+
+class FrequencyTable:
+    def __init__(self, path=DICTIONARY_PATH):
+        with open(path, encoding="utf-8") as f:
+            words = [line.split()[0] for line in f if line.strip()]
+        words = [word for word in words if len(word) <= WORD_WIDTH]
+        ranks = np.arange(len(words))
+        limits = [limit for _, limit in CEFR_BANDS if limit is not None]
+        bands = np.searchsorted(limits, ranks, side="right").astype(np.uint8)
+        encoded = np.array(words, dtype=f"S{WORD_WIDTH}")
+        order = np.argsort(encoded, kind="stable")
+        # 정렬된 고정 폭 바이트 배열과 같은 순서의 단계 배열 (단어 4만 개에 1MB 남짓)
+        self._words = encoded[order]
+        self._bands = bands[order]
+
+    def _lookup(self, words):
+        # 표보다 긴 단어는 numpy가 잘라서 다른 단어와 같아질 수 있으므로 찾지 않음
+        fits = np.array([len(word) <= WORD_WIDTH for word in words])
+        keys = np.array([word if fit else "" for word, fit in zip(words, fits)], dtype=f"S{WORD_WIDTH}")
+        positions = np.minimum(np.searchsorted(self._words, keys), len(self._words) - 1)
+        found = (self._words[positions] == keys) & fits
+        return np.where(found, self._bands[positions], UNKNOWN).astype(np.uint8)
+
+    def bands(self, words):
+        # 단어마다 CEFR 단계 번호 (사전에 없으면 UNKNOWN), 없는 단어는 -s, -ed 등을 뗀 형태로 한 번 더 찾음
+        if not words:
+            return np.zeros(0, dtype=np.uint8)
+        result = self._lookup(words)
+        missing = np.flatnonzero(result == UNKNOWN)
+        candidates = [(i, stem) for i in missing for stem in stems(words[i])]
+        if candidates:
+            found = self._lookup([stem for _, stem in candidates])
+            for (i, _), band in zip(candidates, found):
+                result[i] = min(result[i], band)
+        return result
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_frequency_table():
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = FrequencyTable()
+        return _table
+
+
+def _interp(value, bounds):
+    return float(np.interp(value, bounds, [0.0, 1.0]))
+
+
+def diagnose(text):
+    # {"level", "cefr", "vocabulary_level", "score", "bands", "features", "advanced_words", "words"}
+    # 글이 너무 짧으면 level이 None
+    tokens = ENGLISH_WORD.findall(text)
+    # 표는 ASCII 바이트 배열이므로 휴대폰 자판의 둥근 아포스트로피(’)를 '로 바꿔서 찾음
+    words = [word.lower().replace("’", "'") for word in tokens]
+    result = {"words": len(words), "level": None}
+    if len(words) < MIN_WORDS:
+        return result
+    bands = get_frequency_table().bands(words)
+    known = bands[bands != UNKNOWN]
+    shares = np.bincount(known, minlength=UNKNOWN) / max(len(known), 1)
+    coverage = np.cumsum(shares)
+    stats = text_stats(text)
+    features = {
+        "beyond_b1": float(shares[CEFR_LEVELS.index("B2"):].sum()),
+        "words_per_sentence": stats["avg_words_per_sentence"],
+        "mtld": mtld(words),
+    }
+    score = sum(_interp(features[name], bounds) for name, bounds in FEATURES.items()) / len(FEATURES)
+    level = classify(score)
+    # 글에 쓴 단어 가운데 가장 수준 높은 단어들 (중복과 대문자로 시작하는 이름 제외, 단계 높은 순)
+    advanced = sorted({(-int(band), word) for band, word, token in zip(bands, words, tokens)
+                       if CEFR_LEVELS.index("B2") <= band < UNKNOWN and token.islower()})
+    result.update({
+        "level": level,
+        "cefr": LEVEL_CEFR[level],
+        "vocabulary_level": CEFR_LEVELS[int(np.searchsorted(coverage, COVERAGE - 1e-9))] if len(known) else None,
+        "score": round(score * 100),
+        "bands": {name: float(share) for name, share in zip(CEFR_LEVELS, shares)},
+        "features": features,
+        "advanced_words": [word for _, word in advanced[:8]],
+    })
+    return result
+
+
+def fit_levels(scores):
+    # 수준별 점수 목록 {"초급": [...], ...}에서 이웃한 수준의 평균 점수 가운데를 경계로 한 LEVELS
+    means = [float(np.mean(scores[name])) for name, _ in LEVELS]
+    return tuple((name, None if i == len(LEVELS) - 1 else (means[i] + means[i + 1]) / 2)
+                 for i, (name, _) in enumerate(LEVELS))
+
+
+def classify(score, levels=LEVELS):
+    return next(name for name, limit in levels if limit is None or score < limit)
+
+
+def leave_one_out(rows):
+    # 기준 글을 한 편씩 빼고 경계를 다시 잡았을 때 뺀 글의 수준이 맞는 비율 (새 학생 글에서 기대할 정확도)
+    correct = 0
+    for i, (_, expected, _, score, _) in enumerate(rows):
+        scores = {}
+        for j, (_, level, _, other, _) in enumerate(rows):
+            if j != i:
+                scores.setdefault(level, []).append(other / 100)
+        if len(scores) == len(LEVELS):
+            correct += classify(score / 100, fit_levels(scores)) == expected
+    return correct / max(len(rows), 1)
+
+
+def calibrate(path=CALIBRATION_PATH, repeats=20):
+    # 수준을 아는 기준 글(low/mid/high)에 대해 추천 수준이 맞는 비율과 진단 시간을 보고
+    with open(path, encoding="utf-8") as f:
+        essays = json.load(f)
+    expected = {"low": "초급", "mid": "중급", "high": "고급"}
+    get_frequency_table()
+    rows = []
+    timings = []
+    for essay in essays:
+        for _ in range(repeats):
+            text_stats.cache_clear()
+            started = time.perf_counter()
+            result = diagnose(essay["text"])
+            timings.append((time.perf_counter() - started) * 1000)
+        rows.append((essay["id"], expected[essay["level"]], result["level"], result["score"],
+                     result["vocabulary_level"]))
+    return rows, sorted(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수준 진단 보정 확인")
+    parser.add_argument("--calibrate", action="store_true", help="기준 글 모음으로 추천 수준과 속도 확인")
+    parser.add_argument("--data", default=CALIBRATION_PATH, help="기준 글 JSON 경로")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+    if not args.calibrate:
+        parser.error("--calibrate를 지정하세요")
+    started = time.perf_counter()
+    get_frequency_table()
+    print(f"빈도표 읽기: {(time.perf_counter() - started) * 1000:.1f} ms")
+    rows, timings = calibrate(args.data, args.repeats)
+    for essay_id, expected, level, score, vocabulary_level in rows:
+        mark = "✓" if expected == level else "✗"
+        print(f"{mark} {essay_id}: 기대 {expected}, 진단 {level} (점수 {score}, 어휘 {vocabulary_level})")
+    accuracy = sum(expected == level for _, expected, level, _, _ in rows) / max(len(rows), 1)
+    print(f"일치율 {accuracy:.2f}, 진단 시간 중앙값 {timings[len(timings) // 2]:.2f} ms, 최대 {timings[-1]:.2f} ms")
+    scores = {}
+    for _, expected, _, score, _ in rows:
+        scores.setdefault(expected, []).append(score / 100)
+    if len(scores) == len(LEVELS):
+        fitted = ", ".join(f"{name} < {limit:.2f}" for name, limit in fit_levels(scores) if limit is not None)
+        current = ", ".join(f"{name} < {limit:.2f}" for name, limit in LEVELS if limit is not None)
+        print(f"평균 점수 가운데 경계: {fitted} (현재 {current}), 한 편씩 빼고 맞춘 일치율 {leave_one_out(rows):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# 학생 글을 토큰 예산 안에 맞춰 프롬프트용으로 골라 담기
+# 글자 수로 자르는 대신 문단 단위로, 수정 중인 문단 → 서론(주제문) → 결론 → 질문과 관련된 문단 순으로 채움
+import difflib
+import re
+
+from writing_helper import settings
+from writing_helper.tokens import count_tokens
+
+GAP_MARKER = "[...]"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[A-Za-z']+|[가-힣]+")
+
+
+def split_paragraphs(text):
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text)]
+    return [p for p in paragraphs if p]
+
+
+def find_edited_paragraph(previous, current):
+    # 이전 글과 비교해서 마지막으로 바뀐 문단의 번호를 찾음 (없으면 None)
+    old = split_paragraphs(previous)
+    new = split_paragraphs(current)
+    edited = None
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
+        if tag in ("replace", "insert") and j2 > j1:
+            edited = j2 - 1
+    return edited
+
+
+def _words(text):
+    return {w.lower() for w in _WORD.findall(text)}
+
+
+def _trim(paragraph, budget, keep_end=False):
+    # 문장을 자르지 않고, 예산 안에 들어가는 만큼 앞(또는 뒤)에서부터 문장을 담음
+    sentences = [s for s in _SENTENCE_END.split(paragraph) if s.strip()]
+    if keep_end:
+        sentences.reverse()
+    chosen = []
+    used = 0
+    for sentence in sentences:
+        cost = count_tokens(sentence)
+        if used + cost > budget:
+            break
+        chosen.append(sentence)
+        used += cost
+    if not chosen and sentences:
+        # 첫 문장 하나가 예산보다 길면 (마침표 없이 쓴 글 등) 버리지 않고 낱말 경계에서 자름
+        chosen = [_cut_words(sentences[0], budget, keep_end)]
+    if keep_end:
+        chosen.reverse()
+    return " ".join(chosen)
+
+
+def _cut_words(sentence, budget, keep_end=False):
+    # 예산 안에 들어가는 가장 많은 낱말 수를 이분 탐색으로 찾음
+    words = sentence.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        part = words[-middle:] if keep_end else words[:middle]
+        if count_tokens(" ".join(part)) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    if not low:
+        return ""
+    return " ".join(words[-low:] if keep_end else words[:low])
+
+
+def pack_context(text, budget, question="", edited_index=None):
+    text = text.strip()
+    if count_tokens(text) <= budget:
+        return text
+    paragraphs = split_paragraphs(text)
+    last = len(paragraphs) - 1
+
+    # 우선순위: 수정 중인 문단, 서론(주제문), 결론, 나머지는 질문과 겹치는 단어가 많은 순
+    order = []
+    for index in (edited_index, 0, last):
+        if index is not None and 0 <= index <= last and index not in order:
+            order.append(index)
+    question_words = _words(question)
+    rest = [i for i in range(len(paragraphs)) if i not in order]
+    rest.sort(key=lambda i: -len(question_words & _words(paragraphs[i])))
+    order += rest
+
+    selected = {}
+    remaining = budget
+    for index in order:
+        cost = count_tokens(paragraphs[index])
+        if cost <= remaining:
+            selected[index] = paragraphs[index]
+            remaining -= cost
+        elif remaining > 0:
+            # 서론은 주제문이 있는 끝부분을, 나머지는 앞부분을 남김
+            keep_end = index == 0 and index != edited_index
+            trimmed = _trim(paragraphs[index], remaining, keep_end)
+            if trimmed:
+                remaining -= count_tokens(trimmed)
+                selected[index] = f"{GAP_MARKER} {trimmed}" if keep_end else f"{trimmed} {GAP_MARKER}"
+        if remaining <= 0:
+            break
+
+    # 원래 순서대로 이어 붙이고, 빠진 부분은 표시
+    parts = []
+    previous = -1
+    for index in sorted(selected):
+        if index > previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(selected[index])
+        previous = index
+    if previous < last:
+        parts.append(GAP_MARKER)
+    return "\n\n".join(parts)
+
+
+def pack_for_level(level, text, question="", edited_index=None):
+    return pack_context(text, settings.CONTEXT_TOKEN_BUDGETS.get(level, 250), question, edited_index)
@@ -0,0 +1,193 @@
+# 창의성 점수 (독창적 아이디어, 표현의 다양성, 개인적 목소리, 구조적 혁신)
+# 어휘·문장·글 구조에서 뽑은 특징을 구간별로 0~1로 바꿔 평균낸 결정적 점수로, 모델 호출 없이 글 한 편에 수 ms
+# 같은 글은 다시 계산하지 않으며, 기준 글 모음으로 점수가 수준 순서를 따르는지 확인할 수 있음:
+#     python -m writing_helper.creativity --calibrate
+import argparse
+import json
+import os
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from writing_helper.context import split_paragraphs
+from writing_helper.readability import ENGLISH_WORD, mtld
+from writing_helper.textstats import split_sentences
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(__file__), "data", "creativity_calibration.json")
+
+COMMON_WORDS = set("""
+a about after again all also always am an and any are as at be because been before being but by can could day
+did do does doing don't down each even every feel few first for from get go going good got great had has have
+having he her here him his how i i'm if in into is it it's its just know last life like little long look lot
+lots made make many may me more most much my myself new next nice no not now of off on one only or other our
+out over people really said same say see she should so some something still such take than that the their
+them then there these they thing things think this those time to too two up us very want was way we well went
+were what when where which while who why will with would year years you your
+""".split())
+
+FIGURATIVE = re.compile(r"\blike an? \w+|\bas \w+ as\b|\bas if\b|\bas though\b|\bimagine\b|\bwhat if\b", re.IGNORECASE)
+STANCE = re.compile(
+    r"\bi (?:believe|think|feel|felt|wonder|remember|realized|realise|realize|hope|wish|doubt)\b"
+    r"|\bpersonally\b|\bhonestly\b|\bin my (?:opinion|view|eyes|experience)\b|\bto me\b",
+    re.IGNORECASE
+)
+EMOTION_WORDS = set("""
+afraid angry anxious ashamed brave calm curious delighted disappointed excited frightened glad grateful happy
+heartbroken hopeful jealous lonely nervous proud relieved sad scared shocked surprised thrilled upset worried
+bitter bright cold dark gentle loud quiet rough sharp smooth soft sour sweet warm
+""".split())
+FIRST_PERSON = {"i", "me", "my", "mine", "myself", "we", "us", "our", "ours"}
+
+DIMENSIONS = ("독창적 아이디어", "표현의 다양성", "개인적 목소리", "구조적 혁신")
+
+# 특징마다 (이 값 이하 → 0, 이 값 이상 → 1) 구간과 점수가 낮을 때 보여줄 조언
+FEATURES = {
+    "독창적 아이디어": {
+        "rare_ratio": ((0.08, 0.3), "흔한 단어 대신 더 구체적이고 정확한 단어를 골라 보세요."),
+        "own_words": ((0.6, 0.95), "과제에 제시된 단어 말고 나만의 표현도 섞어 보세요."),
+        "figurative": ((0.0, 1.5), "비유(like a..., as if...)나 'What if...' 같은 상상을 넣어 보세요."),
+        "concrete": ((0.0, 3.0), "숫자, 이름, 장소 같은 구체적인 사실을 더해 보세요."),
+    },
+    "표현의 다양성": {
+        "mtld": ((20.0, 80.0), "같은 단어를 반복하지 말고 비슷한 뜻의 다른 단어를 써 보세요."),
+        "sentence_length_std": ((2.0, 8.0), "짧은 문장과 긴 문장을 섞어 리듬을 만들어 보세요."),
+        "opener_variety": ((0.4, 0.9), "문장을 같은 단어로 시작하지 말고 시작 방식을 바꿔 보세요."),
+        "sentence_types": ((1.0, 3.0), "평서문 사이에 질문이나 감탄문을 넣어 보세요."),
+    },
+    "개인적 목소리": {
+        "first_person": ((0.5, 4.0), "'I'를 주어로 내 경험과 생각을 직접 말해 보세요."),
+        "stance": ((0.0, 1.5), "'I believe...', 'Personally...'처럼 내 입장을 분명히 밝혀 보세요."),
+        "emotion": ((0.0, 2.5), "그때의 감정이나 감각(소리, 색, 온도)을 묘사해 보세요."),
+        "expressive": ((0.0, 0.25), "질문, 감탄, 대시(—)로 말하는 듯한 느낌을 살려 보세요."),
+    },
+    "구조적 혁신": {
+        "paragraphs": ((1.0, 5.0), "내용에 따라 문단을 나눠 보세요."),
+        "paragraph_variation": ((0.1, 0.6), "한 문장짜리 짧은 문단으로 강조하는 방법도 있어요."),
+        "hook": ((0.0, 1.0), "첫 문장을 질문, 인용, 짧은 장면으로 시작해 독자의 관심을 끌어 보세요."),
+        "echo": ((0.02, 0.15), "결론에서 서론의 핵심 단어나 장면을 다시 불러와 글을 마무리해 보세요."),
+        "dialogue": ((0.0, 2.0), "인용문이나 대화를 넣어 장면을 생생하게 만들어 보세요."),
+    },
+}
+# 이보다 짧은 글은 특징이 안정적이지 않아 점수를 줄임
+MIN_WORDS, FULL_WORDS = 30, 150
+
+
+def _per_100(count, words):
+    return 100.0 * count / max(words, 1)
+
+
+def extract_features(text, task_words=frozenset()):
+    words = [w.lower() for w in ENGLISH_WORD.findall(text)]
+    n = len(words)
+    content = [w for w in words if w not in COMMON_WORDS]
+    paragraphs = split_paragraphs(text)
+    sentences = [s for p in paragraphs for s in split_sentences(p)]
+    sentence_lengths = np.array([len(ENGLISH_WORD.findall(s)) for s in sentences] or [0], dtype=np.float64)
+    paragraph_lengths = np.array([len(ENGLISH_WORD.findall(p)) for p in paragraphs] or [0], dtype=np.float64)
+    openers = [ENGLISH_WORD.findall(s)[:1] for s in sentences]
+    openers = [o[0].lower() for o in openers if o]
+    # 문장 첫머리가 아닌 곳의 대문자 단어(고유명사)와 숫자
+    proper = sum(len(re.findall(r"(?<=[a-z,;] )[A-Z][a-z]+", s)) for s in sentences)
+    numbers = len(re.findall(r"\b\d+(?:[.,]\d+)?\b", text))
+    first, last = paragraphs[:1], paragraphs[-1:]
+    first_words = {w.lower() for w in ENGLISH_WORD.findall(first[0])} - COMMON_WORDS if first else set()
+    last_words = {w.lower() for w in ENGLISH_WORD.findall(last[0])} - COMMON_WORDS if last else set()
+    opening = sentences[0] if sentences else ""
+    content_types = set(content)
+    return {
+        "words": n,
+        "rare_ratio": sum(1 for w in content if len(w) >= 6) / max(n, 1),
+        "own_words": len(content_types - task_words) / max(len(content_types), 1),
+        "figurative": _per_100(len(FIGURATIVE.findall(text)), n),
+        "concrete": _per_100(proper + numbers, n),
+        "mtld": mtld(words),
+        "sentence_length_std": float(sentence_lengths.std()),
+        "opener_variety": len(set(openers)) / max(len(openers), 1),
+        "sentence_types": float(len({s.rstrip("\"'”’)")[-1:] for s in sentences} & {".", "?", "!"}) or 1),
+        "first_person": _per_100(sum(1 for w in words if w in FIRST_PERSON), n),
+        "stance": _per_100(len(STANCE.findall(text)), n),
+        "emotion": _per_100(sum(1 for w in words if w in EMOTION_WORDS), n),
+        "expressive": (text.count("?") + text.count("!") + text.count("—") + text.count(" - ")) / max(len(sentences), 1),
+        "paragraphs": float(len(paragraphs)),
+        "paragraph_variation": float(paragraph_lengths.std() / max(paragraph_lengths.mean(), 1)),
+        "hook": float(bool(re.match(r"^[\"“']|.*[?!][\"”']?$", opening)) or 0 < len(ENGLISH_WORD.findall(opening)) <= 6),
+        "echo": len(first_words & last_words) / max(len(first_words | last_words), 1) if len(paragraphs) > 1 else 0.0,
+        "dialogue": float(len(re.findall(r"[\"“][^\"”]+[\"”]", text))),
+    }
+
+
+def task_vocabulary(task):
+    # 과제에 제시된 단어·표현·안내 문장에 나오는 단어 (그대로 옮겨 쓴 표현은 독창성에서 제외)
+    words = set()
+    for key in ("vocabulary", "advanced_vocabulary", "useful_expressions", "complex_structures",
+                "minimal_guidance", "guide_questions", "hints", "template"):
+        values = task.get(key, [])
+        if isinstance(values, dict):
+            values = [v for group in values.values() for v in group]
+        if isinstance(values, str):
+            values = [values]
+        for value in values:
+            words.update(w.lower() for w in ENGLISH_WORD.findall(value))
+    return frozenset(words)
+
+
+@lru_cache(maxsize=512)
+def score_creativity(text, task_words=frozenset()):
+    # {차원: {"score": 0~100, "tip": 가장 약한 특징에 대한 조언}}
+    features = extract_features(text, task_words)
+    length_factor = float(np.interp(features["words"], [MIN_WORDS, FULL_WORDS], [0.5, 1.0]))
+    result = {}
+    for dimension, specs in FEATURES.items():
+        values = {name: float(np.interp(features[name], bounds, [0.0, 1.0])) for name, (bounds, _) in specs.items()}
+        weakest = min(values, key=values.get)
+        result[dimension] = {
+            "score": int(round(100 * length_factor * sum(values.values()) / len(values))),
+            "tip": specs[weakest][1],
+        }
+    return result
+
+
+def calibrate(path=CALIBRATION_PATH, repeats=20):
+    # 기준 글(low < mid < high)에 대해 차원별 점수와 수준 사이 순위 상관, 글 한 편당 계산 시간을 보고
+    with open(path, encoding="utf-8") as f:
+        essays = json.load(f)
+    order = {"low": 0, "mid": 1, "high": 2}
+    rows = []
+    timings = []
+    for essay in essays:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            scores = score_creativity.__wrapped__(essay["text"])
+            timings.append(time.perf_counter() - started)
+        rows.append({"id": essay["id"], "level": essay["level"],
+                     **{dimension: scores[dimension]["score"] for dimension in DIMENSIONS}})
+    frame = pd.DataFrame(rows)
+    ranks = frame["level"].map(order)
+    # 순위끼리의 피어슨 상관 = 스피어만 상관 (scipy 없이 계산)
+    correlation = {dimension: frame[dimension].rank().corr(ranks.rank()) for dimension in DIMENSIONS}
+    return frame, correlation, np.array(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="창의성 점수 보정 확인")
+    parser.add_argument("--calibrate", action="store_true", help="기준 글 모음으로 점수 순서와 속도 확인")
+    parser.add_argument("--data", default=CALIBRATION_PATH, help="기준 글 JSON 경로")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+    if not args.calibrate:
+        parser.error("--calibrate를 지정하세요")
+    frame, correlation, timings = calibrate(args.data, args.repeats)
+    print(frame.to_string(index=False))
+    print()
+    print(frame.groupby("level", sort=False)[list(DIMENSIONS)].mean().round(1).to_string())
+    print()
+    for dimension, rho in correlation.items():
+        print(f"{dimension}: Spearman ρ = {rho:.2f}")
+    print(f"글 한 편당 계산 시간: 중앙값 {np.median(timings):.2f} ms, 최대 {timings.max():.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# 학생 초안 저장소 (SQLite WAL)
+# 글을 (학생, 수준, 과제) 키로 저장해 새로고침하거나 다시 접속해도 이어 쓸 수 있게 함.
+# 페이지는 다시 그려질 때마다 save()를 부르지만 내용이 실제로 바뀌었을 때만 대기열에 올리고(같은 키의 이전
+# 대기분은 덮어씀), 쓰기 전용 스레드가 flush_interval 동안 모인 글을 트랜잭션 하나로 씀. 그래서 스크립트
+# 스레드는 디스크를 기다리지 않고, 한 반이 함께 자동 저장해도 쓰기는 간격마다 한 번으로 묶임.
+# WAL 모드라 쓰는 동안에도 모든 세션이 공유하는 읽기 연결들이 막히지 않음
+#     python -m writing_helper.drafts --bench 30
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date
+
+from writing_helper import settings
+from writing_helper.cache import content_hash
+
+# content는 자동 저장되는 최신 글, submitted_content는 마지막으로 💾 저장(제출)한 때의 글
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS drafts (student TEXT, level TEXT, task TEXT, term TEXT, content TEXT, "
+    "content_hash TEXT, updated REAL, submitted REAL, submitted_content TEXT, PRIMARY KEY (student, level, task))"
+)
+UPSERT = (
+    "INSERT INTO drafts (student, level, task, term, content, content_hash, updated, submitted, submitted_content) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (student, level, task) DO UPDATE SET term = excluded.term, content = excluded.content, "
+    "content_hash = excluded.content_hash, updated = excluded.updated, "
+    "submitted = COALESCE(excluded.submitted, drafts.submitted), "
+    "submitted_content = COALESCE(excluded.submitted_content, drafts.submitted_content)"
+)
+# 다른 프로세스가 쓰는 중이면 이 시간(초)까지 기다림
+BUSY_TIMEOUT = 5.0
+
+
+def current_term(today=None):
+    # 학기 이름: 3~8월은 1학기, 9~2월은 2학기 (1~2월은 전년도 2학기)
+    if settings.TERM:
+        return settings.TERM
+    today = today or date.today()
+    if today.month >= 9:
+        return f"{today.year}-2"
+    if today.month >= 3:
+        return f"{today.year}-1"
+    return f"{today.year - 1}-2"
+
+
+class DraftStore:
+    def __init__(self, path, flush_interval=0.5, readers=4):
+        self.path = path
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 키 → (글, 해시, 학기, 저장 시각, 제출 시각, 제출한 글): 아직 쓰지 않은 글과 쓰기 스레드가 쓰고 있는 글
+        self._pending = {}
+        self._writing = {}
+        # 키 → 마지막으로 받은(또는 읽은) 글의 해시: 같은 글이면 다시 쓰지 않음
+        self._hashes = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = None
+        # 읽기 연결 풀 (세션 수와 상관없이 최대 readers개)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(readers)
+        db = self._connect()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(SCHEMA)
+        # 제출 글 열이 생기기 전에 만든 파일이면 열을 더함
+        if "submitted_content" not in [row[1] for row in db.execute("PRAGMA table_info(drafts)")]:
+            db.execute("ALTER TABLE drafts ADD COLUMN submitted_content TEXT")
+        db.commit()
+        self._idle.put(db)
+        self.writes = 0
+        self.skipped = 0
+        self.batches = 0
+        self.errors = 0
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _read(self, sql, params=()):
+        with self._slots:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                db = self._connect()
+            try:
+                return db.execute(sql, params).fetchall()
+            finally:
+                self._idle.put(db)
+
+    def save(self, student, level, task, content, submitted=False):
+        # 바뀐 글만 대기열에 올리고 바로 돌아옴 (실제 쓰기는 쓰기 스레드가 함), 올렸으면 True.
+        # 저장된 적 없는 과제의 빈 글은 열어 보기만 한 것이므로 쓰지 않음
+        key = (student, level, task)
+        digest = content_hash(content)
+        now = time.time()
+        with self._cond:
+            unchanged = self._hashes.get(key) == digest or (key not in self._hashes and not content.strip())
+            if not submitted and unchanged:
+                self.skipped += 1
+                return False
+            self._hashes[key] = digest
+            previous = self._pending.get(key)
+            submitted_at = now if submitted else (previous[4] if previous else None)
+            submitted_content = content if submitted else (previous[5] if previous else None)
+            self._pending[key] = (content, digest, current_term(), now, submitted_at, submitted_content)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="draft-writer", daemon=True)
+                self._writer.start()
+            self._cond.notify_all()
+        return True
+
+    def load(self, student, level, task):
+        # 저장된 글 (아직 쓰지 않은 글이 있으면 그것), 없으면 None
+        key = (student, level, task)
+        with self._cond:
+            entry = self._pending.get(key) or self._writing.get(key)
+            if entry is not None:
+                return entry[0]
+        rows = self._read(
+            "SELECT content, content_hash FROM drafts WHERE student = ? AND level = ? AND task = ?", key
+        )
+        if not rows:
+            return None
+        with self._cond:
+            self._hashes.setdefault(key, rows[0][1])
+        return rows[0][0]
+
+    def submissions(self, term):
+        # 학기 안에서 제출(💾 저장)한 글 [(학생, 수준, 과제, 글)]: 제출 뒤 자동 저장된 글이 아니라 제출한 때의 글
+        # (제출 글 열이 생기기 전에 제출한 행은 최신 글로 대신함)
+        return self._read(
+            "SELECT student, level, task, COALESCE(submitted_content, content) FROM drafts "
+            "WHERE term = ? AND submitted IS NOT NULL", (term,)
+        )
+
+    def _run(self):
+        db = self._connect()
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            # 잠깐 기다렸다가 그동안 모인 글을 한꺼번에 씀 (같은 학생이 계속 고친 글은 마지막 것만 남음)
+            if not self._closed:
+                time.sleep(self.flush_interval)
+            with self._cond:
+                self._writing, self._pending = self._pending, {}
+                batch = self._writing
+            rows = [(*key, term, content, digest, updated, submitted, submitted_content)
+                    for key, (content, digest, term, updated, submitted, submitted_content) in batch.items()]
+            try:
+                with db:
+                    db.executemany(UPSERT, rows)
+            except sqlite3.Error:
+                # 쓰지 못한 글은 그사이 새로 들어온 글이 없을 때만 대기열로 되돌려 다음 번에 다시 씀
+                with self._cond:
+                    self.errors += 1
+                    for key, entry in batch.items():
+                        self._pending.setdefault(key, entry)
+                    self._writing = {}
+                    if self._closed:
+                        return
+                time.sleep(self.flush_interval)
+                continue
+            with self._cond:
+                self._writing = {}
+                self.writes += len(rows)
+                self.batches += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        # 대기 중인 글이 모두 쓰일 때까지 기다림, 다 썼으면 True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        # 남은 글을 모두 쓰고 쓰기 스레드를 끝냄
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending) + len(self._writing),
+                "writes": self.writes,
+                "skipped": self.skipped,
+                "batches": self.batches,
+                "errors": self.errors,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_draft_store():
+    # 모든 세션이 같은 저장소(쓰기 스레드 하나, 읽기 연결 풀)를 공유하고, 종료할 때 남은 글을 씀
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DraftStore(settings.DRAFT_DB_PATH, settings.DRAFT_FLUSH_INTERVAL,
+                                settings.DRAFT_READ_CONNECTIONS)
+            atexit.register(_store.close)
+        return _store
+
+
+def benchmark(students, edits=40, flush_interval=0.5):
+    # 한 반(students명)이 동시에 글을 쓰며 자동 저장하는 상황: 입력마다 save()를 부르고 세 번에 한 번은
+    # 글이 그대로인 다시 그리기로 봄. save() 호출 시간과 실제 쓰기 횟수·묶음 수를 측정
+    with tempfile.TemporaryDirectory() as directory:
+        store = DraftStore(os.path.join(directory, "drafts.sqlite3"), flush_interval)
+        timings = []
+        timings_lock = threading.Lock()
+
+        def student(number):
+            text = ""
+            local = []
+            for edit in range(edits):
+                if edit % 3:
+                    text += f" Sentence {edit} written by student {number}."
+                started = time.perf_counter()
+                store.save(f"bench/{number}", "intermediate", "personal_essay", text)
+                local.append((time.perf_counter() - started) * 1000)
+                time.sleep(0.02)
+            with timings_lock:
+                timings.extend(local)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=student, args=(i,)) for i in range(students)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        elapsed = time.perf_counter() - started
+        restored = sum(store.load(f"bench/{i}", "intermediate", "personal_essay") is not None
+                       for i in range(students))
+        store.close()
+        timings.sort()
+        return {**store.stats(), "saves": len(timings), "elapsed": elapsed, "restored": restored,
+                "median_ms": timings[len(timings) // 2], "max_ms": timings[-1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="초안 저장소 자동 저장 부하 측정")
+    parser.add_argument("--bench", type=int, metavar="N", help="학생 N명이 함께 자동 저장하는 상황 측정")
+    parser.add_argument("--edits", type=int, default=40, help="학생 한 명의 입력 횟수")
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.error("--bench가 필요합니다")
+    result = benchmark(args.bench, args.edits, settings.DRAFT_FLUSH_INTERVAL)
+    print(f"학생 {args.bench}명 × 입력 {args.edits}번 = save() {result['saves']}번 ({result['elapsed']:.2f}초): "
+          f"바뀌지 않아 건너뜀 {result['skipped']}번, 실제 쓰기 {result['writes']}행을 {result['batches']}번에 묶어 씀")
+    print(f"save() 호출 시간 중앙값 {result['median_ms']:.3f} ms, 최대 {result['max_ms']:.3f} ms, "
+          f"복원된 글 {result['restored']}/{args.bench}편, 쓰기 오류 {result['errors']}번")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# 제출 글 사이의 베끼기·돌려 쓰기 찾기 (MinHash + LSH)
+# 글을 네 낱말 묶음(shingle)의 집합으로 보고 128개의 해시 최솟값(MinHash 서명)으로 줄인 뒤, 서명을 3칸씩
+# 42개 띠(band)로 나눠 띠마다 같은 값을 가진 글끼리 한 버킷에 모음. 새 글은 자기 버킷에 든 글만 비교하면
+# 되므로 모든 글과 일일이 비교(O(n²))하지 않아도 되고, 저장할 때마다 색인에 바로 더할 수 있음.
+# 서명은 SQLite에 보관해 재시작해도 유지되며, 학기 전체 색인은 초안 저장소(또는 JSONL 파일)의 제출 글로
+# 아래 배치 명령을 써서 다시 만듦
+#     python -m writing_helper.duplicates --from-drafts --term 2026-1
+#     python -m writing_helper.duplicates --rebuild submissions.jsonl --term 2026-1
+#     python -m writing_helper.duplicates --report --term 2026-1
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from writing_helper import settings
+from writing_helper.drafts import DraftStore, current_term
+from writing_helper.vocab_index import TOKEN_PATTERN
+
+SHINGLE_SIZE = 4
+NUM_PERM = 128
+# 띠 42개 × 3칸 (남는 두 칸은 유사도 추정에만 씀): 유사도 0.5인 글은 99% 넘게 후보가 되고
+# 0.05인 글은 0.5%만 후보가 됨
+ROWS = 3
+BANDS = NUM_PERM // ROWS
+# 이보다 짧은 글은 흔한 문장만으로도 비슷해 보여서 비교하지 않음
+MIN_WORDS = 30
+
+# 곱셈-시프트 해시 h(x) = (a·x + b) >> 32 (uint64 곱셈은 2^64로 나눈 나머지로 넘침)
+_rng = np.random.default_rng(20240301)
+_A = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text):
+    words = [word.lower() for word in TOKEN_PATTERN.findall(text)]
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    # MinHash 서명 (uint32 NUM_PERM개): 두 서명에서 같은 칸의 비율이 두 글의 자카드 유사도 추정값
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64)
+    if not len(hashes):
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    with np.errstate(over="ignore"):
+        values = (_A[:, None] * hashes[None, :] + _B[:, None]) >> np.uint64(32)
+    return values.min(axis=1).astype(np.uint32)
+
+
+def similarity(first, second):
+    return float(np.mean(first == second))
+
+
+class DuplicateIndex:
+    def __init__(self, path=None, threshold=0.5):
+        self.threshold = threshold
+        # 글 키 (학기, 학생, 수준, 과제) → 서명, (띠 번호, 학기, 수준, 과제, 띠 값) → 글 키 집합
+        self._signatures = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS signatures (term TEXT, student TEXT, level TEXT, task TEXT, "
+                "signature BLOB, updated REAL, PRIMARY KEY (term, student, level, task))"
+            )
+            self._db.commit()
+            for term, student, level, task, blob in self._db.execute(
+                "SELECT term, student, level, task, signature FROM signatures"
+            ):
+                self._insert((term, student, level, task), np.frombuffer(blob, dtype=np.uint32))
+
+    @staticmethod
+    def _band_keys(key, sig):
+        term, _, level, task = key
+        return [(band, term, level, task, sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def _insert(self, key, sig):
+        self._remove(key)
+        self._signatures[key] = sig
+        for band_key in self._band_keys(key, sig):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def _remove(self, key):
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for band_key in self._band_keys(key, sig):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _matches(self, key, sig):
+        # 띠가 하나라도 같은 글만 후보로 보고, 서명 유사도가 기준 이상인 다른 학생의 글을 유사도 순으로 반환
+        candidates = set()
+        for band_key in self._band_keys(key, sig):
+            candidates |= self._buckets.get(band_key, set())
+        matches = []
+        for other in candidates:
+            if other[1] == key[1]:
+                continue
+            score = similarity(sig, self._signatures[other])
+            if score >= self.threshold:
+                matches.append({"student": other[1], "similarity": score})
+        return sorted(matches, key=lambda m: -m["similarity"])
+
+    def add(self, student, level, task, text, term=None):
+        # 저장한 글을 색인에 넣고(같은 학생·과제의 이전 서명은 바꿔 넣음) 비슷한 다른 학생의 글 목록을 반환
+        key = (term or current_term(), student, level, task)
+        if len(TOKEN_PATTERN.findall(text)) < MIN_WORDS:
+            return []
+        sig = signature(text)
+        with self._lock:
+            matches = self._matches(key, sig)
+            self._insert(key, sig)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO signatures (term, student, level, task, signature, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, sig.tobytes(), time.time())
+                )
+                self._db.commit()
+        return matches
+
+    def rebuild(self, term, submissions):
+        # 학기 하나의 서명을 모두 지우고 제출 글 [(학생, 수준, 과제, 글)]로 다시 만듦
+        rows = []
+        with self._lock:
+            for key in [key for key in self._signatures if key[0] == term]:
+                self._remove(key)
+            for student, level, task, text in submissions:
+                if len(TOKEN_PATTERN.findall(text)) < MIN_WORDS:
+                    continue
+                key = (term, student, level, task)
+                sig = signature(text)
+                self._insert(key, sig)
+                rows.append((*key, sig.tobytes(), time.time()))
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM signatures WHERE term = ?", (term,))
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO signatures (term, student, level, task, signature, updated) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+        return len(rows)
+
+    def pairs(self, term):
+        # 학기 안에서 서로 비슷한 글 쌍 [(학생1, 학생2, 수준, 과제, 유사도)] (유사도 높은 순)
+        found = {}
+        with self._lock:
+            for bucket_key, keys in self._buckets.items():
+                if bucket_key[1] != term or len(keys) < 2:
+                    continue
+                ordered = sorted(keys)
+                for i, first in enumerate(ordered):
+                    for second in ordered[i + 1:]:
+                        if first[1] == second[1] or (first, second) in found:
+                            continue
+                        found[(first, second)] = similarity(self._signatures[first], self._signatures[second])
+        return sorted(
+            ((first[1], second[1], first[2], first[3], score)
+             for (first, second), score in found.items() if score >= self.threshold),
+            key=lambda pair: -pair[4]
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"documents": len(self._signatures), "buckets": len(self._buckets)}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index():
+    # 모든 세션이 같은 색인에 저장한 글을 더하도록 한 번만 생성
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DuplicateIndex(settings.DUPLICATE_INDEX_PATH or None, settings.DUPLICATE_THRESHOLD)
+        return _index
+
+
+def read_submissions(path):
+    # 한 줄에 한 편: {"student": "3-1/20301", "level": "intermediate", "task": "personal_essay", "text": "..."}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield item["student"], item["level"], item["task"], item["text"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="제출 글 유사도 색인 다시 만들기와 비슷한 글 보고")
+    parser.add_argument("--rebuild", metavar="JSONL", help="학기 전체 제출 글(JSONL)로 색인을 다시 만듦")
+    parser.add_argument("--from-drafts", action="store_true", help="초안 저장소에 제출된 글로 색인을 다시 만듦")
+    parser.add_argument("--drafts", default=settings.DRAFT_DB_PATH, help="초안 저장소 SQLite 경로")
+    parser.add_argument("--report", action="store_true", help="학기 안의 비슷한 글 쌍을 출력")
+    parser.add_argument("--term", default=None, help="학기 (기본: 현재 학기)")
+    parser.add_argument("--index", default=settings.DUPLICATE_INDEX_PATH, help="색인 SQLite 경로")
+    parser.add_argument("--threshold", type=float, default=settings.DUPLICATE_THRESHOLD)
+    args = parser.parse_args(argv)
+    if not (args.rebuild or args.from_drafts or args.report):
+        parser.error("--rebuild, --from-drafts, --report 중 하나가 필요합니다")
+    term = args.term or current_term()
+    started = time.perf_counter()
+    index = DuplicateIndex(args.index or None, args.threshold)
+    print(f"색인 열기 {(time.perf_counter() - started) * 1000:.1f} ms ({index.stats()['documents']}편)")
+    if args.rebuild or args.from_drafts:
+        started = time.perf_counter()
+        submissions = read_submissions(args.rebuild) if args.rebuild else DraftStore(args.drafts).submissions(term)
+        count = index.rebuild(term, submissions)
+        print(f"{term} 학기 색인 다시 만들기: {count}편, {time.perf_counter() - started:.2f}초")
+    started = time.perf_counter()
+    pairs = index.pairs(term)
+    print(f"비슷한 글 {len(pairs)}쌍 (유사도 {args.threshold:.2f} 이상, {(time.perf_counter() - started) * 1000:.1f} ms)")
+    for first, second, level, task, score in pairs:
+        print(f"  {score:.2f}  {first} ↔ {second}  [{level}/{task}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# 규칙 기반 문법 검사 (관사, 주어-동사 일치, 시제 일관성, 복수형)
+# 중학생 영어 학습자가 자주 틀리는 패턴을 정규식으로 미리 컴파일해 두고, 틀린 부분의 위치와
+# 고칠 말을 돌려줌. 모델 호출 없이 글 한 편에 수 ms라서 분석 버튼을 누르면 바로 보여줄 수 있음
+#     python -m writing_helper.grammar --bench
+import argparse
+import json
+import os
+import re
+import time
+from functools import lru_cache
+
+from writing_helper.context import split_paragraphs
+from writing_helper.textstats import split_sentences
+
+SAMPLES_PATH = os.path.join(os.path.dirname(__file__), "data", "grammar_samples.json")
+
+ARTICLE, AGREEMENT, TENSE, PLURAL = "관사", "주어-동사 일치", "시제", "복수형"
+CATEGORIES = (ARTICLE, AGREEMENT, TENSE, PLURAL)
+
+# 셀 수 있는 흔한 명사 (단수형)
+COUNTABLE = set("""
+animal apple bag banana bird book boy brother bus car cat chair child city class computer country cousin day desk
+doctor dog door dream engineer family flower friend game girl hobby house idea job lamp man member month movie
+nurse pen pencil person pet phone picture pilot place player problem reason room scientist singer sister song
+story student subject teacher team thing toy tree trip week window woman word year bed bike box camera classmate
+cookie dish dollar egg gift hat hour letter minute neighbor parent park photo plant present restaurant sandwich school
+shoe sport ticket umbrella uniform
+""".split())
+IRREGULAR_PLURALS = {"child": "children", "person": "people", "man": "men", "woman": "women", "family": "families"}
+# 복수형으로 쓰지 않는 명사
+UNCOUNTABLE = {
+    "informations": "information", "homeworks": "homework", "advices": "advice", "furnitures": "furniture",
+    "equipments": "equipment", "knowledges": "knowledge", "luggages": "luggage", "baggages": "baggage",
+    "researches": "research", "evidences": "evidence", "vocabularies": "vocabulary",
+}
+# 3인칭 단수 현재형을 만들 때 자주 쓰는 동사
+BASE_VERBS = set("""
+become buy call clean come cook cry dance do draw eat enjoy feel get give go have help know learn like listen live
+look love make meet need play read run say see seem send sing sleep smell sound stay study swim take talk taste teach
+think throw try use visit wake walk want wash watch wear work write
+""".split())
+IRREGULAR_THIRD = {"have": "has", "do": "does", "go": "goes"}
+IRREGULAR_PAST = {
+    "am": "was", "is": "was", "are": "were", "have": "had", "has": "had", "do": "did", "does": "did", "go": "went",
+    "goes": "went", "eat": "ate", "eats": "ate", "see": "saw", "sees": "saw", "come": "came", "comes": "came",
+    "get": "got", "gets": "got", "give": "gave", "gives": "gave", "make": "made", "makes": "made",
+    "take": "took", "takes": "took", "feel": "felt", "feels": "felt", "think": "thought", "thinks": "thought",
+    "buy": "bought", "buys": "bought", "meet": "met", "meets": "met", "sleep": "slept", "sleeps": "slept",
+    "write": "wrote", "writes": "wrote", "read": "read", "reads": "read", "say": "said", "says": "said",
+    "teach": "taught", "teaches": "taught", "swim": "swam", "swims": "swam", "run": "ran", "runs": "ran",
+    "become": "became", "becomes": "became", "sing": "sang", "sings": "sang", "draw": "drew", "draws": "drew",
+    "send": "sent", "sends": "sent", "wake": "woke", "wakes": "woke", "wear": "wore", "wears": "wore",
+    "throw": "threw", "throws": "threw",
+}
+PAST_TO_BASE = {
+    "went": "go", "ate": "eat", "saw": "see", "came": "come", "got": "get", "gave": "give", "made": "make",
+    "took": "take", "felt": "feel", "thought": "think", "bought": "buy", "met": "meet", "slept": "sleep",
+    "wrote": "write", "said": "say", "taught": "teach", "swam": "swim", "ran": "run", "had": "have", "did": "do",
+    "became": "become", "sang": "sing", "drew": "draw", "sent": "send", "woke": "wake", "wore": "wear", "threw": "throw",
+}
+NUMBERS = "two|three|four|five|six|seven|eight|nine|ten|many|several|few|these|those|both|[2-9]|[1-9]\\d+"
+# 관사 a: 대문자 A는 문장 첫머리일 때만 관사로 봄 ("Plan A is", "grade A"의 A는 이름)
+ARTICLE_A = r"(?:a|(?:(?<=^)|(?<=[.!?\"“]\s)|(?<=\n))A)"
+# 3인칭 단수로 쓰이는 "my ..." 주어
+SINGULAR_SUBJECTS = (
+    "mom|dad|mother|father|brother|sister|friend|teacher|grandmother|grandfather|grandma|grandpa|uncle|aunt|cousin"
+    "|family|dog|cat"
+)
+PAST_MARKERS = re.compile(
+    r"\b(?:yesterday|last (?:night|week|weekend|month|year|summer|winter|spring|fall|time|sunday|monday|tuesday"
+    r"|wednesday|thursday|friday|saturday)|ago)\b",
+    re.IGNORECASE
+)
+# 지금·습관·미래를 나타내는 말이 함께 나오는 절은 과거 이야기로 보지 않음
+PRESENT_MARKERS = re.compile(
+    r"\b(?:now|today|these days|nowadays|usually|always|often|sometimes|every|tomorrow|next|will|future)\b",
+    re.IGNORECASE
+)
+
+
+def _third_person(verb):
+    if verb in IRREGULAR_THIRD:
+        return IRREGULAR_THIRD[verb]
+    if re.search(r"[^aeiou]y$", verb):
+        return verb[:-1] + "ies"
+    if re.search(r"(?:s|x|z|ch|sh|o)$", verb):
+        return verb + "es"
+    return verb + "s"
+
+
+def _plural(noun):
+    if noun in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[noun]
+    if re.search(r"[^aeiou]y$", noun):
+        return noun[:-1] + "ies"
+    if re.search(r"(?:s|x|z|ch|sh)$", noun):
+        return noun + "es"
+    return noun + "s"
+
+
+def _past(verb):
+    if verb in IRREGULAR_PAST:
+        return IRREGULAR_PAST[verb]
+    if verb.endswith("ies"):
+        return verb[:-3] + "ied"
+    if verb.endswith("es") and verb[:-2] in BASE_VERBS:
+        verb = verb[:-2]
+    elif verb.endswith("s") and verb[:-1] in BASE_VERBS:
+        verb = verb[:-1]
+    if verb.endswith("e"):
+        return verb + "d"
+    if re.search(r"[^aeiou]y$", verb):
+        return verb[:-1] + "ied"
+    return verb + "ed"
+
+
+def _base(verb):
+    if verb in PAST_TO_BASE:
+        return PAST_TO_BASE[verb]
+    if verb.endswith("ied"):
+        return verb[:-3] + "y"
+    if verb.endswith("ed") and verb[:-1] in BASE_VERBS:
+        return verb[:-1]
+    if verb.endswith("ed"):
+        return verb[:-2]
+    if verb in {_third_person(v) for v in BASE_VERBS}:
+        return next(v for v in BASE_VERBS if _third_person(v) == verb)
+    return verb
+
+
+def _match_case(original, replacement):
+    return replacement[:1].upper() + replacement[1:] if original[:1].isupper() else replacement
+
+
+def _words(words):
+    return "|".join(sorted(words, key=len, reverse=True))
+
+
+PLURAL_FORMS = {_plural(noun): noun for noun in COUNTABLE}
+THIRD_PERSON_FORMS = {_third_person(verb) for verb in BASE_VERBS}
+PAST_FORMS = set(PAST_TO_BASE) | {_past(verb) for verb in BASE_VERBS}
+PRESENT_FORMS = set(BASE_VERBS) | THIRD_PERSON_FORMS | {"am", "is", "are"}
+
+# (분류, 정규식, 설명, 고칠 말을 만드는 함수) — 정규식의 err 그룹이 틀린 부분이며,
+# 함수가 None을 돌려주면 틀리지 않은 것으로 봄
+RULES = [
+    (ARTICLE, rf"\b(?P<err>{ARTICLE_A})\s+(?!(?:uni|use|usu|eu|one|once)\w*)[aeiouAEIOU]\w*",
+     "모음 소리로 시작하는 단어 앞에는 'an'을 써요.", lambda m: _match_case(m.group("err"), "an")),
+    (ARTICLE, rf"\b(?P<err>{ARTICLE_A})\s+(?:hour|honest|honor|heir)\w*",
+     "h가 소리 나지 않는 단어(hour, honest) 앞에는 'an'을 써요.", lambda m: _match_case(m.group("err"), "an")),
+    (ARTICLE, r"\b(?P<err>[Aa]n)\s+(?!(?:hour|honest|honor|heir)\w*)(?:[b-df-hj-np-tv-z]|uni|use|usu|eu|one)\w*",
+     "자음 소리로 시작하는 단어 앞에는 'a'를 써요.", lambda m: _match_case(m.group("err"), "a")),
+    (ARTICLE, rf"\b(?:am|is|was|be|become|became)\s+(?P<err>{_words(COUNTABLE)})\b(?!\s+(?:of|and)\b)",
+     "셀 수 있는 명사 하나 앞에는 'a/an'이 필요해요.",
+     lambda m: ("an " if m.group("err")[0] in "aeiou" else "a ") + m.group("err")),
+    (ARTICLE, rf"\b(?:have|has|had|want|wanted|need|needs|is|was|see|saw|buy|bought)\s+"
+              rf"(?P<err>(?:dog|cat|brother|sister|pet|bag|phone|computer|dream|idea|problem|car|bike))\b",
+     "셀 수 있는 명사 하나 앞에는 'a', 'my', 'the' 같은 말이 필요해요.",
+     lambda m: ("an " if m.group("err")[0] in "aeiou" else "a ") + m.group("err")),
+
+    (AGREEMENT, rf"\b(?P<subject>[Hh]e|[Ss]he|[Ii]t|[Mm]y (?:{SINGULAR_SUBJECTS}))\s+"
+                rf"(?P<err>{_words(BASE_VERBS)})\b",
+     "3인칭 단수 주어(he, she, it) 뒤의 현재형 동사에는 -s를 붙여요.", lambda m: _third_person(m.group("err"))),
+    (AGREEMENT, r"\b(?P<subject>I)\s+(?P<err>is|are)\b", "'I' 뒤에는 'am'을 써요.", lambda m: "am"),
+    (AGREEMENT, r"\b(?P<subject>[Ww]e|[Yy]ou|[Tt]hey)\s+(?P<err>is|am)\b",
+     "복수 주어(we, you, they) 뒤에는 'are'를 써요.", lambda m: "are"),
+    (AGREEMENT, r"\b(?P<subject>[Ww]e|[Yy]ou|[Tt]hey)\s+(?P<err>was)\b",
+     "복수 주어(we, you, they)의 과거형은 'were'예요.", lambda m: "were"),
+    (AGREEMENT, r"\b(?P<subject>[Hh]e|[Ss]he|[Ii]t)\s+(?P<err>are|am)\b",
+     "3인칭 단수 주어(he, she, it) 뒤에는 'is'를 써요.", lambda m: "is"),
+    (AGREEMENT, r"\b(?P<subject>[Hh]e|[Ss]he|[Ii]t)\s+(?P<err>were)\b",
+     "3인칭 단수 주어(he, she, it)의 과거형은 'was'예요.", lambda m: "was"),
+    (AGREEMENT, r"\b(?P<subject>[Hh]e|[Ss]he|[Ii]t)\s+(?P<err>don't|do not)\b",
+     "3인칭 단수 주어 뒤에는 'doesn't'를 써요.", lambda m: m.group("err").replace("do", "does", 1)),
+    (AGREEMENT, r"\b(?P<subject>I|[Ww]e|[Yy]ou|[Tt]hey)\s+(?P<err>has|does|doesn't|does not)\b",
+     "I, we, you, they 뒤에는 'have/do'를 써요.", lambda m: m.group("err").replace("has", "have").replace("does", "do")),
+    (AGREEMENT, rf"\b(?P<subject>I|[Ww]e|[Yy]ou|[Tt]hey)\s+(?P<err>{_words(THIRD_PERSON_FORMS - {'has', 'does'})})\b",
+     "I, we, you, they 뒤의 현재형 동사에는 -s를 붙이지 않아요.", lambda m: _base(m.group("err"))),
+    (AGREEMENT, r"\b(?P<subject>(?i:people|children|my parents|my friends|many \w+s))\s+"
+                r"(?P<err>is|was|has|does|doesn't)\b",
+     "복수 주어 뒤에는 'are/were/have/do'를 써요.",
+     lambda m: {"is": "are", "was": "were", "has": "have", "does": "do", "doesn't": "don't"}[m.group("err")]),
+    (AGREEMENT, rf"\b[Tt]here\s+(?P<err>is|was)\s+(?:{NUMBERS})\b",
+     "뒤에 오는 명사가 복수면 'there are/were'를 써요.", lambda m: "are" if m.group("err") == "is" else "were"),
+
+    (TENSE, r"\b(?:did|didn't|does|doesn't|do|don't|can|can't|could|will|won't|would|should|must|to)\s+(?:not\s+)?"
+            rf"(?P<err>{_words(PAST_FORMS | THIRD_PERSON_FORMS - {'does', 'has', 'is'})})\b",
+     "조동사(did, can, will)나 to 뒤에는 동사원형을 써요.", lambda m: _base(m.group("err"))),
+
+    (PLURAL, rf"(?<!\b[Aa]\s)\b(?i:{NUMBERS}|a lot of|lots of|one of (?:the|my|our|his|her|their))\s+(?:\w+\s+)?"
+             rf"(?P<err>{_words(COUNTABLE)})\b(?![-\s]+old\b)",
+     "둘 이상을 말할 때는 명사를 복수형으로 써요.", lambda m: _plural(m.group("err"))),
+    (PLURAL, rf"\b(?:[Aa]n?|[Oo]ne|[Ee]very|[Ee]ach|[Aa]nother)\s+(?P<err>{_words(PLURAL_FORMS)})\b",
+     "하나를 말할 때는 명사를 단수형으로 써요.", lambda m: PLURAL_FORMS[m.group("err")]),
+    (PLURAL, rf"\b(?P<err>{_words(UNCOUNTABLE)})\b",
+     "셀 수 없는 명사라서 -s를 붙이지 않아요.", lambda m: UNCOUNTABLE[m.group("err").lower()]),
+]
+COMPILED_RULES = [(category, re.compile(pattern), message, fix) for category, pattern, message, fix in RULES]
+
+# 과거를 나타내는 말이 있는 문장의 현재형 동사 (시제 일관성)
+PRESENT_AFTER_SUBJECT = re.compile(
+    rf"\b(?:I|[Ww]e|[Hh]e|[Ss]he|[Tt]hey|[Ii]t|[Mm]y \w+)\s+(?:also\s+|really\s+)?(?P<err>{_words(PRESENT_FORMS)})\b"
+)
+# 조동사나 사역·지각동사 뒤의 주어는 동사원형과 함께 씀 ("Does he like", "let it go")
+SUBJECT_BEFORE = re.compile(
+    r"\b(?:does|do|did|can|will|would|could|should|may|might|must|to|not|let|make|made|help|helped|watch|saw|see"
+    r"|hear|heard)\s+$",
+    re.IGNORECASE
+)
+# it, you는 목적어일 수도 있고 ("remembers you is"), if·wish 뒤에서는 가정법 were를 씀 ("as if it were")
+OBJECT_OR_SUBJUNCTIVE = re.compile(r"\b(?:if|wish|though|\w+s|\w+ed)\s+$", re.IGNORECASE)
+# 과거 표시가 있어도 현재형이 자연스러운 동사 ("I think yesterday was fun")
+TENSE_EXEMPT = {"think", "thinks", "know", "knows", "believe", "hope", "remember"}
+QUOTED = re.compile(r"[\"“][^\"”]*[\"”]")
+# 절 경계: ", and", "; ", 또는 새 주어가 이어지는 접속사 앞 ("…Busan and I think…")
+CLAUSE_BREAK = re.compile(
+    r",\s*(?=(?:and|but|so|because|while|although|when)\b)|;\s*"
+    r"|\s(?=(?:and|but|so|because|while|although)\s+(?:I|we|he|she|they|it|you|my|our|his|her|their)\b)",
+    re.IGNORECASE
+)
+
+
+def _diagnostic(category, start, end, text, message, suggestion):
+    return {"start": start, "end": end, "text": text, "category": category, "message": message,
+            "suggestion": suggestion}
+
+
+def _clauses(sentence):
+    # (시작 위치, 절) 목록: 쉼표·세미콜론 뒤나 새 주어 앞의 접속사에서 나눔
+    bounds = [0] + [m.end() for m in CLAUSE_BREAK.finditer(sentence)] + [len(sentence)]
+    return [(start, sentence[start:end]) for start, end in zip(bounds, bounds[1:]) if sentence[start:end].strip()]
+
+
+def _tense_diagnostics(text):
+    # 과거 표시(yesterday, last week, ago)는 그 말이 나온 절에만 적용 ("Two years ago we moved. My dad works…"는
+    # 맞는 글이므로 다음 문장까지 과거 이야기로 보지 않음)
+    found = []
+    offset = 0
+    for paragraph in split_paragraphs(text):
+        for sentence in split_sentences(paragraph):
+            offset = text.find(sentence, offset)
+            # 따옴표 안의 대화는 그때 한 말 그대로라 현재형일 수 있음
+            quoted = [m.span() for m in QUOTED.finditer(sentence)]
+            for start, clause in _clauses(sentence):
+                if not PAST_MARKERS.search(clause) or PRESENT_MARKERS.search(clause):
+                    continue
+                for match in PRESENT_AFTER_SUBJECT.finditer(clause):
+                    verb = match.group("err")
+                    if verb.lower() in TENSE_EXEMPT or any(a <= start + match.start() < b for a, b in quoted):
+                        continue
+                    found.append(_diagnostic(
+                        TENSE, offset + start + match.start("err"), offset + start + match.end("err"), verb,
+                        "과거 이야기(yesterday, last week, ago)에서는 과거형 동사를 써요.", _past(verb.lower())
+                    ))
+            offset += len(sentence)
+    return found
+
+
+@lru_cache(maxsize=256)
+def check_grammar(text):
+    # 위치 순으로 정렬한 진단 목록 [{"start", "end", "text", "category", "message", "suggestion"}]
+    # 과거 표시가 있는 문장에서는 "he go"를 goes가 아닌 went로 고치도록 시제 진단을 먼저 둠
+    diagnostics = _tense_diagnostics(text)
+    for category, pattern, message, fix in COMPILED_RULES:
+        for match in pattern.finditer(text):
+            prefix = text[max(match.start() - 12, 0):match.start()]
+            # "Does he like...", "can she go" 처럼 조동사가 앞에 있으면 동사원형이 맞음
+            if "subject" in pattern.groupindex:
+                if SUBJECT_BEFORE.search(prefix):
+                    continue
+                if match.group("subject").lower() in ("it", "you") and OBJECT_OR_SUBJUNCTIVE.search(prefix):
+                    continue
+            suggestion = fix(match)
+            if suggestion is None:
+                continue
+            diagnostics.append(_diagnostic(
+                category, match.start("err"), match.end("err"), match.group("err"), message, suggestion
+            ))
+    # 같은 위치를 여러 규칙이 잡으면 먼저 나온 규칙만 남기고, 고칠 말이 원래와 같으면 (과거형 read 등) 뺌
+    unique = {}
+    for diagnostic in diagnostics:
+        unique.setdefault(diagnostic["start"], diagnostic)
+    return tuple(sorted((d for d in unique.values() if d["suggestion"] != d["text"]), key=lambda d: d["start"]))
+
+
+def summarize(diagnostics):
+    # 분류별 개수
+    counts = {category: 0 for category in CATEGORIES}
+    for diagnostic in diagnostics:
+        counts[diagnostic["category"]] += 1
+    return counts
+
+
+def benchmark(path=SAMPLES_PATH, repeats=50):
+    # 틀린 곳을 표시해 둔 예시 글로 재현율·정밀도와 글 한 편당 검사 시간을 측정
+    with open(path, encoding="utf-8") as f:
+        samples = json.load(f)
+    expected_total = found_total = correct = 0
+    missed = []
+    timings = []
+    for sample in samples:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            diagnostics = check_grammar.__wrapped__(sample["text"])
+            timings.append(time.perf_counter() - started)
+        found = {(d["text"].lower(), d["suggestion"].lower()) for d in diagnostics}
+        expected = {(error.lower(), fix.lower()) for error, fix in sample["errors"]}
+        expected_total += len(expected)
+        found_total += len(found)
+        correct += len(found & expected)
+        missed.extend((sample["id"], error, fix) for error, fix in expected - found)
+    return {
+        "samples": len(samples),
+        "recall": correct / max(expected_total, 1),
+        "precision": correct / max(found_total, 1),
+        "missed": missed,
+        "timings_ms": sorted(t * 1000 for t in timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문법 검사 규칙의 정확도와 속도 측정")
+    parser.add_argument("--bench", action="store_true", help="예시 글 모음으로 재현율·정밀도와 속도 확인")
+    parser.add_argument("--data", default=SAMPLES_PATH, help="예시 글 JSON 경로")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.error("--bench를 지정하세요")
+    result = benchmark(args.data, args.repeats)
+    timings = result["timings_ms"]
+    print(f"예시 글 {result['samples']}편: 재현율 {result['recall']:.2f}, 정밀도 {result['precision']:.2f}")
+    for sample_id, error, fix in result["missed"]:
+        print(f"  놓친 오류 [{sample_id}] {error} → {fix}")
+    print(f"글 한 편당 검사 시간: 중앙값 {timings[len(timings) // 2]:.2f} ms, 최대 {timings[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# 안내 질문 커버리지 (중급 과제의 guide_questions에 글이 답했는지 확인)
+# 안내 질문을 TF-IDF 벡터로 바꿔 과제마다 한 번만 만들어 두고, 학생 글의 모든 문단을 한 번에 벡터로 만든 뒤
+# 행렬 곱 한 번으로 (문단 × 질문) 유사도 행렬을 구함. 모델 호출 없이 글 구조에 대한 피드백을 줄 수 있음
+import math
+import threading
+
+import numpy as np
+
+from writing_helper.context import split_paragraphs
+from writing_helper.creativity import COMMON_WORDS
+from writing_helper.tasks import LEVEL_TASKS
+from writing_helper.vocab_index import lemma, tokenize
+
+# 질문 낱말에 대한 답에 흔히 나오는 낱말 (질문 낱말 가중치의 절반으로 더함)
+EXPANSIONS = {
+    "why": ["because", "reason", "since"],
+    "dream": ["want", "hope", "wish", "become"],
+    "job": ["career", "work", "become", "profession"],
+    "career": ["job", "work", "become"],
+    "skill": ["ability", "learn", "practice", "good"],
+    "achieve": ["reach", "succeed", "goal"],
+    "prepare": ["plan", "study", "practice", "learn"],
+    "future": ["someday", "later", "become"],
+    "challenge": ["difficult", "hard", "problem", "obstacle"],
+    "overcome": ["solve", "handle", "try", "never"],
+    "important": ["necessary", "essential", "need", "must"],
+    "problem": ["pollution", "trash", "waste", "climate", "warming", "plastic"],
+    "environment": ["nature", "earth", "planet"],
+    "environmental": ["nature", "earth", "planet", "pollution"],
+    "protect": ["save", "reduce", "recycle", "reuse"],
+    "individual": ["people", "everyone", "person", "student"],
+    "encourage": ["persuade", "campaign", "ask", "tell", "example"],
+    "friendly": ["green", "eco"],
+    "compare": ["culture", "different", "similar", "country"],
+    "similarity": ["similar", "both", "same", "also", "like"],
+    "difference": ["different", "unlike", "however", "while", "but"],
+    "learn": ["understand", "respect", "lesson", "realize"],
+    "memorable": ["remember", "never", "forget", "special"],
+    "event": ["festival", "trip", "day", "sport", "contest"],
+    "when": ["last", "ago", "year", "month", "day", "morning", "afternoon", "grade", "semester"],
+    "where": ["gym", "classroom", "school", "field", "playground", "hall"],
+    "who": ["friend", "teacher", "classmate", "everyone", "team"],
+    "involve": ["friend", "teacher", "classmate", "team", "together"],
+    "feel": ["happy", "sad", "proud", "excited", "nervous", "glad", "sorry"],
+}
+# 질문과 학생 글 모두 원형으로 비교하므로 확장 표도 원형으로 바꿔 둠 (challenges → challeng)
+EXPANSIONS = {lemma(word): [lemma(cue) for cue in cues] for word, cues in EXPANSIONS.items()}
+EXPANSION_WEIGHT = 0.5
+# 이 유사도 이상인 문단이 있으면 질문에 답한 것으로 봄
+COVERED_THRESHOLD = 0.3
+
+
+def _terms(text):
+    # (원형, 확장 여부) 목록: 불용어를 빼기 전에 why → because 같은 확장 낱말을 붙임
+    terms = []
+    for word, _, _ in tokenize(text):
+        for cue in EXPANSIONS.get(word, []):
+            terms.append((cue, True))
+        if word not in COMMON_WORDS:
+            terms.append((word, False))
+    return terms
+
+
+def _document_frequency():
+    # 모든 과제의 안내 질문을 문서 모음으로 보고 낱말별 문서 빈도를 셈
+    questions = [question for tasks in LEVEL_TASKS.values() for task in tasks.values()
+                 for question in task.get("guide_questions", [])]
+    frequency = {}
+    for question in questions:
+        for term in {term for term, _ in _terms(question)}:
+            frequency[term] = frequency.get(term, 0) + 1
+    return frequency, len(questions)
+
+
+class GuideIndex:
+    def __init__(self, task, document_frequency, documents):
+        self.questions = list(task.get("guide_questions", []))
+        terms_per_question = [_terms(question) for question in self.questions]
+        vocabulary = sorted({term for terms in terms_per_question for term, _ in terms})
+        self._columns = {term: i for i, term in enumerate(vocabulary)}
+        self._idf = np.array([math.log((1 + documents) / (1 + document_frequency.get(term, 0))) + 1
+                              for term in vocabulary])
+        # 질문 벡터 (질문 × 낱말), 행마다 길이 1로 정규화
+        matrix = np.zeros((len(self.questions), len(vocabulary)))
+        for row, terms in enumerate(terms_per_question):
+            for term, expanded in terms:
+                matrix[row, self._columns[term]] += EXPANSION_WEIGHT if expanded else 1.0
+        matrix = np.log1p(matrix) * self._idf
+        self._questions = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    def score(self, text):
+        # {"paragraphs": n, "matrix": (문단 × 질문) 유사도, "best": 질문별 가장 잘 답한 문단 번호, "covered": [bool]}
+        paragraphs = split_paragraphs(text)
+        rows = []
+        columns = []
+        for row, paragraph in enumerate(paragraphs):
+            for word, _, _ in tokenize(paragraph):
+                column = self._columns.get(word)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        # 모든 문단의 낱말 수를 bincount 한 번으로 세고 행렬 곱 한 번으로 유사도를 구함
+        size = len(self._columns)
+        counts = np.bincount(np.array(rows, dtype=np.int64) * size + np.array(columns, dtype=np.int64),
+                             minlength=len(paragraphs) * size).reshape(len(paragraphs), size)
+        vectors = np.log1p(counts) * self._idf
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        matrix = vectors @ self._questions.T
+        best = matrix.argmax(axis=0) if len(paragraphs) else np.zeros(len(self.questions), dtype=np.int64)
+        scores = matrix.max(axis=0) if len(paragraphs) else np.zeros(len(self.questions))
+        return {
+            "paragraphs": len(paragraphs),
+            "matrix": matrix,
+            "best": best.tolist(),
+            "scores": scores.tolist(),
+            "covered": (scores >= COVERED_THRESHOLD).tolist(),
+        }
+
+
+_frequency = None
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_guide_index(task):
+    # 과제별 질문 벡터는 처음 요청될 때 한 번만 만들어 모든 세션이 공유
+    global _frequency
+    with _indexes_lock:
+        if _frequency is None:
+            _frequency = _document_frequency()
+        if task["type"] not in _indexes:
+            _indexes[task["type"]] = GuideIndex(task, *_frequency)
+        return _indexes[task["type"]]
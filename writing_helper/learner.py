@@ -0,0 +1,26 @@
+# 반·학생 식별: 교사가 나눠 준 링크의 ?class=3-1&student=20301 쿼리 파라미터를 사용하고,
+# 없으면 브라우저 세션마다 임시 ID를 부여. 반이 없으면 class_id는 None이라 반 예산을 적용하지 않음
+# (반을 모르는 학생들을 한 반으로 묶으면 서로의 예산을 나눠 쓰게 됨)
+import hmac
+import uuid
+
+import streamlit as st
+
+from writing_helper import settings
+
+
+def get_learner():
+    if "learner_session_id" not in st.session_state:
+        st.session_state.learner_session_id = uuid.uuid4().hex[:12]
+    class_id = st.query_params.get("class") or None
+    student_id = st.query_params.get("student")
+    if not student_id:
+        # 새로고침해도 같은 ID로 저장된 초안을 찾을 수 있도록 임시 ID를 주소에 남김
+        student_id = st.query_params["student"] = st.session_state.learner_session_id
+    return class_id, f"{class_id or 'default'}/{student_id}"
+
+
+def is_teacher():
+    # 교사 링크(?teacher=키)의 키가 설정된 WH_TEACHER_KEY와 같을 때만 True (키가 없으면 항상 False)
+    key = st.query_params.get("teacher", "")
+    return bool(settings.TEACHER_KEY) and hmac.compare_digest(key.encode(), settings.TEACHER_KEY.encode())
@@ -0,0 +1,26 @@
+# OpenAI 채팅 API 호출 도우미
+def chat_completion(client, messages, **params):
+    # 전체 답변이 완성될 때까지 기다렸다가 한 번에 반환
+    response = client.chat.completions.create(messages=messages, **params)
+    return response.choices[0].message.content
+
+
+def stream_chat_completion(client, messages, on_usage=None, **params):
+    # 토큰이 도착하는 대로 텍스트 조각을 하나씩 내보냄
+    # on_usage를 주면 마지막 조각에 담겨 오는 토큰 사용량(캐시된 토큰 수 포함)을 전달
+    if on_usage is not None:
+        params["stream_options"] = {"include_usage": True}
+    stream = client.chat.completions.create(messages=messages, stream=True, **params)
+    try:
+        for chunk in stream:
+            if on_usage is not None and getattr(chunk, "usage", None):
+                on_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    finally:
+        # 중간에 그만 읽더라도 HTTP 연결을 바로 돌려줌
+        stream.close()
+
@@ -0,0 +1,74 @@
+# 대화 기억: 최근 K턴은 그대로 보내고, 그 이전 대화는 점진적으로 갱신되는 요약으로 보냄
+# 세션마다 상태(dict)를 st.session_state에 보관하고, 새로 밀려난 대화만 요약에 더함
+import re
+
+from writing_helper import settings
+from writing_helper.tokens import count_tokens
+
+# 요약에 쓰는 몫 (나머지는 최근 대화)
+SUMMARY_SHARE = 0.3
+# 요약 한 줄에 담는 최대 토큰 수
+SUMMARY_LINE_TOKENS = 40
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def new_memory_state():
+    return {"summary_lines": [], "summarized": 0}
+
+
+def _first_sentence(text, limit):
+    sentence = _SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+    words = sentence.split()
+    while words and count_tokens(" ".join(words)) > limit:
+        words.pop()
+    short = " ".join(words)
+    return short if short == sentence else short + "…"
+
+
+def _usable(history):
+    # 장애 때 보여준 대체 답변은 모델에게 다시 보내지 않음
+    return [chat for chat in history if not chat.get("degraded")]
+
+
+def _fold(state, chats, summary_budget):
+    for chat in chats:
+        speaker = "학생" if chat["role"] == "user" else "도우미"
+        state["summary_lines"].append(f"- {speaker}: {_first_sentence(chat['message'], SUMMARY_LINE_TOKENS)}")
+    # 예산을 넘으면 가장 오래된 줄부터 버림
+    lines = state["summary_lines"]
+    while lines and sum(count_tokens(line) for line in lines) > summary_budget:
+        lines.pop(0)
+
+
+def build_history_messages(level, history, state, recent_turns=None):
+    # history: 페이지의 chat_history 목록 (이번 질문 제외)
+    # state: new_memory_state()로 만든 세션별 상태. 호출할 때마다 제자리에서 갱신됨
+    recent_turns = settings.MEMORY_RECENT_TURNS if recent_turns is None else recent_turns
+    budget = settings.MEMORY_TOKEN_BUDGETS.get(level, 500)
+    summary_budget = int(budget * SUMMARY_SHARE)
+    chats = _usable(history)
+
+    # 채팅 기록이 지워졌으면 요약도 처음부터 다시 시작
+    if state["summarized"] > len(chats):
+        state.update(new_memory_state())
+
+    # 최근 K턴(질문+답변 2K개)만 남기고 그 이전 것은 요약으로 넘김
+    keep_from = max(len(chats) - recent_turns * 2, state["summarized"])
+    recent = chats[keep_from:]
+    # 최근 대화가 예산을 넘으면 오래된 것부터 요약으로 넘김
+    recent_budget = budget - summary_budget
+    while recent and sum(count_tokens(chat["message"]) for chat in recent) > recent_budget:
+        recent = recent[1:]
+        keep_from += 1
+    _fold(state, chats[state["summarized"]:keep_from], summary_budget)
+    state["summarized"] = keep_from
+
+    messages = []
+    if state["summary_lines"]:
+        summary = "\n".join(state["summary_lines"])
+        messages.append({"role": "system", "content": f"이전 대화 요약:\n{summary}"})
+    for chat in recent:
+        role = "user" if chat["role"] == "user" else "assistant"
+        messages.append({"role": role, "content": chat["message"]})
+    return messages
@@ -0,0 +1,88 @@
+# 과제를 고르면 그 수준의 빠른 질문 답변을 백그라운드에서 미리 받아 응답 캐시를 데워 둠
+# 학생·수준마다 세대 번호를 두어 과제를 바꾸면 아직 시작하지 않은 이전 예약은 건너뜀.
+# 학생이 묻지 않은 호출이므로 반·학생 예산에서 빼지 않고 사용한 토큰을 따로 기록함
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from writing_helper import settings
+from writing_helper.cache import get_response_cache
+from writing_helper.scheduler import PRIORITY_PREFETCH, estimate_tokens, get_scheduler
+from writing_helper.tutor import generate_reply
+
+
+class Prefetcher:
+    def __init__(self, max_workers=2, headroom=0.5):
+        self.headroom = headroom
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.warmed = 0
+        self.cached = 0
+        self.throttled = 0
+        self.cancelled = 0
+        self.tokens = 0
+
+    def start(self, owner, client, level, requests):
+        # requests: 페이지가 만든 요청(messages, params, cache_key) 목록
+        with self._lock:
+            generation = self._generations.get(owner, 0) + 1
+            self._generations[owner] = generation
+            self.submitted += len(requests)
+        for request in requests:
+            self._executor.submit(self._run, owner, generation, client, level, request)
+
+    def cancel(self, owner):
+        with self._lock:
+            self._generations[owner] = self._generations.get(owner, 0) + 1
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _run(self, owner, generation, client, level, request):
+        with self._lock:
+            stale = self._generations.get(owner) != generation
+        if stale:
+            self._count("cancelled")
+            return
+        if get_response_cache().contains(request["cache_key"]):
+            self._count("cached")
+            return
+        # 분당 토큰 여유가 충분할 때만 호출해 실제 질문의 속도 한도를 빼앗지 않음
+        bucket = get_scheduler().token_bucket
+        tokens = estimate_tokens(request["messages"], request["params"].get("max_tokens", 0))
+        if bucket.available() < tokens + bucket.capacity * self.headroom:
+            self._count("throttled")
+            return
+        # 실패하면 기본 응답 대신 빈 문자열이 돌아오고 캐시에는 저장되지 않음
+        generate_reply(
+            client, level, request["messages"], request["params"], [""], request["cache_key"],
+            priority=PRIORITY_PREFETCH
+        )
+        with self._lock:
+            self.warmed += 1
+            self.tokens += tokens
+
+    def stats(self):
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "warmed": self.warmed,
+                "cached": self.cached,
+                "throttled": self.throttled,
+                "cancelled": self.cancelled,
+                "tokens": self.tokens,
+            }
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher():
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(settings.PREFETCH_WORKERS, settings.PREFETCH_HEADROOM)
+        return _prefetcher
@@ -0,0 +1,114 @@
+# AI에게 보내기 전의 가벼운 로컬 분류 단계
+# 빈 입력, 한 글자 입력, 인사, 감사 인사, 쓰기와 관계없는 잡담, 글 없이 첨삭을 부탁하는 경우는
+# 준비된 문장으로 바로 답하고, 실제 쓰기 질문만 모델로 보냄
+import random
+import re
+import threading
+from collections import Counter
+
+EMPTY = "empty"
+TOO_SHORT = "too_short"
+GREETING = "greeting"
+THANKS = "thanks"
+OFF_TOPIC = "off_topic"
+NEEDS_DRAFT = "needs_draft"
+
+CATEGORY_LABELS = {
+    EMPTY: "빈 입력",
+    TOO_SHORT: "너무 짧음",
+    GREETING: "인사",
+    THANKS: "감사 인사",
+    OFF_TOPIC: "과제와 무관",
+    NEEDS_DRAFT: "글 없이 첨삭 요청",
+}
+
+GREETING_PATTERN = re.compile(r"^(안녕(하세요|하십니까)?|하이|ㅎㅇ|반가워요?|hi|hello|hey|good (morning|afternoon))$")
+THANKS_PATTERN = re.compile(r"^(고마워요?|고맙습니다|감사(해요|합니다)?|ㄱㅅ|ㄳ|thanks?( you)?|thx|알겠(어요|습니다)|네|넵|ok(ay)?)$")
+# 자음·모음만 있거나 같은 글자만 반복되는 입력 (ㅋㅋㅋ, ㅠㅠ, aaaa, ???)
+NOISE_PATTERN = re.compile(r"^(?:[ㄱ-ㅎㅏ-ㅣ\s]+|(.)\1{2,}|[\W_]+)$")
+FEEDBACK_PATTERN = re.compile(r"피드백|첨삭|검사|평가|봐\s*줘|봐\s*주세요|고쳐|확인해|check my|review my|feedback")
+WRITING_PATTERN = re.compile(
+    r"글|문장|단어|어휘|문법|영어|영작|표현|문단|서론|본론|결론|주제|과제|뜻|철자|스펠|번역|시제|동사|명사|형용사|부사"
+    r"|아이디어|쓰|써|고쳐|피드백|[a-z]{2,}"
+)
+# 잡담으로 볼 말 (게임·점심·급식처럼 음식·취미 과제에 나오는 주제어는 넣지 않음)
+OFF_TOPIC_PATTERN = re.compile(r"배그|틱톡|아이돌|웹툰|심심|놀자|연예인|ㅋㅋ|ㅎㅎ")
+# 묻거나 영어로 옮겨 달라는 말이 있으면 잡담 말이 섞여 있어도 쓰기 질문으로 봄 ("점심 먹었다고 하려면?")
+QUESTION_PATTERN = re.compile(
+    r"\?|말해|말하|하려면|하면\s*(?:돼|되)|영어로|어떻게|뭐라고|알려|가르쳐|무슨|뭐(?:야|예요|에요)|인가요|나요|까요"
+)
+
+LOCAL_REPLIES = {
+    EMPTY: [
+        "질문을 입력해주세요! 문법, 단어, 아이디어 무엇이든 물어봐도 좋아요. 😊",
+    ],
+    TOO_SHORT: [
+        "조금 더 자세히 물어봐 주세요! 예: '과거형은 어떻게 써요?' ✏️",
+        "어떤 점이 궁금한지 한 문장으로 알려주면 더 잘 도와줄 수 있어요! 🙂",
+    ],
+    GREETING: [
+        "안녕하세요! 👋 오늘은 어떤 글을 써볼까요? 궁금한 점을 물어보세요!",
+        "반가워요! 😊 쓰기 과제를 하다가 막히는 부분이 있으면 언제든 물어보세요.",
+    ],
+    THANKS: [
+        "천만에요! 계속 멋지게 써 보세요! 💪",
+        "도움이 되었다니 기뻐요! 또 궁금한 점이 있으면 물어보세요. 😊",
+    ],
+    OFF_TOPIC: [
+        "재미있는 이야기네요! 😄 하지만 지금은 쓰기 과제에 집중해 볼까요? 글에 대해 궁금한 점을 물어보세요.",
+        "그 이야기는 쉬는 시간에 해요! 📝 지금 쓰고 있는 글에서 도움이 필요한 부분을 알려주세요.",
+    ],
+    NEEDS_DRAFT: [
+        "먼저 위의 작성 칸에 글을 써 주세요! ✍️ 글이 있어야 피드백을 줄 수 있어요.",
+        "아직 작성한 글이 없네요. 한두 문장이라도 먼저 써 보면 함께 고쳐 볼게요! 📝",
+    ],
+}
+
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def classify_message(message, draft=""):
+    # 로컬에서 처리할 종류를 반환 (모델에 보내야 하는 질문이면 None)
+    text = re.sub(r"\s+", " ", message.strip().lower()).rstrip(" ?!.~")
+    if not text:
+        return EMPTY
+    if GREETING_PATTERN.match(text):
+        return GREETING
+    if THANKS_PATTERN.match(text):
+        return THANKS
+    if NOISE_PATTERN.match(text):
+        return OFF_TOPIC
+    if len(text.replace(" ", "")) < 2:
+        return TOO_SHORT
+    if FEEDBACK_PATTERN.search(text) and not draft.strip():
+        return NEEDS_DRAFT
+    if OFF_TOPIC_PATTERN.search(text) and not QUESTION_PATTERN.search(message) \
+            and not WRITING_PATTERN.search(OFF_TOPIC_PATTERN.sub("", text)):
+        return OFF_TOPIC
+    return None
+
+
+def local_reply(message, draft=""):
+    # 로컬에서 답할 수 있으면 준비된 답변을, 아니면 None을 반환하고 건수를 기록
+    category = classify_message(message, draft)
+    with _counts_lock:
+        _counts["checked"] += 1
+        _counts[category or "passed"] += 1
+    if category is None:
+        return None
+    return random.choice(LOCAL_REPLIES[category])
+
+
+def prefilter_stats():
+    with _counts_lock:
+        counts = dict(_counts)
+    checked = counts.pop("checked", 0)
+    passed = counts.pop("passed", 0)
+    answered = checked - passed
+    return {
+        "checked": checked,
+        "answered": answered,
+        "saved_ratio": answered / checked if checked else 0.0,
+        "by_category": counts,
+    }
@@ -0,0 +1,159 @@
+# 가독성·복잡도 지표 (Flesch-Kincaid, Flesch 읽기 쉬움, TTR, MTLD, 문장 길이 분산 등)
+# 글 한 편도, 저장된 글 수천 편도 같은 코드로 계산: 모든 글의 단어를 하나의 배열로 펼친 뒤
+# 글 번호별로 NumPy bincount로 합산하므로 한 학기 분량도 몇 초 안에 처리됨
+#     python -m writing_helper.readability drafts.csv --column text --out scores.csv
+#     python -m writing_helper.readability --bench 5000
+import argparse
+import random
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from writing_helper.textstats import text_stats
+
+ENGLISH_WORD = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+MTLD_THRESHOLD = 0.72
+LONG_WORD_SYLLABLES = 3
+
+
+def count_syllables(words):
+    # 모음 덩어리 수에서 끝의 묵음 e를 빼는 근사치 (단어마다 최소 1음절)
+    words = pd.Series(words, dtype="string").str.lower()
+    counts = words.str.count(r"[aeiouy]+").to_numpy(dtype=np.int64)
+    silent_e = words.str.contains(r"[^aeiouy]e$") & ~words.str.contains(r"[^aeiouy]le$")
+    counts -= silent_e.to_numpy(dtype=bool)
+    return np.maximum(counts, 1)
+
+
+def _mtld_pass(words):
+    factors = 0.0
+    types = set()
+    tokens = 0
+    for word in words:
+        types.add(word)
+        tokens += 1
+        if len(types) / tokens <= MTLD_THRESHOLD:
+            factors += 1
+            types = set()
+            tokens = 0
+    if tokens:
+        factors += (1 - len(types) / tokens) / (1 - MTLD_THRESHOLD)
+    return len(words) / factors if factors else float(len(words))
+
+
+def mtld(words):
+    # 앞에서부터와 뒤에서부터 계산한 값의 평균 (McCarthy & Jarvis, 2010)
+    if not words:
+        return 0.0
+    return (_mtld_pass(words) + _mtld_pass(words[::-1])) / 2
+
+
+def batch_metrics(texts):
+    # 글마다 한 행인 DataFrame을 반환
+    texts = [text or "" for text in texts]
+    n = len(texts)
+    tokenized = [[word.lower() for word in ENGLISH_WORD.findall(text)] for text in texts]
+    lengths = np.fromiter((len(words) for words in tokenized), dtype=np.int64, count=n)
+    doc_ids = np.repeat(np.arange(n), lengths)
+    flat = [word for words in tokenized for word in words]
+
+    # 음절·글자 수는 서로 다른 단어마다 한 번만 계산해서 단어 번호로 펼침
+    codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object))
+    vocabulary = list(vocabulary)
+    syllables = count_syllables(vocabulary)[codes] if flat else np.zeros(0, dtype=np.int64)
+    letters = np.fromiter((len(word) for word in vocabulary), dtype=np.int64, count=len(vocabulary))[codes]
+    total_syllables = np.bincount(doc_ids, weights=syllables, minlength=n)
+    total_letters = np.bincount(doc_ids, weights=letters, minlength=n)
+    long_words = np.bincount(doc_ids, weights=syllables >= LONG_WORD_SYLLABLES, minlength=n)
+
+    # 서로 다른 단어 수: (글 번호, 단어 번호) 쌍의 중복을 없앤 뒤 글별로 셈
+    pairs = np.unique(doc_ids * max(len(vocabulary), 1) + codes)
+    types = np.bincount(pairs // max(len(vocabulary), 1), minlength=n)
+
+    sentence_lengths = [text_stats(text)["sentence_lengths"] for text in texts]
+    sentence_counts = np.fromiter((len(s) for s in sentence_lengths), dtype=np.int64, count=n)
+    sentence_ids = np.repeat(np.arange(n), sentence_counts)
+    flat_sentences = np.fromiter((length for s in sentence_lengths for length in s), dtype=np.float64)
+    sentence_sum = np.bincount(sentence_ids, weights=flat_sentences, minlength=n)
+    sentence_sq = np.bincount(sentence_ids, weights=flat_sentences ** 2, minlength=n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        words = lengths.astype(np.float64)
+        sentences = np.maximum(sentence_counts, 1)
+        words_per_sentence = np.where(lengths > 0, words / sentences, 0.0)
+        syllables_per_word = np.where(lengths > 0, total_syllables / words, 0.0)
+        sentence_mean = np.where(sentence_counts > 0, sentence_sum / sentences, 0.0)
+        sentence_var = np.where(sentence_counts > 0, sentence_sq / sentences - sentence_mean ** 2, 0.0)
+        frame = pd.DataFrame({
+            "words": lengths,
+            "sentences": sentence_counts,
+            "syllables": total_syllables.astype(np.int64),
+            "fk_grade": np.where(lengths > 0, 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 0.0),
+            "reading_ease": np.where(lengths > 0, 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 0.0),
+            "ttr": np.where(lengths > 0, types / words, 0.0),
+            "mtld": [mtld(words) for words in tokenized],
+            "words_per_sentence": words_per_sentence,
+            "sentence_length_var": np.maximum(sentence_var, 0.0),
+            "avg_word_length": np.where(lengths > 0, total_letters / words, 0.0),
+            "long_word_ratio": np.where(lengths > 0, long_words / words, 0.0),
+        })
+    return frame
+
+
+def draft_metrics(text):
+    return batch_metrics([text]).iloc[0].to_dict()
+
+
+def _synthetic_drafts(count, seed=0):
+    # 과제 목록의 어휘·표현으로 만든 벤치마크용 가짜 글
+    from writing_helper.tasks import LEVEL_TASKS
+
+    vocabulary = []
+    for tasks in LEVEL_TASKS.values():
+        for task in tasks.values():
+            vocabulary.extend(task.get("vocabulary", []))
+    vocabulary.extend(["the", "a", "is", "was", "and", "because", "i", "my", "we", "it", "very", "think"])
+    rng = random.Random(seed)
+    drafts = []
+    for _ in range(count):
+        paragraphs = []
+        for _ in range(rng.randint(2, 5)):
+            sentences = [
+                " ".join(rng.choice(vocabulary) for _ in range(rng.randint(5, 20))).capitalize() + rng.choice(".!?")
+                for _ in range(rng.randint(3, 7))
+            ]
+            paragraphs.append(" ".join(sentences))
+        drafts.append("\n\n".join(paragraphs))
+    return drafts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 글의 가독성·복잡도 지표를 한 번에 계산")
+    parser.add_argument("csv", nargs="?", help="글이 담긴 CSV 파일")
+    parser.add_argument("--column", default="text", help="글 내용 열 이름")
+    parser.add_argument("--out", help="결과 CSV 경로 (없으면 요약만 출력)")
+    parser.add_argument("--bench", type=int, metavar="N", help="가짜 글 N편으로 처리 속도 측정")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        drafts = _synthetic_drafts(args.bench)
+        started = time.perf_counter()
+        frame = batch_metrics(drafts)
+        elapsed = time.perf_counter() - started
+        print(f"{len(drafts)}편, {int(frame['words'].sum())}단어: {elapsed:.2f}초 "
+              f"({len(drafts) / elapsed:.0f}편/초)")
+        return
+    if not args.csv:
+        parser.error("CSV 파일 또는 --bench가 필요합니다")
+    drafts = pd.read_csv(args.csv)
+    frame = batch_metrics(drafts[args.column].fillna("").astype(str).tolist())
+    result = pd.concat([drafts.reset_index(drop=True), frame], axis=1)
+    if args.out:
+        result.to_csv(args.out, index=False)
+    print(frame.describe().round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# OpenAI 호출 장애 대응: 마감 시간, 지터가 있는 지수 백오프 재시도, 지연 시 헤징, 회로 차단기
+import queue
+import threading
+import time
+from collections import deque
+
+import openai
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, stop_after_delay, wait_random_exponential
+
+from writing_helper import settings
+from writing_helper.llm import stream_chat_completion
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def is_retryable(exc):
+    # 일시적인 오류(시간 초과, 연결 끊김, 속도 제한, 서버 오류)만 재시도
+    if isinstance(exc, (DeadlineExceeded, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+class LatencyTracker:
+    # 최근 첫 토큰 도착 시간으로 p95를 계산. 표본이 적으면 헤징하지 않음
+    def __init__(self, window=200, min_samples=20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self):
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[int(len(samples) * 0.95)]
+
+
+class CircuitBreaker:
+    # 연속 실패가 기준을 넘으면 일정 시간 호출을 막고(open), 이후 한 번 시험 호출(half-open)
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def is_open(self):
+        # 지금 호출하면 바로 거절되는 상태인지 확인 (시험 호출 기회는 소모하지 않음)
+        with self._lock:
+            if self.state == "open":
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return self.state == "half_open" and self._trial_running
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class ResiliencePolicy:
+    def __init__(self, deadline, breaker, max_attempts=3):
+        self.deadline = deadline
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def count(self, counter):
+        # 여러 세션의 스레드가 같은 정책을 공유하므로 retries·hedges·failures는 잠금 안에서 늘림
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        with self._lock:
+            counters = {"retries": self.retries, "hedges": self.hedges, "failures": self.failures}
+        return {
+            "deadline": self.deadline,
+            "p95_first_token": self.latency.p95(),
+            **counters,
+            "breaker": self.breaker.state,
+        }
+
+
+def _launch(client, messages, params, end, events, attempt_id, on_usage=None):
+    cancelled = threading.Event()
+
+    def target():
+        try:
+            timeout = max(end - time.monotonic(), 0.1)
+            stream = stream_chat_completion(
+                client.with_options(timeout=timeout, max_retries=0), messages, on_usage, **params
+            )
+            for chunk in stream:
+                if cancelled.is_set():
+                    stream.close()
+                    return
+                events.put((attempt_id, "chunk", chunk))
+            events.put((attempt_id, "end", None))
+        except Exception as e:
+            events.put((attempt_id, "error", e))
+
+    threading.Thread(target=target, daemon=True).start()
+    return cancelled
+
+
+def _first_chunk(client, messages, params, policy, end, can_hedge, on_usage):
+    # 첫 조각이 p95 안에 오지 않으면 두 번째 요청을 보내고, 먼저 응답한 쪽을 사용
+    events = queue.Queue()
+    started = time.monotonic()
+    # 재시도가 마감 뒤에 시작되면 이미 늦은 유료 호출을 보내지 않음
+    if started >= end:
+        raise DeadlineExceeded()
+    cancels = [_launch(client, messages, params, end, events, 0, on_usage)]
+    hedge_after = policy.latency.p95()
+    pending = 1
+    last_error = None
+    while True:
+        now = time.monotonic()
+        if now >= end:
+            for cancelled in cancels:
+                cancelled.set()
+            raise DeadlineExceeded()
+        wait = end - now
+        if hedge_after is not None:
+            wait = min(wait, max(started + hedge_after - now, 0.01))
+        try:
+            attempt_id, kind, value = events.get(timeout=wait)
+        except queue.Empty:
+            if hedge_after is not None and time.monotonic() - started >= hedge_after:
+                if can_hedge():
+                    policy.count("hedges")
+                    pending += 1
+                    cancels.append(_launch(client, messages, params, end, events, len(cancels), on_usage))
+                hedge_after = None
+            continue
+        if kind == "error":
+            pending -= 1
+            last_error = value
+            if pending == 0:
+                raise last_error
+            continue
+        policy.latency.observe(time.monotonic() - started)
+        for i, cancelled in enumerate(cancels):
+            if i != attempt_id:
+                cancelled.set()
+        return attempt_id, kind, value, events, cancels[attempt_id]
+
+
+def resilient_stream(client, messages, params, policy, can_hedge=lambda: False, on_usage=None, deadline_at=None):
+    # 마감 시간은 첫 조각이 도착할 때까지와, 이후 조각 사이의 최대 대기 시간에 적용.
+    # deadline_at(time.monotonic 기준)을 주면 요청을 제출한 때부터 잰 마감을 씀 (큐에서 기다린 시간 포함)
+    end = deadline_at if deadline_at is not None else time.monotonic() + policy.deadline
+    if time.monotonic() >= end:
+        raise DeadlineExceeded()
+    breaker = policy.breaker
+    if not breaker.allow():
+        raise CircuitOpen()
+
+    def before_sleep(retry_state):
+        policy.count("retries")
+
+    try:
+        for attempt in Retrying(
+            stop=stop_after_attempt(policy.max_attempts) | stop_after_delay(max(end - time.monotonic(), 0)),
+            wait=wait_random_exponential(multiplier=0.5, max=4),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=before_sleep,
+            reraise=True
+        ):
+            with attempt:
+                winner, kind, value, events, cancelled = _first_chunk(
+                    client, messages, params, policy, end, can_hedge, on_usage
+                )
+    except Exception as e:
+        policy.count("failures")
+        _record_outcome(breaker, e)
+        raise
+
+    try:
+        while kind == "chunk":
+            yield value
+            while True:
+                try:
+                    attempt_id, kind, value = events.get(timeout=policy.deadline)
+                except queue.Empty:
+                    raise DeadlineExceeded()
+                if attempt_id == winner:
+                    break
+        if kind == "error":
+            raise value
+    except GeneratorExit:
+        cancelled.set()
+        raise
+    except Exception as e:
+        cancelled.set()
+        policy.count("failures")
+        _record_outcome(breaker, e)
+        raise
+    breaker.record_success()
+
+
+def _record_outcome(breaker, exc):
+    # 잘못된 요청(400 등)은 서버가 정상 응답한 것이므로 장애로 세지 않음
+    if is_retryable(exc):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+_breakers = {}
+_policies = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name):
+    # 같은 모델을 쓰는 요청끼리 회로 차단기를 공유
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_TIMEOUT)
+        return _breakers[name]
+
+
+def get_policy(level, model):
+    breaker = get_breaker(model)
+    with _registry_lock:
+        key = (level, model)
+        if key not in _policies:
+            _policies[key] = ResiliencePolicy(
+                settings.LEVEL_DEADLINES.get(level, 15), breaker, settings.LLM_MAX_ATTEMPTS
+            )
+        return _policies[key]
+
+
+def policy_stats():
+    with _registry_lock:
+        return {key: policy.stats() for key, policy in _policies.items()}
@@ -0,0 +1,269 @@
+# 고급 문장 구조와 수사 기법 찾기
+# 과제의 complex_structures는 어휘 색인(Aho-Corasick)으로, 직유·수사 의문문·병렬 구조 같은 수사 기법은
+# 모듈을 읽을 때 한 번 컴파일한 정규식과 문장 단위 규칙으로 찾아 글 속 위치(span)와 함께 돌려줌.
+# 모델 호출이 없어 고급 페이지가 다시 그려질 때마다 실행할 수 있음
+#     python -m writing_helper.rhetoric --bench 200
+import argparse
+import random
+import re
+import threading
+import time
+
+from writing_helper.context import split_paragraphs
+from writing_helper.creativity import COMMON_WORDS
+from writing_helper.tasks import ADVANCED_TASKS
+from writing_helper.textstats import split_sentences
+from writing_helper.vocab_index import TOKEN_PATTERN, get_vocabulary_index
+
+# 수사 기법 이름은 ADVANCED_TOOLS["Rhetorical Devices"]의 도구 이름과 같게 둠
+SIMILE = "Metaphor and Simile"
+ALLITERATION = "Alliteration and Assonance"
+QUESTION = "Rhetorical Questions"
+PARALLELISM = "Parallelism"
+IRONY = "Irony and Satire"
+HYPERBOLE = "Hyperbole"
+PERSONIFICATION = "Personification"
+DEVICES = (SIMILE, ALLITERATION, QUESTION, PARALLELISM, IRONY, HYPERBOLE, PERSONIFICATION)
+DEVICE_LABELS = {
+    SIMILE: "비유 (직유·은유)",
+    ALLITERATION: "두운",
+    QUESTION: "수사 의문문",
+    PARALLELISM: "병렬 구조",
+    IRONY: "반어",
+    HYPERBOLE: "과장",
+    PERSONIFICATION: "의인화",
+}
+
+# 흔한 은유 명사: "Social media is a double-edged sword"
+METAPHOR_NOUNS = (
+    "double-edged sword|wake-up call|ticking time bomb|melting pot|roller coaster|tip of the iceberg|"
+    "journey|battle|war|bridge|mirror|weapon|prison|storm|lifeline|engine|key|window|cage|gift|maze|puzzle"
+)
+NATURE_NOUNS = (
+    "sun|moon|wind|sky|sea|ocean|earth|planet|nature|time|history|technology|city|society|economy|"
+    "trees?|flowers?|stars?|rain|waves?|silence|data|the internet|social media"
+)
+HUMAN_VERBS = (
+    "smiles?|smiled|whispers?|whispered|cries|cried|weeps?|wept|dances?|danced|sings?|sang|screams?|screamed|"
+    "begs?|begged|sleeps?|slept|breathes?|breathed|laughs?|laughed|groans?|groaned|forgives?|forgave|"
+    "remembers?|remembered|watches|watched|waits? for no one|knocks?|knocked|speaks?|spoke|judges?|judged"
+)
+
+# 정규식으로 찾는 기법: (기법, 패턴)
+PATTERNS = [
+    # 직유의 like는 연결·감각 동사 뒤에서만 봄 ("I really like the movie"의 like는 동사)
+    (SIMILE, r"\b(?:is|are|was|were|be|been|seems?|seemed|looks?|looked|feels?|felt|sounds?|sounded|"
+             r"smells?|smelled|tastes?|tasted|acts?|acted|moves?|moved|spreads?|spread)"
+             r"(?:\s+\w+ly)?\s+like\s+(?:a|an|the)\s+[\w-]+"),
+    (SIMILE, r"\bas\s+\w+\s+as\s+(?:a|an|the)\s+[\w-]+"),
+    (SIMILE, r"\b(?:as if|as though)\b[^.!?]*"),
+    (SIMILE, rf"\b(?:is|are|was|were|becomes?|became)\s+(?:a|an|the|our|my)\s+(?:\w+\s+)?(?:{METAPHOR_NOUNS})\b"),
+    (HYPERBOLE, r"\b(?:a )?(?:million|billion|thousand|hundred)s? (?:of )?times\b"),
+    (HYPERBOLE, r"\b(?:tons|oceans|mountains) of\b|\bnever ever\b|\bliterally\b|\bto death\b|\bend of the world\b"),
+    (HYPERBOLE, r"\bthe (?:best|worst|greatest|biggest) \w+ (?:in|of) (?:the world|history|all time)\b"),
+    (HYPERBOLE, r"\b(?:everyone|everybody|nobody) (?:on|in) the (?:planet|world|universe)\b"),
+    (PERSONIFICATION, rf"\b(?:the )?(?:{NATURE_NOUNS})\s+(?:{HUMAN_VERBS})\b"),
+    (IRONY, r"\b(?:ironically|paradoxically)\b|\bhow (?:convenient|ironic)\b|\bwhat a (?:surprise|great idea)\b"),
+    (IRONY, r"\boh,? (?:great|wonderful|perfect)\b"),
+    (PARALLELISM, r"\bnot only\b[^.!?]{1,80}?\bbut also\b"),
+    (PARALLELISM, r"\b(?:neither\b[^.!?]{1,60}?\bnor|either\b[^.!?]{1,60}?\bor)\b"),
+]
+COMPILED_PATTERNS = [(device, re.compile(pattern, re.IGNORECASE)) for device, pattern in PATTERNS]
+
+# 같은 꼴의 세 낱말 나열: "reducing, reusing, and recycling", "quickly, quietly and carefully"
+TRICOLON = re.compile(r"\b(\w+(?:ing|ly|tion|ment|ness))\s*,\s*(\w+)\s*,?\s+and\s+(\w+)\b", re.IGNORECASE)
+SUFFIXES = ("ing", "ly", "tion", "ment", "ness")
+CLAUSE_BREAK = re.compile(r"[,;:]\s*")
+LEADING_CONJUNCTION = re.compile(r"^(?:and|but|or)\s+")
+QUOTED = re.compile(r"[\"“][^\"”]*[\"”]")
+# 반복되어도 병렬 구조로 보지 않는 첫 낱말
+WEAK_OPENERS = {"the", "a", "an", "it", "this", "that", "and", "but", "so", "in", "of", "to"}
+# 두운: 기능어 하나 이하를 사이에 두고 이어진 내용어 세 개 이상이 같은 소리로 시작
+ALLITERATION_GAP = 2
+ALLITERATION_MIN = 3
+DIGRAPHS = ("ch", "sh", "th", "ph", "wh")
+
+
+def _device(device, start, end, text):
+    return {"device": device, "label": DEVICE_LABELS[device], "start": start, "end": end,
+            "text": text[start:end]}
+
+
+def _onset(word):
+    # 두운 비교용 첫소리 (ph → f, 딱딱한 c → k)
+    word = word.lower()
+    if word.startswith(DIGRAPHS):
+        return "f" if word.startswith("ph") else word[:2]
+    return "k" if word[0] == "c" and word[1:2] not in ("e", "i", "y") else word[0]
+
+
+def _tricolon(text):
+    found = []
+    for match in TRICOLON.finditer(text):
+        words = [match.group(i).lower() for i in (1, 2, 3)]
+        suffix = next(s for s in SUFFIXES if words[0].endswith(s))
+        if all(word.endswith(suffix) for word in words):
+            found.append(_device(PARALLELISM, match.start(), match.end(), text))
+    return found
+
+
+def _sentence_devices(text):
+    # 문장마다: 수사 의문문, 한 문장 안의 반복 머리말 ("I came, I saw, I conquered"), 두운,
+    # 이어진 문장들의 반복 머리말 ("We must act. We must listen.")
+    found = []
+    offset = 0
+    for paragraph in split_paragraphs(text):
+        previous = None
+        for sentence in split_sentences(paragraph):
+            offset = text.find(sentence, offset)
+            end = offset + len(sentence)
+            unquoted = QUOTED.sub("", sentence).rstrip("\"'”’) ")
+            if unquoted.endswith("?"):
+                found.append(_device(QUESTION, offset, end, text))
+            openers = [LEADING_CONJUNCTION.sub("", clause.strip().lower())
+                       for clause in CLAUSE_BREAK.split(sentence)]
+            openers = [m.group() for m in map(TOKEN_PATTERN.match, openers) if m]
+            for opener in set(openers) - WEAK_OPENERS:
+                if openers.count(opener) >= 3:
+                    found.append(_device(PARALLELISM, offset, end, text))
+                    break
+            words = TOKEN_PATTERN.findall(sentence)
+            head = tuple(word.lower() for word in words[:2])
+            if previous and len(head) == 2 and head == previous[0] and head[0] not in WEAK_OPENERS:
+                found.append(_device(PARALLELISM, previous[1], end, text))
+            previous = (head, offset)
+            found.extend(_alliteration(text, sentence, offset))
+            offset = end
+    return found
+
+
+def _alliteration(text, sentence, offset):
+    content = [(position, m.start(), m.end(), _onset(m.group()))
+               for position, m in enumerate(TOKEN_PATTERN.finditer(sentence))
+               if len(m.group()) >= 3 and m.group().lower() not in COMMON_WORDS]
+    found = []
+    i = 0
+    while i < len(content):
+        j = i
+        while j + 1 < len(content) and content[j + 1][3] == content[i][3] and \
+                content[j + 1][0] - content[j][0] <= ALLITERATION_GAP:
+            j += 1
+        if j - i + 1 >= ALLITERATION_MIN:
+            found.append(_device(ALLITERATION, offset + content[i][1], offset + content[j][2], text))
+        i = j + 1
+    return found
+
+
+class RhetoricDetector:
+    def __init__(self, task):
+        # 문장 구조는 어휘 색인에 이미 컴파일된 complex_structures 표현을 그대로 씀
+        self.structures = set(task.get("complex_structures", []))
+        self._index = get_vocabulary_index("advanced", task)
+
+    def detect(self, text):
+        # {"structures": [{"target", "used", "positions"}], "devices": [{"device", "label", "start", "end", "text"}],
+        #  "counts": {기법: 개수}}
+        items = self._index.scan(text)["items"]
+        structures = [{"target": item["target"], "used": item["used"], "positions": item["positions"]}
+                      for item in items if item["target"] in self.structures]
+        devices = _sentence_devices(text) + _tricolon(text)
+        for device, pattern in COMPILED_PATTERNS:
+            devices.extend(_device(device, m.start(), m.end(), text) for m in pattern.finditer(text))
+        # 같은 기법이 겹쳐 잡히면 앞에서 시작하는 것 하나만 남김
+        devices.sort(key=lambda d: (d["start"], -d["end"]))
+        kept = []
+        last_end = {}
+        for device in devices:
+            if device["start"] >= last_end.get(device["device"], -1):
+                kept.append(device)
+                last_end[device["device"]] = device["end"]
+        counts = {device: 0 for device in DEVICES}
+        for device in kept:
+            counts[device["device"]] += 1
+        return {"structures": structures, "devices": kept, "counts": counts}
+
+
+_detectors = {}
+_detectors_lock = threading.Lock()
+
+
+def get_rhetoric_detector(task):
+    # 과제별 탐지기는 처음 요청될 때 한 번만 만들어 모든 세션이 공유
+    with _detectors_lock:
+        if task["type"] not in _detectors:
+            _detectors[task["type"]] = RhetoricDetector(task)
+        return _detectors[task["type"]]
+
+
+# 벤치마크용 문장: 기법이 없는 평범한 문장과 기법이 들어간 문장을 섞어 500단어 글을 만듦
+PLAIN_SENTENCES = [
+    "Many students spend several hours on their phones every day.",
+    "Schools have started to discuss how technology should be used in class.",
+    "Some parents worry that their children do not sleep enough.",
+    "Teachers report that attention spans seem shorter than before.",
+    "The government introduced a new policy on screen time last year.",
+    "Researchers collected data from more than two thousand families.",
+    "Online classes became common during the pandemic.",
+    "Communities need clear guidelines that everyone can follow.",
+]
+DEVICE_SENTENCES = [
+    "Social media is a double-edged sword for young people.",
+    "Information spreads like a wildfire across the internet.",
+    "How can we call ourselves responsible when we ignore the problem?",
+    "We must listen, we must learn, and we must act.",
+    "Reducing, reusing, and recycling are simple habits.",
+    "Ironically, the tools that connect us also isolate us.",
+    "I have told my brother a million times to turn off his phone.",
+    "Technology whispers to us every minute of the day.",
+    "Despite the fact that screens are useful, it is evident that balance matters.",
+    "While some argue that phones help learning, others contend that they distract students.",
+]
+
+
+def _essay(rng, words=500):
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = rng.choice(DEVICE_SENTENCES if rng.random() < 0.3 else PLAIN_SENTENCES)
+        sentences.append(sentence)
+        count += len(sentence.split())
+        if rng.random() < 0.15:
+            sentences.append("\n\n")
+    return " ".join(sentences).replace(" \n\n ", "\n\n")
+
+
+def benchmark(count, words=500, seed=0):
+    # 무작위로 만든 글 count편에서 글 한 편당 탐지 시간과 찾은 기법 수를 측정
+    task = next(iter(ADVANCED_TASKS.values()))
+    started = time.perf_counter()
+    detector = get_rhetoric_detector(task)
+    build_ms = (time.perf_counter() - started) * 1000
+    rng = random.Random(seed)
+    essays = [_essay(rng, words) for _ in range(count)]
+    timings = []
+    found = 0
+    for essay in essays:
+        started = time.perf_counter()
+        result = detector.detect(essay)
+        timings.append((time.perf_counter() - started) * 1000)
+        found += len(result["devices"])
+    timings.sort()
+    return {"build_ms": build_ms, "essays": count, "devices_per_essay": found / max(count, 1),
+            "median_ms": timings[len(timings) // 2], "p95_ms": timings[int(len(timings) * 0.95)]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문장 구조·수사 기법 탐지 속도 측정")
+    parser.add_argument("--bench", type=int, metavar="N", help="500단어 글 N편으로 속도 확인")
+    parser.add_argument("--words", type=int, default=500, help="벤치마크 글 한 편의 단어 수")
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.error("--bench가 필요합니다")
+    result = benchmark(args.bench, args.words)
+    print(f"탐지기 만들기 {result['build_ms']:.2f} ms, 글 {result['essays']}편 ({args.words}단어): "
+          f"글당 기법 {result['devices_per_essay']:.1f}개, "
+          f"중앙값 {result['median_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
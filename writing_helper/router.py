@@ -0,0 +1,93 @@
+# 모델 등급 라우팅
+# 수준과 요청 종류(빠른 질문 / 일반 질문 / 긴 글 분석)에 따라 설정 파일에 적힌 등급 순서대로 모델을 고르고,
+# 앞 등급의 회로 차단기가 열렸거나 첫 토큰 p95가 마감 시간에 가까우면 다음 등급으로 내려감
+import json
+import threading
+from collections import Counter
+
+from writing_helper import settings
+from writing_helper.prompts import LEVEL_PARAMS
+from writing_helper.resilience import get_policy
+from writing_helper.tokens import count_tokens
+
+REQUEST_QUICK = "quick"
+REQUEST_CHAT = "chat"
+REQUEST_LONG_DRAFT = "long_draft"
+
+
+class ModelRouter:
+    def __init__(self, config):
+        self.tiers = config["tiers"]
+        self.routes = config["routes"]
+        self.long_draft_tokens = config.get("long_draft_tokens", 300)
+        self.slow_p95_ratio = config.get("slow_p95_ratio", 0.8)
+        self._tier_of = {tier["model"]: name for name, tier in self.tiers.items()}
+        self._routed = Counter()
+        self._downgrades = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or settings.MODEL_ROUTES_PATH, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def classify(self, quick, context=""):
+        if quick:
+            return REQUEST_QUICK
+        if context and count_tokens(context) >= self.long_draft_tokens:
+            return REQUEST_LONG_DRAFT
+        return REQUEST_CHAT
+
+    def _unhealthy(self, level, model):
+        # 회로 차단기가 열렸으면 "failing", 최근 첫 토큰 p95가 마감 시간에 가까우면 "slow"
+        policy = get_policy(level, model)
+        if policy.breaker.is_open():
+            return "failing"
+        p95 = policy.latency.p95()
+        if p95 is not None and p95 > policy.deadline * self.slow_p95_ratio:
+            return "slow"
+        return None
+
+    def choose(self, level, request_class, record=True):
+        # 정상인 첫 등급을 고르고, 모두 비정상이면 마지막 등급을 사용 (호출 여부는 튜터 파이프라인이 판단)
+        # 미리 받기처럼 학생이 묻지 않은 요청은 record=False로 라우팅 통계에 넣지 않음
+        chain = self.routes[level][request_class]
+        for tier in chain[:-1]:
+            reason = self._unhealthy(level, self.tiers[tier]["model"])
+            if reason is None:
+                break
+            if record:
+                with self._lock:
+                    self._downgrades[(level, tier, reason)] += 1
+        else:
+            tier = chain[-1]
+        if record:
+            with self._lock:
+                self._routed[(level, request_class, tier)] += 1
+        return tier
+
+    def params_for(self, level, quick, context="", record=True):
+        # 수준별 기본 설정(temperature, max_tokens)에 선택된 등급의 모델을 덮어씀
+        tier = self.choose(level, self.classify(quick, context), record)
+        params = dict(LEVEL_PARAMS[level])
+        params.update(self.tiers[tier])
+        return params
+
+    def tier_of(self, model):
+        return self._tier_of.get(model)
+
+    def stats(self):
+        with self._lock:
+            return {"routed": dict(self._routed), "downgrades": dict(self._downgrades)}
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter.load()
+        return _router
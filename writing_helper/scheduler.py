@@ -0,0 +1,177 @@
+# 공유 OpenAI 클라이언트 앞단의 전역 스케줄러
+# 제한된 작업자 풀, 토큰 버킷 속도 제한, 반·학생별 토큰 예산, 우선순위 큐를 제공
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from writing_helper import settings
+from writing_helper.tokens import count_message_tokens
+
+# 숫자가 작을수록 먼저 처리 (직접 입력한 질문 → 빠른 질문 버튼 → 미리 받아 두기)
+PRIORITY_FREE_FORM = 0
+PRIORITY_QUICK = 1
+PRIORITY_PREFETCH = 2
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def estimate_tokens(messages, max_tokens=0):
+    # 입력 토큰 수에 최대 출력 토큰 수를 더해 예산을 잡음
+    return count_message_tokens(messages) + max_tokens
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount):
+        # 한 번에 용량보다 큰 요청은 용량만큼만 기다림
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(min(wait, 1.0))
+
+    def try_acquire(self, amount):
+        # 기다리지 않고 여유가 있을 때만 차감 (헤징처럼 선택적인 호출용)
+        with self._lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return True
+            return False
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+
+class TokenBudget:
+    # 고정 길이 구간마다 초기화되는 키별 토큰 예산
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._used = {}
+        self._lock = threading.Lock()
+
+    def _current(self, key, now):
+        start, used = self._used.get(key, (now, 0))
+        if now - start >= self.window:
+            start, used = now, 0
+        return start, used
+
+    def remaining(self, key):
+        with self._lock:
+            _, used = self._current(key, time.monotonic())
+            return self.limit - used
+
+    def charge(self, key, tokens):
+        with self._lock:
+            now = time.monotonic()
+            start, used = self._current(key, now)
+            self._used[key] = (start, used + tokens)
+
+
+class LLMScheduler:
+    def __init__(self, max_workers=8, tokens_per_minute=60000, requests_per_minute=500,
+                 class_budget=200000, student_budget=20000, budget_window=3600):
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.class_budget = TokenBudget(class_budget, budget_window)
+        self.student_budget = TokenBudget(student_budget, budget_window)
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._waits = deque(maxlen=500)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        for i in range(max_workers):
+            threading.Thread(target=self._worker, name=f"llm-worker-{i}", daemon=True).start()
+
+    def check_budget(self, tokens, class_id=None, student_id=None):
+        # 예산을 넘는 요청은 큐에 넣기 전에 거절
+        if (class_id and self.class_budget.remaining(class_id) < tokens) or \
+                (student_id and self.student_budget.remaining(student_id) < tokens):
+            with self._cond:
+                self.rejected += 1
+            raise BudgetExceeded()
+
+    def submit(self, job, priority=PRIORITY_QUICK, tokens=0, class_id=None, student_id=None):
+        with self._cond:
+            item = (priority, next(self._seq), time.monotonic(), job, tokens, class_id, student_id)
+            heapq.heappush(self._queue, item)
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, enqueued, job, tokens, class_id, student_id = heapq.heappop(self._queue)
+                self.running += 1
+            try:
+                self.request_bucket.acquire(1)
+                self.token_bucket.acquire(tokens)
+                if class_id:
+                    self.class_budget.charge(class_id, tokens)
+                if student_id:
+                    self.student_budget.charge(student_id, tokens)
+                with self._cond:
+                    self._waits.append(time.monotonic() - enqueued)
+                job()
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self.running -= 1
+                    self.completed += 1
+
+    def stats(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                "queue_depth": len(self._queue),
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(
+                max_workers=settings.LLM_MAX_WORKERS,
+                tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+                requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+                class_budget=settings.CLASS_TOKEN_BUDGET,
+                student_budget=settings.STUDENT_TOKEN_BUDGET,
+                budget_window=settings.BUDGET_WINDOW
+            )
+        return _scheduler
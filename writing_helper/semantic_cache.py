@@ -0,0 +1,165 @@
+# 비슷한 질문을 같은 질문으로 취급하는 의미 기반 캐시
+# 질문을 글자 n-gram 해싱 벡터로 바꿔(네트워크 없이 NumPy만 사용) 크기가 정해진 행렬에 보관하고,
+# 같은 수준·과제·글 내용·이전 대화 안에서 코사인 유사도가 기준 이상인 이전 질문의 답변을 재사용
+# 예: "과거형 어떻게 써요?" ≈ "과거형 쓰는 법"
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from writing_helper import settings
+
+# 질문의 핵심 내용과 관계없는 한국어 질문 어미는 벡터에서 제외
+# (영어 낱말은 "can", "do", "is"처럼 그 자체가 질문 대상일 수 있으므로 모두 남김)
+FILLER_WORDS = {
+    "어떻게", "어떡해", "법", "방법", "알려", "주세요", "알려주세요", "알려줘", "가르쳐", "궁금해요", "궁금합니다",
+    "뭐예요", "뭐에요", "무엇인가요", "뭔가요", "써요", "쓰나요", "쓰는", "쓰면", "돼요", "해요", "하나요", "하는", "좀",
+}
+NGRAM_SIZES = (2, 3)
+ENGLISH_TERM = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+def _normalize(question):
+    words = re.sub(r"[^\w\s]", " ", question.lower()).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def english_terms(question):
+    # 질문에 나온 영어 낱말 집합의 해시: "because"와 "because of"처럼 글자는 비슷해도 묻는 말이 다르면 다른 질문
+    terms = sorted(set(ENGLISH_TERM.findall(_normalize(question))))
+    return zlib.crc32(" ".join(terms).encode("utf-8"))
+
+
+def embed(question, dim=2048):
+    # 글자 2·3-gram을 crc32로 해싱해 부호를 붙여 더한 뒤 길이 1로 정규화 (내용이 없으면 None)
+    text = _normalize(question)
+    if not text:
+        return None
+    vector = np.zeros(dim, dtype=np.float32)
+    padded = f" {text} "
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            h = zlib.crc32(padded[i:i + n].encode("utf-8"))
+            vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return None
+    return vector / norm
+
+
+class SemanticCache:
+    def __init__(self, maxsize=1024, threshold=0.75, ttl=3600, dim=2048):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dim = dim
+        self._vectors = np.zeros((maxsize, dim), dtype=np.float32)
+        self._partitions = np.full(maxsize, -1, dtype=np.int64)
+        self._terms = np.zeros(maxsize, dtype=np.int64)
+        self._expires = np.zeros(maxsize, dtype=np.float64)
+        self._last_used = np.zeros(maxsize, dtype=np.int64)
+        self._answers = [None] * maxsize
+        self._partition_ids = {}
+        self._next_partition = 0
+        self._clock = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _split_key(key):
+        # 응답 캐시 키 (수준, 과제 유형, 정규화된 질문, 글 내용 해시, 대화 해시)에서 질문과 나머지를 분리
+        # 후속 질문("예시를 하나 더")의 답은 앞 대화에 따라 다르므로 대화 해시도 묶음 기준에 넣음
+        # (대화가 없는 첫 질문끼리만 세션을 넘어 재사용됨)
+        level, task_type, question, context, conversation = key
+        return (level, task_type, context, conversation), question
+
+    def get(self, key):
+        partition, question = self._split_key(key)
+        vector = embed(question, self.dim)
+        with self._lock:
+            pid = self._partition_ids.get(partition)
+            if vector is None or pid is None:
+                self.misses += 1
+                return None
+            n = self._size
+            scores = self._vectors[:n] @ vector
+            valid = (self._partitions[:n] == pid) & (self._terms[:n] == english_terms(question)) & \
+                (self._expires[:n] >= time.time())
+            scores = np.where(valid, scores, -1.0)
+            best = int(np.argmax(scores)) if n else 0
+            if not n or scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            self.hits += 1
+            return self._answers[best]
+
+    def set(self, key, value):
+        partition, question = self._split_key(key)
+        vector = embed(question, self.dim)
+        if vector is None:
+            return
+        with self._lock:
+            pid = self._partition_ids.get(partition)
+            if pid is None:
+                pid = self._partition_ids[partition] = self._next_partition
+                self._next_partition += 1
+            if self._size < self.maxsize:
+                slot = self._size
+                self._size += 1
+            else:
+                # 가장 오래 쓰이지 않은 자리를 재사용 (만료된 자리가 있으면 그 자리부터)
+                expired = np.flatnonzero(self._expires < time.time())
+                slot = int(expired[0]) if len(expired) else int(np.argmin(self._last_used))
+                self.evictions += 1
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._partitions[slot] = pid
+            self._terms[slot] = english_terms(question)
+            self._expires[slot] = time.time() + self.ttl
+            self._last_used[slot] = self._clock
+            self._answers[slot] = value
+            # 더는 어떤 자리에도 남아 있지 않은 묶음 번호는 지워서 표가 끝없이 커지지 않게 함
+            if len(self._partition_ids) > self.maxsize:
+                live = set(np.unique(self._partitions[:self._size]).tolist())
+                self._partition_ids = {key: number for key, number in self._partition_ids.items() if number in live}
+
+    def clear(self):
+        with self._lock:
+            self._partitions[:] = -1
+            self._answers = [None] * self.maxsize
+            self._partition_ids.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": self._size,
+                "evictions": self.evictions,
+            }
+
+
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache():
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                maxsize=settings.SEMANTIC_CACHE_SIZE,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                ttl=settings.RESPONSE_CACHE_TTL
+            )
+        return _semantic_cache
@@ -0,0 +1,88 @@
+# 운영 설정 (배포 환경에서는 환경 변수로 덮어쓸 수 있음)
+import os
+import tempfile
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# 응답 캐시: 최대 항목 수, 유효 시간(초), 디스크 저장 경로(비어 있으면 메모리만 사용)
+RESPONSE_CACHE_SIZE = _env_int("WH_RESPONSE_CACHE_SIZE", 512)
+RESPONSE_CACHE_TTL = _env_float("WH_RESPONSE_CACHE_TTL", 6 * 60 * 60)
+RESPONSE_CACHE_PATH = os.environ.get("WH_RESPONSE_CACHE_PATH", "")
+
+# 의미 기반 캐시: 보관할 질문 수, 같은 질문으로 볼 코사인 유사도 기준
+SEMANTIC_CACHE_SIZE = _env_int("WH_SEMANTIC_CACHE_SIZE", 1024)
+SEMANTIC_CACHE_THRESHOLD = _env_float("WH_SEMANTIC_CACHE_THRESHOLD", 0.75)
+
+# LLM 스케줄러: 동시 호출 수, 조직 할당량(분당 토큰/요청 수), 반·학생별 시간당 토큰 예산
+LLM_MAX_WORKERS = _env_int("WH_LLM_MAX_WORKERS", 8)
+LLM_TOKENS_PER_MINUTE = _env_int("WH_LLM_TOKENS_PER_MINUTE", 60000)
+LLM_REQUESTS_PER_MINUTE = _env_int("WH_LLM_REQUESTS_PER_MINUTE", 500)
+CLASS_TOKEN_BUDGET = _env_int("WH_CLASS_TOKEN_BUDGET", 200000)
+STUDENT_TOKEN_BUDGET = _env_int("WH_STUDENT_TOKEN_BUDGET", 20000)
+BUDGET_WINDOW = _env_float("WH_BUDGET_WINDOW", 60 * 60)
+
+# 미리 받아 두기: 작업 스레드 수, 미리 받기 전에 남아 있어야 하는 분당 토큰 여유 비율
+PREFETCH_WORKERS = _env_int("WH_PREFETCH_WORKERS", 2)
+PREFETCH_HEADROOM = _env_float("WH_PREFETCH_HEADROOM", 0.5)
+
+# 장애 대응: 수준별 첫 응답 마감 시간(초), 재시도 횟수, 회로 차단기 기준
+LEVEL_DEADLINES = {
+    "beginner": _env_float("WH_DEADLINE_BEGINNER", 10),
+    "intermediate": _env_float("WH_DEADLINE_INTERMEDIATE", 15),
+    "advanced": _env_float("WH_DEADLINE_ADVANCED", 25),
+}
+LLM_MAX_ATTEMPTS = _env_int("WH_LLM_MAX_ATTEMPTS", 3)
+BREAKER_FAILURE_THRESHOLD = _env_int("WH_BREAKER_FAILURE_THRESHOLD", 5)
+BREAKER_RESET_TIMEOUT = _env_float("WH_BREAKER_RESET_TIMEOUT", 30)
+
+# 프롬프트에 넣을 학생 글의 수준별 최대 토큰 수
+CONTEXT_TOKEN_BUDGETS = {
+    "beginner": _env_int("WH_CONTEXT_TOKENS_BEGINNER", 120),
+    "intermediate": _env_int("WH_CONTEXT_TOKENS_INTERMEDIATE", 250),
+    "advanced": _env_int("WH_CONTEXT_TOKENS_ADVANCED", 500),
+}
+
+# 대화 기억: 그대로 보내는 최근 대화 턴 수와 수준별 대화 기록 최대 토큰 수(요약 포함)
+MEMORY_RECENT_TURNS = _env_int("WH_MEMORY_RECENT_TURNS", 3)
+MEMORY_TOKEN_BUDGETS = {
+    "beginner": _env_int("WH_MEMORY_TOKENS_BEGINNER", 300),
+    "intermediate": _env_int("WH_MEMORY_TOKENS_INTERMEDIATE", 500),
+    "advanced": _env_int("WH_MEMORY_TOKENS_ADVANCED", 800),
+}
+
+# 모델 등급 라우팅 설정 파일 (수준·요청 종류별 모델 등급과 하향 순서)
+MODEL_ROUTES_PATH = os.environ.get(
+    "WH_MODEL_ROUTES_PATH", os.path.join(os.path.dirname(__file__), "data", "model_routes.json")
+)
+
+# 철자 교정 색인 파일 (한 번 만들어 두고 모든 프로세스가 mmap으로 공유)
+SPELLING_INDEX_PATH = os.environ.get(
+    "WH_SPELLING_INDEX_PATH", os.path.join(tempfile.gettempdir(), "writing_helper_spelling.idx")
+)
+
+# 초안 저장소: SQLite 경로, 모아서 쓰는 간격(초), 공유 읽기 연결 수, 학기 이름(비어 있으면 날짜로 정함)
+DRAFT_DB_PATH = os.environ.get(
+    "WH_DRAFT_DB_PATH", os.path.join(os.path.expanduser("~"), ".writing_helper", "drafts.sqlite3")
+)
+DRAFT_FLUSH_INTERVAL = _env_float("WH_DRAFT_FLUSH_INTERVAL", 0.5)
+DRAFT_READ_CONNECTIONS = _env_int("WH_DRAFT_READ_CONNECTIONS", 4)
+TERM = os.environ.get("WH_TERM", "")
+
+# 제출 글 유사도 색인: SQLite 경로, 베낀 글로 볼 추정 유사도 기준
+# (학기 내내 쓰는 색인이라 임시 폴더가 아닌 초안 저장소 옆에 둠)
+DUPLICATE_INDEX_PATH = os.environ.get(
+    "WH_DUPLICATE_INDEX_PATH", os.path.join(os.path.expanduser("~"), ".writing_helper", "duplicates.sqlite3")
+)
+DUPLICATE_THRESHOLD = _env_float("WH_DUPLICATE_THRESHOLD", 0.5)
+
+# 교사용 운영 현황을 여는 키: 교사는 ?teacher=키 링크로 접속 (비어 있으면 운영 현황을 아무에게도 보여주지 않음)
+TEACHER_KEY = os.environ.get("WH_TEACHER_KEY", "")
@@ -0,0 +1,108 @@
+# 동일한 요청이 동시에 여러 세션에서 들어오면 업스트림 호출을 한 번만 수행하고 결과를 나눠 받음
+import hashlib
+import json
+import threading
+import time
+
+
+def request_fingerprint(messages, params):
+    # 모델, 메시지, 생성 옵션이 모두 같아야 같은 요청으로 취급
+    payload = json.dumps({"messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class Flight:
+    # 진행 중인 한 번의 업스트림 호출. 도착한 조각을 모든 구독자에게 순서대로 전달
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def push(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def reader(self, deadline=None):
+        # deadline(time.monotonic 기준)까지 첫 조각이 오지 않으면 TimeoutError (큐에서 밀린 요청도 기다림이 끝남)
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.chunks) and not self.done:
+                    remaining = None if deadline is None or self.chunks else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("첫 응답이 마감 시간 안에 오지 않았습니다")
+                    self._cond.wait(remaining)
+                pending = self.chunks[index:]
+                index += len(pending)
+                finished = self.done and index >= len(self.chunks)
+                error = self.error
+            yield from pending
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+
+def _start_thread(job):
+    threading.Thread(target=job, daemon=True).start()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def stream(self, key, producer, run=None, deadline=None):
+        # producer는 업스트림을 호출해 텍스트 조각을 내보내는 함수. 리더 세션이 먼저 끝나도
+        # 다른 세션이 결과를 받을 수 있도록 별도 스레드에서 끝까지 실행함
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight.reader(deadline)
+            flight = Flight()
+            self._flights[key] = flight
+            self.calls += 1
+        (run or _start_thread)(lambda: self._drive(key, flight, producer))
+        return flight.reader(deadline)
+
+    def do(self, key, fn, run=None, deadline=None):
+        return "".join(self.stream(key, lambda: iter([fn()]), run, deadline))
+
+    def _drive(self, key, flight, producer):
+        try:
+            for chunk in producer():
+                flight.push(chunk)
+        except Exception as e:
+            flight.finish(e)
+        else:
+            flight.finish()
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    return _single_flight
@@ -0,0 +1,387 @@
+# 오프라인 철자 교정 (SymSpell 방식의 대칭 삭제 색인)
+# 사전 단어마다 앞 7글자에서 1~2글자를 지운 형태를 미리 만들어 해시로 정렬해 두면, 틀린 단어도 같은 방식으로
+# 지운 형태만 찾아보면 되므로 편집 거리 2 이내의 후보를 바로 얻을 수 있음.
+# 색인은 한 번만 만들어 작은 바이너리 파일로 저장하고 mmap으로 열어서, 같은 서버의 모든 Streamlit 프로세스가
+# 운영체제 페이지 캐시를 공유하고 시작할 때 다시 만들 필요가 없음
+#     python -m writing_helper.spelling --build
+#     python -m writing_helper.spelling --bench 2000
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from writing_helper import settings
+from writing_helper.textstats import split_sentences
+
+# 단어 빈도 사전: SymSpell(MIT 라이선스, data/word_frequency_en.LICENSE)의 영어 빈도 사전에서 많이 쓰는
+# 알파벳 단어 4만 개
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "data", "word_frequency_en.txt")
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MAX_SUGGESTIONS = 3
+
+MAGIC = b"WHSPELL1"
+# 매직, 단어 수, 단어 바이트 길이, 삭제 형태 수, 최대 거리, 접두 길이, 원본 서명
+HEADER = struct.Struct("<8sIIIII32s")
+
+# 사전에 빠져 있지만 학생들이 자주 쓰는 단어 (미국식 철자, 한국어 로마자 표기)
+EXTRA_WORDS = """
+cozy favorite humor jewelry labor math mom neighbor theater traveled traveling youtube
+bibimbap bulgogi chuseok galbi hanbok hangul hanok japchae jjajangmyeon kimbap kimchi kpop naengmyeon ramyeon
+samgyeopsal seollal soju songpyeon taekwondo tteok tteokbokki tteokguk yutnori
+""".split()
+
+# 아포스트로피 없이 쓴 줄임말 → 맞는 형태 (dont, Im처럼 사전과 편집 거리로는 고치지 못함)
+CONTRACTIONS = {
+    "dont": "don't", "doesnt": "doesn't", "didnt": "didn't", "isnt": "isn't", "arent": "aren't",
+    "wasnt": "wasn't", "werent": "weren't", "cant": "can't", "couldnt": "couldn't", "wont": "won't",
+    "wouldnt": "wouldn't", "shouldnt": "shouldn't", "havent": "haven't", "hasnt": "hasn't", "hadnt": "hadn't",
+    "im": "I'm", "ive": "I've", "youre": "you're", "youve": "you've", "youll": "you'll", "theyre": "they're",
+    "theyve": "they've", "theyll": "they'll", "hes": "he's", "shes": "she's", "thats": "that's",
+    "whats": "what's", "theres": "there's", "itll": "it'll", "wouldve": "would've", "couldve": "could've",
+    "shouldve": "should've",
+}
+
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+
+
+def _hash(text):
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _deletes(word, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    # 앞 prefix_length 글자에서 최대 max_distance 글자를 지운 모든 형태 (지우지 않은 형태 포함)
+    word = word[:prefix_length]
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def distance(a, b, limit=MAX_DISTANCE):
+    # 인접한 두 글자를 바꾼 것도 한 번으로 세는 편집 거리 (limit를 넘으면 limit + 1)
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # 앞뒤의 같은 부분은 거리에 영향이 없으므로 잘라내고 계산
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _extra_words():
+    # 과제 안내문에 나오는 단어 (사전에 없어도 맞는 철자로 인정)
+    from writing_helper.creativity import task_vocabulary
+    from writing_helper.tasks import LEVEL_TASKS
+
+    words = set()
+    for tasks in LEVEL_TASKS.values():
+        for task in tasks.values():
+            words |= {word for word in task_vocabulary(task) if word.isalpha()}
+    return sorted(words | set(EXTRA_WORDS))
+
+
+def _source_signature(dictionary_path, extra_words):
+    digest = hashlib.sha256()
+    with open(dictionary_path, "rb") as f:
+        digest.update(f.read())
+    digest.update("\n".join(extra_words).encode("utf-8"))
+    digest.update(f"{MAX_DISTANCE}/{PREFIX_LENGTH}".encode())
+    return digest.digest()
+
+
+def build_index(path, dictionary_path=DICTIONARY_PATH):
+    # 빈도순 단어(단어 번호 = 빈도 순위)와 삭제 형태 해시 → 단어 번호 표를 정렬해서 한 파일로 저장
+    extra_words = _extra_words()
+    words = []
+    seen = set()
+    with open(dictionary_path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] not in seen:
+                seen.add(parts[0])
+                words.append(parts[0])
+    words.extend(word for word in extra_words if word not in seen)
+
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(word) for word in encoded])
+    word_hashes = np.fromiter((_hash(word) for word in words), dtype=np.uint32, count=len(words))
+    word_order = np.argsort(word_hashes, kind="stable").astype(np.uint32)
+
+    delete_keys = []
+    delete_ids = []
+    for word_id, word in enumerate(words):
+        for deleted in _deletes(word):
+            delete_keys.append(_hash(deleted))
+            delete_ids.append(word_id)
+    delete_keys = np.array(delete_keys, dtype=np.uint32)
+    delete_ids = np.array(delete_ids, dtype=np.uint32)
+    delete_order = np.lexsort((delete_ids, delete_keys))
+
+    header = HEADER.pack(MAGIC, len(words), int(offsets[-1]), len(delete_keys), MAX_DISTANCE, PREFIX_LENGTH,
+                         _source_signature(dictionary_path, extra_words))
+    # 다른 프로세스가 반쯤 쓴 파일을 열지 않도록 임시 파일에 쓴 뒤 바꿔치기
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        for array in (offsets, word_hashes[word_order], word_order, delete_keys[delete_order],
+                      delete_ids[delete_order]):
+            f.write(array.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(temporary, path)
+
+
+class SpellingIndex:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, words, blob_size, deletes, _, _, self.signature = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"철자 색인 파일 형식이 아닙니다: {path}")
+        offset = HEADER.size
+
+        def section(count):
+            nonlocal offset
+            array = np.frombuffer(self._mmap, dtype=np.uint32, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        self.words = words
+        self._offsets = section(words + 1)
+        self._word_hashes = section(words)
+        self._word_ids = section(words)
+        self._delete_keys = section(deletes)
+        self._delete_ids = section(deletes)
+        self._blob_offset = offset
+        self.size = len(self._mmap)
+
+    def word(self, word_id):
+        start = self._blob_offset + int(self._offsets[word_id])
+        end = self._blob_offset + int(self._offsets[word_id + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def _ids_for(self, keys, ids, hashes):
+        # 정렬된 해시 표에서 여러 해시의 구간을 한 번에 찾아 단어 번호를 모음
+        left = np.searchsorted(keys, hashes, side="left")
+        right = np.searchsorted(keys, hashes, side="right")
+        sizes = right - left
+        positions = np.repeat(left - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        return np.unique(ids[positions])
+
+    def contains(self, word):
+        return any(self.word(word_id) == word
+                   for word_id in self._ids_for(self._word_hashes, self._word_ids, np.array([_hash(word)])))
+
+    def lookup(self, word, task_words=frozenset(), limit=MAX_SUGGESTIONS):
+        # 편집 거리 → 과제 어휘 여부 → 빈도 순으로 정렬한 추천 단어
+        hashes = np.fromiter((_hash(d) for d in _deletes(word)), dtype=np.uint32)
+        word_ids = self._ids_for(self._delete_keys, self._delete_ids, hashes)
+        # 길이 차이가 최대 거리보다 큰 후보는 단어를 꺼내 보기 전에 제외
+        lengths = self._offsets[word_ids + 1].astype(np.int64) - self._offsets[word_ids]
+        word_ids = word_ids[np.abs(lengths - len(word.encode("utf-8"))) <= MAX_DISTANCE]
+        candidates = {}
+        for word_id in word_ids.tolist():
+            candidate = self.word(word_id)
+            found = distance(word, candidate)
+            if found <= MAX_DISTANCE:
+                candidates[candidate] = (found, candidate not in task_words, word_id)
+        # 과제 어휘는 사전에 없어도 후보로 봄
+        for candidate in task_words:
+            if candidate not in candidates:
+                found = distance(word, candidate)
+                if found <= MAX_DISTANCE:
+                    candidates[candidate] = (found, False, self.words)
+        return [candidate for candidate, _ in sorted(candidates.items(), key=lambda item: item[1])[:limit]]
+
+
+def stems(word):
+    # 사전에는 기본형만 있는 경우가 많아 -s, -ed, -ing, -er, -est, -ly를 떼어 낸 형태도 확인
+    for suffix in ("es", "s", "ed", "d", "ing", "er", "est", "ly"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            stem = word[:-len(suffix)]
+            candidates = [stem]
+            if suffix in ("ed", "ing", "er", "est"):
+                candidates.append(stem + "e")
+                if stem[-1] == stem[-2]:
+                    candidates.append(stem[:-1])
+            if stem.endswith("i"):
+                candidates.append(stem[:-1] + "y")
+            # 세 글자 이하의 어간은 우연히 맞는 경우가 많음 (famly → fam)
+            yield from (candidate for candidate in candidates if len(candidate) >= 4)
+
+
+def is_known(index, word):
+    return index.contains(word) or any(index.contains(stem) for stem in stems(word))
+
+
+def task_words(task):
+    # 추천 순위를 올려 줄 과제 어휘 (여러 단어로 된 항목은 낱말로 나눔)
+    words = set()
+    for key in ("vocabulary", "advanced_vocabulary"):
+        for entry in task.get(key, []):
+            words.update(word.lower() for word in WORD_PATTERN.findall(entry))
+    return frozenset(words)
+
+
+_index = None
+_index_lock = threading.Lock()
+_warm_thread = None
+
+
+def get_spelling_index():
+    # 색인 파일이 없거나 사전·과제가 바뀌었으면 한 번 다시 만든 뒤 mmap으로 엶
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = settings.SPELLING_INDEX_PATH
+            expected = _source_signature(DICTIONARY_PATH, _extra_words())
+            index = SpellingIndex(path) if os.path.exists(path) else None
+            if index is None or index.signature != expected:
+                build_index(path)
+                index = SpellingIndex(path)
+            _index = index
+        return _index
+
+
+def warm_spelling_index():
+    # 색인 만들기(약 1.6초)가 첫 화면을 그리는 스크립트 스레드를 막지 않도록 백그라운드 스레드에서 미리 엶
+    global _warm_thread
+    with _index_lock:
+        if _index is None and _warm_thread is None:
+            _warm_thread = threading.Thread(target=get_spelling_index, name="spelling-index", daemon=True)
+            _warm_thread.start()
+
+
+def spelling_index_ready():
+    # 색인이 열렸으면 True (미리 열기가 실패했으면 check_spelling이 직접 다시 시도하도록 True)
+    return _index is not None or _warm_thread is None or not _warm_thread.is_alive()
+
+
+@lru_cache(maxsize=256)
+def check_spelling(text, task_vocabulary=frozenset()):
+    # 사전에 없는 단어와 추천 철자 [{"start", "end", "text", "suggestions"}]
+    index = get_spelling_index()
+    sentence_starts = set()
+    offset = 0
+    for sentence in split_sentences(text):
+        offset = text.find(sentence, offset)
+        first = WORD_PATTERN.search(sentence)
+        if first:
+            sentence_starts.add(offset + first.start())
+        offset += len(sentence)
+
+    found = []
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group()
+        contraction = CONTRACTIONS.get(word.lower())
+        if contraction:
+            if word[0].isupper():
+                contraction = contraction[0].upper() + contraction[1:]
+            found.append({"start": match.start(), "end": match.end(), "text": word, "suggestions": [contraction]})
+            continue
+        # 문장 중간의 대문자 단어는 이름·지명으로 보고, n't 줄임말은 앞부분이 사전 단어가 아니므로 건너뜀
+        if word[0].isupper() and match.start() not in sentence_starts and word.lower() != "i":
+            continue
+        if re.search(r"n['’]t$", word, re.IGNORECASE):
+            continue
+        lowered = re.split(r"['’]", word.lower())[0]
+        if len(lowered) < 2 or lowered in task_vocabulary or is_known(index, lowered):
+            continue
+        suggestions = index.lookup(lowered, task_vocabulary)
+        if suggestions:
+            if word[0].isupper():
+                suggestions = [suggestion.capitalize() for suggestion in suggestions]
+            found.append({"start": match.start(), "end": match.start() + len(re.split(r"['’]", word)[0]),
+                          "text": re.split(r"['’]", word)[0], "suggestions": suggestions})
+    return tuple(found)
+
+
+def _misspell(word, rng):
+    # 벤치마크용: 글자 하나를 지우거나, 바꾸거나, 넣거나, 이웃 글자와 자리를 바꿈
+    i = rng.randrange(len(word))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edit = rng.choice(("delete", "replace", "insert", "swap"))
+    if edit == "delete" and len(word) > 3:
+        return word[:i] + word[i + 1:]
+    if edit == "swap" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if edit == "insert":
+        return word[:i] + letter + word[i:]
+    return word[:i] + letter + word[i + 1:]
+
+
+def benchmark(count, seed=0):
+    # 자주 쓰는 단어 5천 개에서 틀린 철자를 만들어 첫 번째 추천이 맞는 비율과 단어당 시간을 측정
+    started = time.perf_counter()
+    index = SpellingIndex(settings.SPELLING_INDEX_PATH)
+    open_ms = (time.perf_counter() - started) * 1000
+    rng = random.Random(seed)
+    pool = [index.word(word_id) for word_id in range(min(index.words, 5000))]
+    pool = [word for word in pool if len(word) >= 4]
+    correct = 0
+    timings = []
+    for _ in range(count):
+        word = rng.choice(pool)
+        typo = _misspell(word, rng)
+        started = time.perf_counter()
+        suggestions = index.lookup(typo)
+        timings.append((time.perf_counter() - started) * 1000)
+        correct += bool(suggestions) and (suggestions[0] == word or typo == word)
+    timings.sort()
+    return {"open_ms": open_ms, "size": index.size, "top1": correct / max(count, 1),
+            "median_ms": timings[len(timings) // 2], "p95_ms": timings[int(len(timings) * 0.95)]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="철자 교정 색인 만들기와 성능 측정")
+    parser.add_argument("--build", action="store_true", help="색인 파일을 다시 만듦")
+    parser.add_argument("--bench", type=int, metavar="N", help="틀린 철자 N개로 정확도와 속도 측정")
+    args = parser.parse_args(argv)
+    if not (args.build or args.bench):
+        parser.error("--build 또는 --bench가 필요합니다")
+    if args.build or not os.path.exists(settings.SPELLING_INDEX_PATH):
+        started = time.perf_counter()
+        build_index(settings.SPELLING_INDEX_PATH)
+        print(f"색인 생성: {settings.SPELLING_INDEX_PATH} "
+              f"({os.path.getsize(settings.SPELLING_INDEX_PATH) / 1e6:.1f} MB, {time.perf_counter() - started:.1f}초)")
+    if args.bench:
+        result = benchmark(args.bench)
+        print(f"색인 열기 {result['open_ms']:.2f} ms ({result['size'] / 1e6:.1f} MB), "
+              f"첫 추천 정확도 {result['top1']:.2f}, "
+              f"단어당 중앙값 {result['median_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# 수준별 쓰기 과제와 빠른 질문 목록 (페이지와 배치 도구가 함께 사용)
+
+# 초급 수준 과제 데이터
+BEGINNER_TASKS = {
+    "자기소개": {
+        "type": "fill_blanks",
+        "description": "빈칸을 채워서 자기소개 문단을 완성하세요.",
+        "template": """Hello! My name is _______. I am _______ years old. I live in _______ with my _______. 
+I have _______ (pet/hobby). My favorite subject is _______. I like to _______ in my free time. 
+My favorite food is _______. Nice to meet you!""",
+        "vocabulary": ["name", "age", "family", "hobby", "subject", "food", "pet"],
+        "hints": ["이름을 써보세요", "나이를 숫자로 써보세요", "사는 곳을 써보세요"]
+    },
+    "내 방 묘사": {
+        "type": "picture_description",
+        "description": "그림을 보고 방을 묘사하는 글을 써보세요.",
+        "template": """This is my room. In my room, there is _______. 
+The _______ is next to the _______. I have _______ on the desk. 
+The walls are _______ color. I like my room because _______.""",
+        "vocabulary": ["bed", "desk", "chair", "window", "door", "lamp", "book", "computer"],
+        "hints": ["방에 있는 물건들을 써보세요", "색깔을 설명해보세요", "위치를 나타내는 말을 써보세요"]
+    },
+    "좋아하는 음식": {
+        "type": "opinion",
+        "description": "좋아하는 음식에 대해 간단히 써보세요.",
+        "template": """My favorite food is _______. It tastes _______. 
+I usually eat it _______. My mom/dad makes it for me. 
+I like it because _______. When I eat it, I feel _______.""",
+        "vocabulary": ["delicious", "sweet", "spicy", "healthy", "happy", "hungry", "breakfast", "lunch", "dinner"],
+        "hints": ["음식 이름을 써보세요", "맛을 설명해보세요", "언제 먹는지 써보세요"]
+    }
+}
+
+# 중급 수준 과제 데이터
+INTERMEDIATE_TASKS = {
+    "나의 꿈": {
+        "type": "opinion_essay",
+        "description": "미래의 꿈과 목표에 대해 3-4개 문단으로 글을 써보세요.",
+        "guide_questions": [
+            "What is your dream job? Why do you want this job?",
+            "What skills do you need to achieve your dream?",
+            "How will you prepare for your future career?",
+            "What challenges might you face and how will you overcome them?"
+        ],
+        "useful_expressions": {
+            "서론": ["In the future, I want to...", "My dream is to...", "I have always wanted to..."],
+            "본론": ["The reason why I want this job is...", "First of all,", "Moreover,", "In addition to that,"],
+            "결론": ["In conclusion,", "To sum up,", "I believe that...", "I am confident that..."]
+        },
+        "vocabulary": ["ambitious", "goal", "achieve", "determine", "challenge", "overcome", "prepare", "career"]
+    },
+    "환경 보호": {
+        "type": "argumentative",
+        "description": "환경 보호의 중요성과 실천 방법에 대해 설득력 있는 글을 써보세요.",
+        "guide_questions": [
+            "Why is environmental protection important?",
+            "What are the main environmental problems we face today?",
+            "What can individuals do to protect the environment?",
+            "How can we encourage others to be more environmentally friendly?"
+        ],
+        "useful_expressions": {
+            "의견 제시": ["I strongly believe that...", "It is crucial that...", "We must realize that..."],
+            "예시 제공": ["For example,", "For instance,", "Such as", "A good example is..."],
+            "결과 표현": ["As a result,", "Therefore,", "Consequently,", "This leads to..."]
+        },
+        "vocabulary": ["pollution", "sustainable", "recycle", "renewable", "conservation", "ecosystem", "reduce", "global warming"]
+    },
+    "문화 비교": {
+        "type": "compare_contrast",
+        "description": "한국 문화와 다른 나라 문화를 비교하고 대조하는 글을 써보세요.",
+        "guide_questions": [
+            "What country would you like to compare with Korea?",
+            "What are the similarities between the two cultures?",
+            "What are the main differences?",
+            "What can we learn from each other's cultures?"
+        ],
+        "useful_expressions": {
+            "유사점": ["Both countries have...", "Similarly,", "In the same way,", "Like Korea,"],
+            "차이점": ["However,", "On the other hand,", "In contrast,", "Unlike Korea,"],
+            "비교": ["compared to", "while", "whereas", "although"]
+        },
+        "vocabulary": ["tradition", "custom", "festival", "cuisine", "language", "society", "values", "diversity"]
+    },
+    "학교생활 경험": {
+        "type": "narrative",
+        "description": "기억에 남는 학교생활 경험이나 사건에 대한 이야기를 써보세요.",
+        "guide_questions": [
+            "What memorable event happened at school?",
+            "When and where did it happen?",
+            "Who was involved in this experience?",
+            "How did you feel and what did you learn from it?"
+        ],
+        "useful_expressions": {
+            "시간 순서": ["First,", "Then,", "After that,", "Finally,", "Meanwhile,"],
+            "감정 표현": ["I felt...", "I was excited/nervous/proud", "It made me realize..."],
+            "묘사": ["It was...", "The atmosphere was...", "I remember that..."]
+        },
+        "vocabulary": ["memorable", "experience", "participate", "nervous", "proud", "realize", "atmosphere", "encourage"]
+    }
+}
+
+# 고급 수준 과제 데이터
+ADVANCED_TASKS = {
+    "사회 이슈 분석": {
+        "type": "analytical_essay",
+        "description": "현재 사회의 중요한 이슈를 선택하여 다각도로 분석하고 본인의 견해를 논리적으로 제시하세요. (400-500단어)",
+        "minimal_guidance": [
+            "Choose a current social issue that interests you",
+            "Analyze the issue from multiple perspectives",
+            "Present your own well-reasoned opinion",
+            "Support your arguments with evidence and examples"
+        ],
+        "advanced_vocabulary": [
+            "contemporary", "prevalent", "paradigm", "multifaceted", "implications", 
+            "predominantly", "substantial", "deteriorate", "advocate", "controversial",
+            "underlying", "comprehensive", "sustainable", "innovative", "profound"
+        ],
+        "complex_structures": [
+            "Despite the fact that..., it is evident that...",
+            "While some argue that..., others contend that...",
+            "Not only does this issue affect..., but it also...",
+            "What is particularly concerning is that...",
+            "It is worth noting that..."
+        ]
+    },
+    "창의적 내러티브": {
+        "type": "creative_writing",
+        "description": "상상력을 발휘하여 독창적인 이야기를 창작하세요. 캐릭터, 배경, 갈등을 중심으로 한 완성도 높은 작품을 만들어보세요.",
+        "minimal_guidance": [
+            "Create original characters with depth and complexity",
+            "Develop an engaging plot with conflict and resolution",
+            "Use vivid descriptions and dialogue",
+            "Experiment with narrative techniques and literary devices"
+        ],
+        "advanced_vocabulary": [
+            "enigmatic", "resilient", "melancholy", "serene", "tumultuous",
+            "profound", "intricate", "captivating", "haunting", "whimsical",
+            "compelling", "poignant", "evocative", "subtle", "sophisticated"
+        ],
+        "complex_structures": [
+            "Had it not been for..., the outcome would have been...",
+            "Little did [character] know that...",
+            "In the midst of..., there emerged...",
+            "What struck [character] most was...",
+            "As if by some twist of fate..."
+        ]
+    },
+    "철학적 에세이": {
+        "type": "philosophical_essay",
+        "description": "추상적이고 복합적인 주제에 대해 깊이 있게 사고하고, 논리적 추론과 성찰을 통해 본인의 철학적 관점을 펼쳐보세요.",
+        "minimal_guidance": [
+            "Explore abstract concepts and ideas",
+            "Engage in deep philosophical reasoning",
+            "Question assumptions and explore implications",
+            "Develop your own unique perspective on complex issues"
+        ],
+        "advanced_vocabulary": [
+            "existential", "empirical", "metaphysical", "intrinsic", "paradox",
+            "paradigm", "fundamental", "subjective", "objective", "inherent",
+            "contemplation", "consciousness", "perception", "rationality", "morality"
+        ],
+        "complex_structures": [
+            "One might argue that..., however, upon closer examination...",
+            "The question remains as to whether...",
+            "This raises the fundamental question of...",
+            "From a philosophical standpoint...",
+            "It is precisely this ambiguity that..."
+        ]
+    },
+    "비판적 리뷰": {
+        "type": "critical_review",
+        "description": "책, 영화, 예술 작품, 또는 현상에 대한 비판적 분석을 수행하세요. 객관적 분석과 주관적 평가를 균형있게 제시하세요.",
+        "minimal_guidance": [
+            "Provide both objective analysis and subjective evaluation",
+            "Support your judgments with specific evidence",
+            "Consider multiple criteria for assessment",
+            "Engage with the work's broader significance and impact"
+        ],
+        "advanced_vocabulary": [
+            "sophisticated", "nuanced", "compelling", "innovative", "conventional",
+            "provocative", "mediocre", "exceptional", "superficial", "profound",
+            "aesthetic", "thematic", "symbolic", "interpretation", "critique"
+        ],
+        "complex_structures": [
+            "What distinguishes this work from others is...",
+            "While the work succeeds in..., it falls short of...",
+            "The most striking aspect of... is...",
+            "This raises important questions about...",
+            "In terms of artistic merit..."
+        ]
+    },
+    "연구 보고서": {
+        "type": "research_report",
+        "description": "관심 있는 주제에 대해 심도 있는 조사를 실시하고, 발견한 정보를 체계적으로 정리하여 전문적인 보고서를 작성하세요.",
+        "minimal_guidance": [
+            "Conduct thorough research on your chosen topic",
+            "Organize information systematically and logically",
+            "Present findings objectively with proper analysis",
+            "Draw meaningful conclusions from your research"
+        ],
+        "advanced_vocabulary": [
+            "methodology", "comprehensive", "empirical", "statistical", "correlation",
+            "hypothesis", "variables", "findings", "implications", "significant",
+            "preliminary", "substantial", "systematic", "objective", "conclusive"
+        ],
+        "complex_structures": [
+            "The research reveals that...",
+            "According to recent studies...",
+            "Data indicates a strong correlation between...",
+            "These findings suggest that...",
+            "Further investigation is needed to..."
+        ]
+    }
+}
+
+# 고급 쓰기 전략 및 도구
+ADVANCED_TOOLS = {
+    "Rhetorical Devices": [
+        "Metaphor and Simile", "Alliteration and Assonance", "Rhetorical Questions",
+        "Parallelism", "Irony and Satire", "Hyperbole", "Personification"
+    ],
+    "Essay Structures": [
+        "Classical Five-Paragraph", "Compare and Contrast", "Cause and Effect",
+        "Problem-Solution", "Chronological", "Process Analysis", "Classification"
+    ],
+    "Critical Thinking": [
+        "Analysis vs. Evaluation", "Identifying Assumptions", "Logical Fallacies",
+        "Evidence Assessment", "Multiple Perspectives", "Counterarguments"
+    ],
+    "Style Techniques": [
+        "Tone and Voice", "Sentence Variety", "Transitions", "Cohesion and Coherence",
+        "Precise Word Choice", "Active vs. Passive Voice", "Formal vs. Informal Register"
+    ]
+}
+
+# 빠른 질문 버튼: message는 채팅 창에 보이는 질문, prompt는 AI에게 보내는 질문
+QUICK_QUESTIONS = {
+    "beginner": [
+        {"id": "grammar", "label": "❓ 문법이 궁금해요", "message": "문법에 대해 도움을 주세요", "prompt": "문법에 대해 도움을 주세요"},
+        {"id": "vocabulary", "label": "📖 단어를 모르겠어요", "message": "단어에 대해 도움을 주세요", "prompt": "단어에 대해 도움을 주세요"},
+        {"id": "ideas", "label": "💭 아이디어가 떠오르지 않아요", "message": "아이디어에 대해 도움을 주세요", "prompt": "아이디어에 대해 도움을 주세요"}
+    ],
+    "intermediate": [
+        {"id": "structure", "label": "📐 글 구조", "message": "글의 구조에 대해 도움을 주세요", "prompt": "글의 구조에 대해 도움을 주세요"},
+        {"id": "vocabulary", "label": "📚 어휘 선택", "message": "어휘 선택에 대해 도움을 주세요", "prompt": "더 나은 어휘 선택에 대해 조언해주세요"},
+        {"id": "grammar", "label": "✏️ 문법 활용", "message": "문법 활용에 대해 도움을 주세요", "prompt": "더 다양한 문법 구조 활용에 대해 조언해주세요"},
+        {"id": "development", "label": "💭 내용 전개", "message": "내용 전개에 대해 도움을 주세요", "prompt": "내용을 더 효과적으로 전개하는 방법에 대해 조언해주세요"}
+    ],
+    "advanced": [
+        {"id": "creativity", "label": "🎨 창의성 개발", "message": "창의적 사고와 독창적 표현을 어떻게 개발할 수 있을까요?", "prompt": "창의적 사고와 독창적 표현을 어떻게 개발할 수 있을까요?"},
+        {"id": "critical", "label": "🧠 비판적 사고", "message": "비판적 분석과 논리적 추론을 향상시키려면 어떻게 해야 할까요?", "prompt": "비판적 분석과 논리적 추론을 향상시키려면 어떻게 해야 할까요?"},
+        {"id": "academic", "label": "📚 학문적 글쓰기", "message": "더 학문적이고 정교한 글쓰기를 위한 조언을 주세요", "prompt": "더 학문적이고 정교한 글쓰기를 위한 조언을 주세요"},
+        {"id": "voice", "label": "🎭 개인적 목소리", "message": "나만의 독특한 글쓰기 스타일과 목소리를 어떻게 개발할 수 있을까요?", "prompt": "나만의 독특한 글쓰기 스타일과 목소리를 어떻게 개발할 수 있을까요?"}
+    ]
+}
+
+LEVEL_TASKS = {
+    "beginner": BEGINNER_TASKS,
+    "intermediate": INTERMEDIATE_TASKS,
+    "advanced": ADVANCED_TASKS
+}
@@ -0,0 +1,69 @@
+# 학생 글의 기본 통계 (단어·문자·문장·문단 수, 문장 길이)
+# Streamlit은 위젯을 건드릴 때마다 페이지 전체를 다시 실행하므로 문단별 결과를 내용 기준으로 기억해 두고,
+# 한 문단만 바뀌면 그 문단만 다시 계산함
+import re
+from functools import lru_cache
+
+from writing_helper.context import split_paragraphs
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9]+(?:['’-][A-Za-z0-9]+)*|[가-힣]+")
+# 마침표 뒤에 와도 문장이 끝나지 않는 약어
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "a.m", "p.m",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k",
+}
+# 뒤에 숫자가 올 때만 약어 ("No. 5"는 번호, "I said no. Then..."은 문장 끝)
+NUMBER_ABBREVIATIONS = {"no"}
+# 문장 끝 부호(. ! ? … 여러 개 가능)와 닫는 따옴표·괄호, 그 뒤의 공백
+_BOUNDARY = re.compile(r"(?:[.!?]+|…)[\"'”’)\]]*\s+")
+_LAST_TOKEN = re.compile(r"([\w.]+)\.$")
+
+
+def split_sentences(paragraph):
+    # 약어(Mr., e.g.)와 이니셜(J. K.) 뒤의 마침표에서는 문장을 나누지 않음
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(paragraph):
+        end = match.end()
+        candidate = paragraph[start:end].rstrip()
+        token = _LAST_TOKEN.search(candidate)
+        if token and candidate.endswith(".") and not candidate.endswith(".."):
+            word = token.group(1).lower()
+            if word in NUMBER_ABBREVIATIONS and paragraph[end:end + 1].isdigit():
+                continue
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha() and word not in ("a", "i")):
+                continue
+        sentences.append(candidate)
+        start = end
+    rest = paragraph[start:].strip()
+    if rest:
+        sentences.append(rest)
+    return [s for s in sentences if WORD_PATTERN.search(s)]
+
+
+@lru_cache(maxsize=4096)
+def paragraph_stats(paragraph):
+    # 같은 내용의 문단은 다시 계산하지 않음 (문단 문자열 자체가 캐시 키)
+    sentences = split_sentences(paragraph)
+    words = WORD_PATTERN.findall(paragraph)
+    return {
+        "words": len(words),
+        "letters": sum(len(word) for word in words),
+        "sentence_lengths": tuple(len(WORD_PATTERN.findall(sentence)) for sentence in sentences),
+    }
+
+
+@lru_cache(maxsize=256)
+def text_stats(text):
+    paragraphs = [paragraph_stats(paragraph) for paragraph in split_paragraphs(text)]
+    words = sum(p["words"] for p in paragraphs)
+    sentence_lengths = tuple(length for p in paragraphs for length in p["sentence_lengths"])
+    return {
+        "words": words,
+        "chars": len(text),
+        "sentences": len(sentence_lengths),
+        "paragraphs": len(paragraphs),
+        "sentence_lengths": sentence_lengths,
+        "avg_words_per_sentence": words / max(len(sentence_lengths), 1),
+        "avg_chars_per_word": sum(p["letters"] for p in paragraphs) / max(words, 1),
+    }
@@ -0,0 +1,32 @@
+# 로컬 토큰 수 계산 (tiktoken이 설치되어 있으면 정확히, 없으면 근사치로 계산)
+import re
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # 설치되지 않았거나 인코딩 파일을 내려받지 못한 경우
+    _encoding = None
+
+# 영어 단어, 숫자 묶음, 한글 음절, 그 밖의 기호 단위로 나눔
+_PIECE = re.compile(r"[A-Za-z]+|\d{1,3}|[가-힣]|\S")
+
+
+def count_tokens(text):
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    total = 0
+    for piece in _PIECE.findall(text):
+        if piece.isascii() and piece.isalpha():
+            # 짧은 영어 단어는 1토큰, 긴 단어는 약 4자마다 1토큰 추가
+            total += 1 + max(len(piece) - 6, 0) // 4
+        else:
+            total += 1
+    return total
+
+
+def count_message_tokens(messages):
+    # 메시지마다 역할·구분자에 드는 몇 토큰을 더함
+    return sum(count_tokens(m["content"]) + 4 for m in messages) + 2
@@ -0,0 +1,122 @@
+# 튜터 답변 생성 파이프라인:
+# 응답 캐시 → 비슷한 질문 캐시 → 회로 차단기 → 예산 확인 → 동일 요청 합치기(single-flight) → 스케줄러 작업자
+# → 재시도·헤징·마감 시간이 적용된 OpenAI 호출
+import random
+import time
+
+from writing_helper.cache import get_response_cache
+from writing_helper.resilience import get_policy, resilient_stream
+from writing_helper.router import get_router
+from writing_helper.scheduler import BudgetExceeded, PRIORITY_QUICK, estimate_tokens, get_scheduler
+from writing_helper.semantic_cache import get_semantic_cache
+from writing_helper.singleflight import get_single_flight, request_fingerprint
+from writing_helper.usage import get_usage_tracker
+
+BUDGET_EXCEEDED_MESSAGE = "이번 시간에 사용할 수 있는 AI 도우미 질문 양을 모두 사용했어요. 잠시 후 다시 질문해주세요. ⏳"
+
+# 답변 출처 중 정상적인 실시간 답변이 아닌 것
+DEGRADED_SOURCES = ("stale", "offline", "fallback")
+
+
+class TutorReply:
+    # 답변 조각을 내보내면서 출처와 완성된 텍스트를 기록
+    # source: live(실시간), cache(캐시), stale(장애 중 지난 캐시), offline(장애 중 준비된 답변),
+    #         fallback(기본 응답), budget(예산 초과)
+    def __init__(self, chunks, source, recover=None):
+        self._chunks = chunks
+        self._recover = recover
+        self.source = source
+        self.text = ""
+
+    def chunks(self):
+        parts = []
+        try:
+            for chunk in self._chunks:
+                parts.append(chunk)
+                yield chunk
+        except Exception:
+            # 실패 신호를 남기고, 아직 보여준 내용이 없으면 지난 캐시 답변으로 대체
+            text, self.source = self._recover(allow_stale=not parts)
+            parts.append(("\n\n" if parts else "") + text)
+            yield parts[-1]
+        self.text = "".join(parts)
+
+    @property
+    def degraded(self):
+        return self.source in DEGRADED_SOURCES
+
+
+# offline: 장애 중 기본 응답 대신 보여줄 미리 준비된 답변 (없으면 None)
+def generate_reply(client, level, messages, params, fallback_responses, cache_key=None, stream=False,
+                   priority=PRIORITY_QUICK, class_id=None, student_id=None, offline=None):
+    reply = _build_reply(client, level, messages, params, fallback_responses, cache_key,
+                         priority, class_id, student_id, offline)
+    if stream:
+        return reply
+    return "".join(reply.chunks())
+
+
+def _build_reply(client, level, messages, params, fallback_responses, cache_key,
+                 priority, class_id, student_id, offline):
+    cache = get_response_cache()
+
+    def recover(allow_stale=True):
+        stale = cache.get_stale(cache_key) if allow_stale and cache_key is not None else None
+        if stale is not None:
+            return stale, "stale"
+        if offline is not None:
+            return offline, "offline"
+        return random.choice(fallback_responses), "fallback"
+
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return TutorReply(iter([cached]), "cache")
+        # 표현만 조금 다른 같은 질문이면 그 답변을 재사용하고 정확한 키로도 저장
+        similar = get_semantic_cache().get(cache_key)
+        if similar is not None:
+            cache.set(cache_key, similar)
+            return TutorReply(iter([similar]), "cache")
+
+    # 장애 중에는 호출을 시도하지 않고 바로 대체 답변을 제공
+    policy = get_policy(level, params["model"])
+    if policy.breaker.is_open():
+        text, source = recover()
+        return TutorReply(iter([text]), source)
+
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(messages, params.get("max_tokens", 0))
+    try:
+        scheduler.check_budget(tokens, class_id, student_id)
+    except BudgetExceeded:
+        return TutorReply(iter([BUDGET_EXCEEDED_MESSAGE]), "budget")
+
+    # 수준별 마감 시간은 작업자가 꺼낼 때가 아니라 제출한 지금부터 잼 (큐·속도 제한 대기 포함)
+    deadline_at = time.monotonic() + policy.deadline
+
+    # 같은 요청이 이미 진행 중이면 그 호출의 결과를 함께 받음
+    def producer():
+        parts = []
+        usage = []
+        first_token = None
+        started = time.monotonic()
+        can_hedge = lambda: scheduler.token_bucket.try_acquire(tokens)
+        for chunk in resilient_stream(client, messages, params, policy, can_hedge, usage.append, deadline_at):
+            if first_token is None:
+                first_token = time.monotonic() - started
+            parts.append(chunk)
+            yield chunk
+        if usage:
+            get_usage_tracker().record(level, params["model"], usage[-1], first_token, time.monotonic() - started,
+                                       tier=get_router().tier_of(params["model"]))
+        # 끝까지 정상적으로 받은 답변만 캐시에 저장 (기본 응답은 저장하지 않음)
+        if cache_key is not None and parts:
+            cache.set(cache_key, "".join(parts))
+            get_semantic_cache().set(cache_key, "".join(parts))
+
+    def run(job):
+        scheduler.submit(job, priority, tokens, class_id, student_id)
+
+    chunks = get_single_flight().stream(request_fingerprint(messages, params), producer, run, deadline_at)
+    return TutorReply(chunks, "live", recover)
+
@@ -0,0 +1,79 @@
+# 토큰 사용량·지연 시간 기록과 수준별 프롬프트 캐시 효과 보고서
+import threading
+
+# 모델별 100만 토큰당 가격(달러): 입력, 캐시된 입력, 출력
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+DEFAULT_PRICE = MODEL_PRICES["gpt-3.5-turbo"]
+
+
+def _cached_tokens(usage):
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+class UsageTracker:
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def record(self, level, model, usage, first_token, total, tier=None):
+        prompt = usage.prompt_tokens or 0
+        cached = _cached_tokens(usage)
+        completion = usage.completion_tokens or 0
+        price_in, price_cached, price_out = MODEL_PRICES.get(model, DEFAULT_PRICE)
+        cost = ((prompt - cached) * price_in + cached * price_cached + completion * price_out) / 1e6
+        uncached_cost = (prompt * price_in + completion * price_out) / 1e6
+        with self._lock:
+            row = self._rows.setdefault((level, tier or "-", model), {
+                "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0,
+                "cost": 0.0, "uncached_cost": 0.0, "latency": 0.0,
+                "hit_calls": 0, "hit_first_token": 0.0, "miss_calls": 0, "miss_first_token": 0.0,
+            })
+            row["calls"] += 1
+            row["prompt_tokens"] += prompt
+            row["cached_tokens"] += cached
+            row["completion_tokens"] += completion
+            row["cost"] += cost
+            row["uncached_cost"] += uncached_cost
+            row["latency"] += total
+            if first_token is not None:
+                prefix = "hit" if cached else "miss"
+                row[f"{prefix}_calls"] += 1
+                row[f"{prefix}_first_token"] += first_token
+
+    def report(self):
+        # 수준·등급·모델별로 캐시된 토큰 비율, 절감된 비용, 캐시 적중 시 단축된 첫 토큰 시간을 정리
+        with self._lock:
+            rows = {key: dict(row) for key, row in self._rows.items()}
+        report = []
+        for (level, tier, model), row in sorted(rows.items()):
+            hit_avg = row["hit_first_token"] / row["hit_calls"] if row["hit_calls"] else None
+            miss_avg = row["miss_first_token"] / row["miss_calls"] if row["miss_calls"] else None
+            time_saved = (miss_avg - hit_avg) * row["hit_calls"] if hit_avg is not None and miss_avg is not None else 0.0
+            report.append({
+                "level": level,
+                "tier": tier,
+                "model": model,
+                "calls": row["calls"],
+                "prompt_tokens": row["prompt_tokens"],
+                "cached_ratio": row["cached_tokens"] / row["prompt_tokens"] if row["prompt_tokens"] else 0.0,
+                "completion_tokens": row["completion_tokens"],
+                "cost": row["cost"],
+                "cost_saved": row["uncached_cost"] - row["cost"],
+                "avg_latency": row["latency"] / row["calls"],
+                "first_token_cached": hit_avg,
+                "first_token_uncached": miss_avg,
+                "time_saved": max(time_saved, 0.0),
+            })
+        return report
+
+
+_usage_tracker = UsageTracker()
+
+
+def get_usage_tracker():
+    return _usage_tracker
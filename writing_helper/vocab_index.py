@@ -0,0 +1,166 @@
+# 과제 어휘·표현 사용 확인용 색인
+# 과제의 단어와 표현을 간단한 원형(lemma)의 낱말 열로 바꿔 Aho-Corasick 자동자 하나로 컴파일해 두고,
+# 학생 글을 한 번 훑으면서 모든 목표 단어·표현의 위치를 찾음 (과제마다 한 번 만들어 모든 세션이 공유)
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+# 표현 틀의 빈칸: "I felt...", "Little did [character] know that..."
+GAP_PATTERN = re.compile(r"\.\.\.|…|\[[^\]]*\]")
+
+IRREGULAR = {
+    "was": "be", "were": "be", "is": "be", "are": "be", "am": "be", "been": "be", "being": "be",
+    "has": "have", "had": "have", "did": "do", "does": "do", "done": "do",
+    "went": "go", "gone": "go", "made": "make", "felt": "feel", "took": "take", "taken": "take",
+    "overcame": "overcome", "saw": "see", "seen": "see", "thought": "think", "brought": "bring",
+    "children": "child", "people": "person", "better": "good", "best": "good",
+}
+TARGET_KEYS = {
+    "vocabulary": "word",
+    "advanced_vocabulary": "word",
+    "useful_expressions": "expression",
+    "complex_structures": "expression",
+}
+
+
+@lru_cache(maxsize=65536)
+def lemma(word):
+    # 규칙 기반의 가벼운 원형 복원 (목표 단어와 학생 글에 똑같이 적용하므로 대략적이어도 됨)
+    word = word.lower().replace("’", "'")
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("ied") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif re.search(r"(?:ss|x|ch|sh)es$", word):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    elif word.endswith("ing") and len(word) >= 6:
+        word = word[:-3]
+    elif word.endswith("ed") and len(word) >= 5:
+        word = word[:-2]
+    # planned → plan, achieve/achieved → achiev
+    if len(word) >= 4 and word[-1] == word[-2] and word[-1] not in "lsfz" and word[-1] not in "aeiou":
+        word = word[:-1]
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    # (원형, 시작 위치, 끝 위치) 목록
+    return [(lemma(m.group()), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+def _segments(target):
+    # 표현 틀을 빈칸 기준으로 나누고, "excited/nervous/proud" 같은 선택지는 각각 펼침
+    variants = []
+    for part in GAP_PATTERN.split(target):
+        if not TOKEN_PATTERN.search(part):
+            continue
+        options = [[]]
+        for raw in part.split():
+            choices = [c for c in raw.split("/") if TOKEN_PATTERN.search(c)]
+            if not choices:
+                continue
+            options = [prefix + [lemma(TOKEN_PATTERN.search(c).group())] for prefix in options for c in choices]
+        variants.append([tuple(option) for option in options])
+    return variants
+
+
+class VocabularyIndex:
+    def __init__(self, task):
+        # targets: [{"target", "kind", "group", "segments": [[변형 낱말 열, ...], ...]}]
+        self.targets = []
+        for key, kind in TARGET_KEYS.items():
+            values = task.get(key)
+            if not values:
+                continue
+            groups = values.items() if isinstance(values, dict) else [(None, values)]
+            for group, items in groups:
+                for target in items:
+                    segments = _segments(target)
+                    if segments:
+                        self.targets.append({"target": target, "kind": kind, "group": group, "segments": segments})
+        self._build()
+
+    def _build(self):
+        # 모든 (표현, 조각) 변형을 하나의 Aho-Corasick 자동자로 컴파일
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for t, target in enumerate(self.targets):
+            for s, variants in enumerate(target["segments"]):
+                for variant in variants:
+                    node = 0
+                    for token in variant:
+                        if token not in self._goto[node]:
+                            self._goto.append({})
+                            self._fail.append(0)
+                            self._out.append([])
+                            self._goto[node][token] = len(self._goto) - 1
+                        node = self._goto[node][token]
+                    self._out[node].append((t, s, len(variant)))
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0) if self._goto[fail].get(token) != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _matches(self, tokens):
+        node = 0
+        for i, (token, _, _) in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for t, s, length in self._out[node]:
+                yield t, s, i - length + 1, i
+
+    def scan(self, text):
+        # 한 번 훑어서 목표별 사용 위치와 단어·표현 종류별 사용 개수를 반환
+        tokens = tokenize(text)
+        found = [[[] for _ in target["segments"]] for target in self.targets]
+        for t, s, first, last in self._matches(tokens):
+            found[t][s].append((first, last))
+        items = []
+        coverage = {"word": [0, 0], "expression": [0, 0]}
+        for target, segment_hits in zip(self.targets, found):
+            # 여러 조각으로 된 표현은 조각들이 순서대로 모두 나와야 사용한 것으로 봄
+            positions = []
+            cursor = -1
+            for hits in segment_hits:
+                hit = next(((a, b) for a, b in sorted(hits) if a > cursor), None)
+                if hit is None:
+                    positions = []
+                    break
+                positions.append((tokens[hit[0]][1], tokens[hit[1]][2]))
+                cursor = hit[1]
+            items.append({"target": target["target"], "kind": target["kind"], "group": target["group"],
+                          "used": bool(positions), "positions": positions})
+            coverage[target["kind"]][1] += 1
+            coverage[target["kind"]][0] += bool(positions)
+        return {"items": items, "coverage": {kind: tuple(counts) for kind, counts in coverage.items() if counts[1]}}
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vocabulary_index(level, task):
+    # 과제별 색인은 처음 요청될 때 한 번만 컴파일
+    key = (level, task["type"])
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = VocabularyIndex(task)
+        return _indexes[key]